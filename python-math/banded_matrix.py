@@ -0,0 +1,529 @@
+"""This module contains a compact band storage implementation of a square
+matrix, for matrices whose non-zero entries lie near the diagonal, such as
+the tridiagonal and banded systems of finite difference discretizations.
+
+Only the diagonals within the band are stored, so a matrix with p
+sub-diagonals and q super-diagonals takes O(n(p+q)) memory instead of
+O(n^2), and products and solves take O(n(p+q)) and O(np(p+q)) time.
+Results are exact for int and Fraction entries and are floats as soon as
+any entry is a float.
+"""
+
+from operator import add, mul, truediv
+
+from fraction import Fraction
+from matrix import Matrix, MatrixDimensionError, SingularMatrixError
+from vector import Vector
+
+
+def _entry(work_row, col):
+    start, values = work_row
+    if col - start < len(values):
+        return values[col-start]
+    return 0
+
+
+class BandedMatrix(object):
+    """A class to represent a square banded matrix by its diagonals."""
+
+    @staticmethod
+    def tridiagonal(lower, diagonal, upper):
+        """(sequence of Number, sequence of Number, sequence of Number)
+            -> BandedMatrix
+
+        Returns the tridiagonal matrix with the given sub-diagonal, diagonal
+        and super-diagonal.
+
+        REQ: len(lower) == len(upper) == len(diagonal) - 1
+        """
+        return BandedMatrix(len(diagonal), 1, 1,
+                            [list(lower), list(diagonal), list(upper)])
+
+    @staticmethod
+    def from_matrix(matrix, lower=None, upper=None):
+        """(Matrix[, int, int]) -> BandedMatrix
+
+        Returns the banded matrix with the same entries as the given square
+        matrix, with the given number of sub-diagonals and super-diagonals.
+        Any bandwidth that is not given is the smallest one holding all of
+        the non-zero entries.
+
+        REQ: matrix is square
+        REQ: all non-zero entries of matrix lie within the given band
+        """
+        size = matrix.rows()
+        if size != matrix.columns():
+            raise MatrixDimensionError("matrix must be a square matrix")
+        rows = matrix._raw_rows()
+        found_lower = found_upper = 0
+        for i, row in enumerate(rows):
+            for j, value in enumerate(row):
+                if value != 0:
+                    found_lower = max(found_lower, i - j)
+                    found_upper = max(found_upper, j - i)
+        if lower is None:
+            lower = found_lower
+        if upper is None:
+            upper = found_upper
+        if found_lower > lower or found_upper > upper:
+            raise ValueError("matrix has non-zero entries outside the band")
+        bands = [[rows[k + max(0, -offset)][k + max(0, offset)]
+                  for k in range(size - abs(offset))]
+                 for offset in range(-lower, upper + 1)]
+        return BandedMatrix(size, lower, upper, bands)
+
+    @staticmethod
+    def _thomas(lower, diagonal, upper, values, divide, tolerance):
+        """(list of Number, list of Number, list of Number, list of Number,
+            callable, float) -> list of Number
+
+        Returns the solution x of Ax = b for the tridiagonal matrix A with the
+        given sub-diagonal, diagonal and super-diagonal, and the entries of b,
+        by the Thomas algorithm: Gaussian elimination without row
+        interchanges, in O(n) time. The given values are overwritten.
+
+        Raises SingularMatrixError as soon as a pivot is at most tolerance in
+        magnitude, which does not mean that A is singular.
+        """
+        size = len(diagonal)
+        ratios = [0] * size
+        previous_ratio = 0
+        previous_value = 0
+        for i in range(size):
+            sub = lower[i-1] if i else 0
+            pivot = diagonal[i] - sub * previous_ratio
+            if abs(pivot) <= tolerance:
+                raise SingularMatrixError("matrix has a zero pivot")
+            if i < size - 1:
+                previous_ratio = ratios[i] = divide(upper[i], pivot)
+            previous_value = values[i] = divide(
+                values[i] - sub * previous_value, pivot)
+        for i in range(size - 2, -1, -1):
+            values[i] = values[i] - ratios[i] * values[i+1]
+        return values
+
+    @staticmethod
+    def _banded_lu(size, lower, upper, bands, divide, tolerance):
+        """(int, int, int, list of list of Number, callable, float)
+            -> (list of list of Number, list of list of Number, list of int,
+                int)
+
+        Returns the factorization of the banded matrix with the given size,
+        bandwidths and diagonals by Gaussian elimination with partial
+        pivoting, as (rows, multipliers, pivots, sign). Row k of U starts at
+        the diagonal and is rows[k]; it has at most lower + upper entries
+        right of the diagonal, since row interchanges widen the upper band
+        by at most lower. The multipliers of step k are multipliers[k],
+        rows pivots[k] and k were interchanged before step k, and sign is
+        the sign of the row permutation.
+
+        Raises SingularMatrixError if a pivot is at most tolerance in
+        magnitude.
+        """
+        # each working row is a pair [first column, entries from there on]
+        work = list()
+        for i in range(size):
+            start = max(0, i - lower)
+            work.append([start, [bands[lower + j - i][min(i, j)]
+                                 for j in range(start,
+                                                min(size, i + upper + 1))]])
+        rows = list()
+        multipliers = list()
+        pivots = list()
+        sign = 1
+        for k in range(size):
+            last = min(size - 1, k + lower)
+            column = [_entry(work[i], k) for i in range(k, last + 1)]
+            offset = max(range(len(column)), key=lambda i: abs(column[i]))
+            pivot = column[offset]
+            pivot_pos = k + offset
+            if abs(pivot) <= tolerance:
+                raise SingularMatrixError("matrix is singular")
+            if pivot_pos != k:
+                work[k], work[pivot_pos] = work[pivot_pos], work[k]
+                sign = -sign
+            pivots.append(pivot_pos)
+            start, values = work[k]
+            pivot_row = values[k-start:]
+            tail = pivot_row[1:]
+            factors = list()
+            column[offset] = column[0]
+            for i in range(k + 1, last + 1):
+                factor = divide(column[i-k], pivot)
+                factors.append(factor)
+                if factor != 0:
+                    start, values = work[i]
+                    first = k + 1 - start
+                    stop = first + len(tail)
+                    if len(values) < stop:
+                        values.extend([0] * (stop - len(values)))
+                    values[first:stop] = [
+                        value - factor * pivot_value
+                        for value, pivot_value in zip(values[first:stop],
+                                                      tail)]
+            rows.append(pivot_row)
+            multipliers.append(factors)
+            work[k] = None
+        return rows, multipliers, pivots, sign
+
+    @staticmethod
+    def _banded_lu_solve(factorization, values, divide):
+        """((list of list of Number, list of list of Number, list of int,
+            int), list of Number, callable) -> list of Number
+
+        Returns the solution x of Ax = b, where factorization is the banded
+        LU factorization of A from _banded_lu() and values are the entries of
+        b. The given values are overwritten.
+        """
+        rows, multipliers, pivots, sign = factorization
+        size = len(rows)
+        for k in range(size):
+            pivot_pos = pivots[k]
+            values[k], values[pivot_pos] = values[pivot_pos], values[k]
+            value = values[k]
+            if value != 0:
+                for offset, factor in enumerate(multipliers[k], k + 1):
+                    values[offset] = values[offset] - factor * value
+        for k in range(size - 1, -1, -1):
+            row = rows[k]
+            total = values[k] - sum(map(mul, row[1:], values[k+1:k+len(row)]))
+            values[k] = divide(total, row[0])
+        return values
+
+    def __init__(self, size, lower, upper, bands):
+        """(BandedMatrix, int, int, int, list of list of Number) -> NoneType
+
+        Creates a size x size matrix with the given number of sub-diagonals
+        and super-diagonals from its diagonals, in order from the lowest
+        sub-diagonal to the highest super-diagonal. The diagonal at offset d
+        (negative below the main diagonal) has size - |d| entries, the k-th
+        of which is in row k + max(0, -d) and column k + max(0, d).
+
+        REQ: len(bands) == lower + 1 + upper
+        REQ: 0 <= lower < size and 0 <= upper < size
+        """
+        if len(bands) != lower + 1 + upper:
+            raise MatrixDimensionError("diagonals do not match the bandwidth")
+        if not (0 <= lower < max(size, 1) and 0 <= upper < max(size, 1)):
+            raise MatrixDimensionError("bandwidth out of range")
+        for offset, band in enumerate(bands, -lower):
+            if len(band) != size - abs(offset):
+                raise MatrixDimensionError(
+                    "diagonal {} must have {} entries".format(
+                        offset, size - abs(offset)))
+        self._size = size
+        self._lower = lower
+        self._upper = upper
+        self._bands = bands
+        self._factorizations = dict()
+
+    def _band(self, offset):
+        """(BandedMatrix, int) -> list of Number
+
+        Returns the entries of the diagonal at the given offset, all zeros
+        if it lies outside the band.
+        """
+        if -self._lower <= offset <= self._upper:
+            return self._bands[self._lower + offset]
+        return [0] * max(0, self._size - abs(offset))
+
+    def _is_float(self):
+        return any(isinstance(value, float)
+                   for band in self._bands for value in band)
+
+    def __repr__(self):
+        return "B({}, {}, {}, {})".format(self._size, self._lower,
+                                          self._upper, self._bands)
+
+    def __str__(self):
+        return str(self.to_matrix())
+
+    def __eq__(self, other):
+        if isinstance(other, Matrix):
+            if other.rows() != other.columns():
+                return False
+            other = BandedMatrix.from_matrix(other)
+        if isinstance(other, BandedMatrix):
+            return (self._size == other._size and
+                    all(self._band(offset) == other._band(offset)
+                        for offset in range(
+                            -max(self._lower, other._lower),
+                            max(self._upper, other._upper) + 1)))
+        return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __neg__(self):
+        return self.__mul__(-1)
+
+    def __mul__(self, other):
+        """(BandedMatrix, Matrix or Vector or Scalar)
+            -> Matrix or Vector or BandedMatrix
+
+        Returns a product of this matrix with another value.
+        If other is a...
+          Matrix: returns matrix, result of matrix multiplication.
+          Vector: returns vector, result of matrix-vector multiplication,
+                  in O(n(p+q)) time.
+          Scalar: returns banded matrix, result of scalar multiplication.
+
+        REQ: if other is a matrix, self.columns == other.rows
+        REQ: if other is vector, self.columns == other.dimension
+        """
+        if isinstance(other, Matrix):
+            return self.to_matrix()._multiply(other)
+        elif isinstance(other, Vector):
+            if self._size != other.dimension():
+                err_msg = "vector must have same dimensions as matrix columns"
+                raise MatrixDimensionError(err_msg)
+            values = list(other)
+            prod_v = [0] * self._size
+            for offset, band in enumerate(self._bands, -self._lower):
+                row, col = max(0, -offset), max(0, offset)
+                stop = row + len(band)
+                prod_v[row:stop] = map(add, prod_v[row:stop],
+                                       map(mul, band, values[col:]))
+            return Vector(*prod_v)
+        elif isinstance(other, (int, float, Fraction)):
+            return BandedMatrix(self._size, self._lower, self._upper,
+                                [[value * other for value in band]
+                                 for band in self._bands])
+        return NotImplemented
+
+    def __rmul__(self, other):
+        """(BandedMatrix, Matrix or Scalar) -> Matrix or BandedMatrix
+
+        Returns the product of another value with this matrix.
+
+        REQ: if other is a matrix, other.columns == self.rows
+        """
+        if isinstance(other, Matrix):
+            return other._multiply(self.to_matrix())
+        return self.__mul__(other)
+
+    # <!-- basic operations -->
+
+    def rows(self):
+        """(BandedMatrix) -> int
+
+        Returns the number of rows in this matrix.
+        """
+        return self._size
+
+    def columns(self):
+        """(BandedMatrix) -> int
+
+        Returns the number of columns in this matrix.
+        """
+        return self._size
+
+    def dimensions(self):
+        """(BandedMatrix) -> int, int
+
+        Returns the dimensions of this matrix.
+        """
+        return self._size, self._size
+
+    def bandwidth(self):
+        """(BandedMatrix) -> int, int
+
+        Returns the number of sub-diagonals and super-diagonals stored for
+        this matrix.
+        """
+        return self._lower, self._upper
+
+    def get(self, row_pos, col_pos, by_index=False):
+        """(BandedMatrix, int, int[, bool]) -> Number
+
+        Returns the number at the given row and column position in this matrix.
+
+        REQ: 1 <= row_pos <= self.rows()
+        REQ: 1 <= col_pos <= self.columns()
+        """
+        if not by_index:
+            row_pos, col_pos = row_pos - 1, col_pos - 1
+        if not (0 <= row_pos < self._size and 0 <= col_pos < self._size):
+            raise IndexError("position out of range")
+        offset = col_pos - row_pos
+        if -self._lower <= offset <= self._upper:
+            return self._bands[self._lower + offset][min(row_pos, col_pos)]
+        return 0
+
+    def diagonal(self, offset=0):
+        """(BandedMatrix[, int]) -> Vector
+
+        Returns the diagonal at the given offset, which is negative for the
+        sub-diagonals and positive for the super-diagonals.
+
+        REQ: abs(offset) < self.rows()
+        """
+        if abs(offset) >= self._size:
+            raise IndexError("diagonal out of range")
+        return Vector(*self._band(offset))
+
+    def transpose(self):
+        """(BandedMatrix) -> BandedMatrix
+
+        Returns the transpose of this matrix.
+        """
+        return BandedMatrix(self._size, self._upper, self._lower,
+                            [list(band) for band in reversed(self._bands)])
+
+    def to_matrix(self, storage="list"):
+        """(BandedMatrix[, str]) -> Matrix
+
+        Returns the dense matrix with the same entries as this matrix.
+        See Matrix.__init__() for the storage options.
+        """
+        dense_m = [[0] * self._size for i in range(self._size)]
+        for offset, band in enumerate(self._bands, -self._lower):
+            row, col = max(0, -offset), max(0, offset)
+            for k, value in enumerate(band):
+                dense_m[row+k][col+k] = value
+        return Matrix(*dense_m, storage=storage)
+
+    # <!-- complex operations -->
+
+    def _arithmetic(self, arithmetic, values=()):
+        """(BandedMatrix, str or NoneType[, list of Number])
+            -> callable, float
+
+        Returns the division and the zero tolerance of the given arithmetic:
+        Fraction.divide() and no tolerance for "exact", true division and
+        Matrix.FLOAT_TOLERANCE times the largest entry in magnitude for
+        "float". By default the arithmetic is "float" iff an entry of this
+        matrix or one of the given values is a float.
+        """
+        if arithmetic is None:
+            floating = self._is_float() or any(
+                isinstance(value, float) for value in values)
+        else:
+            if arithmetic not in ("exact", "float"):
+                raise ValueError("arithmetic must be 'exact' or 'float'")
+            floating = arithmetic == "float"
+        if not floating:
+            return Fraction.divide, 0
+        largest = max([abs(float(value))
+                       for band in self._bands for value in band] or [0.0])
+        return truediv, Matrix.FLOAT_TOLERANCE * largest
+
+    def _values(self, arithmetic):
+        """(BandedMatrix, str) -> list of list of Number
+
+        Returns the diagonals of this matrix, as floats if the arithmetic is
+        "float".
+        """
+        if arithmetic == "float":
+            return [[float(value) for value in band] for band in self._bands]
+        return self._bands
+
+    def _lu_factorization(self, arithmetic=None):
+        """(BandedMatrix[, str]) -> tuple
+
+        Returns the banded LU factorization of this matrix from
+        BandedMatrix._banded_lu() in the given arithmetic, computed once and
+        kept for later solves.
+        """
+        divide, tolerance = self._arithmetic(arithmetic)
+        key = "float" if divide is truediv else "exact"
+        if key not in self._factorizations:
+            self._factorizations[key] = BandedMatrix._banded_lu(
+                self._size, self._lower, self._upper, self._values(key),
+                divide, tolerance)
+        return self._factorizations[key]
+
+    def solve_for_x(self, vector_b, arithmetic=None):
+        """(BandedMatrix, Vector[, str]) -> Vector
+
+        Returns the vector x given the vector b, such that the following
+        equation is satisfied:
+            Ax = b
+        Tridiagonal systems are solved by the Thomas algorithm in O(n) time.
+        Any other system, and any tridiagonal system that meets a zero pivot
+        without row interchanges, is solved by banded LU elimination with
+        partial pivoting in O(np(p+q)) time. The arithmetic is "exact" or
+        "float"; by default it is "float" iff A or b has a float entry.
+        Raises SingularMatrixError if this matrix is singular.
+
+        REQ: len(vector_b) == self.rows()
+        """
+        if self._size != vector_b.dimension():
+            err_msg = "vector must have same dimensions as this matrix's rows"
+            raise MatrixDimensionError(err_msg)
+        values = list(vector_b)
+        divide, tolerance = self._arithmetic(arithmetic, values)
+        key = "float" if divide is truediv else "exact"
+        if key == "float":
+            values = [float(value) for value in values]
+        tridiagonal = self._lower <= 1 and self._upper <= 1
+        if tridiagonal and key not in self._factorizations:
+            bands = self._values(key)
+            try:
+                return Vector(*BandedMatrix._thomas(
+                    bands[0] if self._lower else self._band(-1),
+                    bands[self._lower],
+                    bands[-1] if self._upper else self._band(1),
+                    list(values), divide, tolerance))
+            except SingularMatrixError:
+                pass
+        return Vector(*BandedMatrix._banded_lu_solve(
+            self._lu_factorization(key), values, divide))
+
+    def determinant(self, arithmetic=None):
+        """(BandedMatrix[, str]) -> Number
+
+        Returns the determinant of this matrix, from its banded LU
+        factorization. See solve_for_x() for the arithmetic.
+        """
+        try:
+            rows, multipliers, pivots, sign = self._lu_factorization(
+                arithmetic)
+        except SingularMatrixError:
+            return 0.0 if self._arithmetic(arithmetic)[0] is truediv else 0
+        det = sign
+        for row in rows:
+            det *= row[0]
+        return det
+
+
+def examples():
+    """() -> NoneType
+
+    Displays examples of banded matrix operations.
+    """
+    mtx_a = BandedMatrix.tridiagonal([-1, -1, -1], [2, 2, 2, 2], [-1, -1, -1])
+    mtx_b = BandedMatrix.from_matrix(Matrix([1, 2, 0, 0], [3, 1, 2, 0],
+                                            [1, 3, 1, 2], [0, 1, 3, 1]))
+    vtr_b = Vector(1, 0, 0, 1)
+
+    print("\nTridiagonal matrix A:")
+    print(mtx_a)
+    print("\nBanded matrix B:")
+    print(mtx_b)
+    print("\nBandwidth of B:")
+    print(mtx_b.bandwidth())
+
+    print("\n> Banded matrix operations")
+    print("-" * 40)
+    print("\nMatrix-vector product A*b:")
+    print(mtx_a * vtr_b)
+    print("\nDeterminant of B:")
+    print(mtx_b.determinant())
+
+    print("\n> Ax = b, solving for x")
+    print("-" * 40)
+    print("\nVector b:")
+    print(vtr_b)
+    print("\nResult vector x (Thomas algorithm):")
+    print(mtx_a.solve_for_x(vtr_b))
+    print("\nResult vector x for B (banded LU):")
+    print(mtx_b.solve_for_x(vtr_b))
+
+    print(
+        # end of examples
+    )
+
+
+if __name__ == "__main__":
+    examples()
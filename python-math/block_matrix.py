@@ -0,0 +1,533 @@
+"""This module contains a structured block matrix, for matrices made of
+sub-matrices that should not be materialized as one dense matrix.
+
+A block matrix is either
+  - a grid of blocks, such as a block-diagonal or block-triangular matrix,
+    where None stands for a zero block, or
+  - a Kronecker product A (x) B of two factors, which takes the memory of
+    A and B instead of the memory of their product.
+Blocks and factors are Matrices or block matrices themselves. Products and
+solves work on the blocks: zero blocks are skipped, block-triangular systems
+are solved by block substitution, and the Kronecker identities
+    (A (x) B) vec(X) = vec(A X B^T)
+    (A (x) B)(C (x) D) = AC (x) BD
+    det(A (x) B) = det(A)^p det(B)^m
+are used without forming A (x) B, where vec() lists the rows of a matrix
+one after the other.
+"""
+
+from bisect import bisect_right
+from itertools import accumulate
+from operator import add, sub
+
+from fraction import Fraction
+from matrix import Matrix, MatrixDimensionError
+from vector import Vector
+
+
+def _dense(block):
+    if isinstance(block, BlockMatrix):
+        return block.to_matrix()
+    return block
+
+
+def _product(left, right):
+    """(Matrix or BlockMatrix, object) -> object
+
+    Returns the product of the given block with a matrix, block matrix,
+    vector or scalar right away, even if Matrix.LAZY is set.
+    """
+    if isinstance(left, Matrix) and not isinstance(right, BlockMatrix):
+        return left._multiply(right)
+    return left * right
+
+
+def _add_rows(total, rows):
+    if total is None:
+        return [list(row) for row in rows]
+    return [list(map(add, total_row, row))
+            for total_row, row in zip(total, rows)]
+
+
+def _split(values, sizes):
+    """(list, list of int) -> list of list
+
+    Returns the given values split into consecutive parts of the given
+    sizes.
+    """
+    stops = list(accumulate(sizes))
+    return [values[stop-size:stop] for size, stop in zip(sizes, stops)]
+
+
+def _solve_many(block, vectors_b, arithmetic):
+    """(Matrix or BlockMatrix, list of Vector, str) -> list of Vector
+
+    Returns the solutions x of Ax = b for the given square block A and each
+    of the given vectors b. A Matrix is factorized once for all of them.
+    """
+    if isinstance(block, Matrix):
+        return block.factorize(arithmetic).solve_many(vectors_b)
+    return [block.solve_for_x(vector_b, arithmetic) for vector_b in vectors_b]
+
+
+class BlockMatrix(object):
+    """A class to represent a matrix by its blocks or by the factors of a
+    Kronecker product, without materializing it."""
+
+    @staticmethod
+    def diagonal(*blocks):
+        """(Matrix or BlockMatrix, ...) -> BlockMatrix
+
+        Returns the block-diagonal matrix with the given diagonal blocks.
+        """
+        return BlockMatrix([[block if i == j else None
+                             for j in range(len(blocks))]
+                            for i, block in enumerate(blocks)])
+
+    @staticmethod
+    def kron(*factors):
+        """(Matrix or BlockMatrix, ...) -> BlockMatrix
+
+        Returns the Kronecker product of the given factors, A (x) B (x) ...,
+        without forming it. Use Matrix.kron() to form it.
+
+        REQ: at least two factors
+        """
+        if len(factors) < 2:
+            raise ValueError("Kronecker product needs at least two factors")
+        right = factors[-1]
+        for left in reversed(factors[:-1]):
+            right = BlockMatrix._kron_pair(left, right)
+        return right
+
+    @staticmethod
+    def _kron_pair(left, right):
+        """(Matrix or BlockMatrix, Matrix or BlockMatrix) -> BlockMatrix
+
+        Returns the Kronecker product of the two factors.
+        """
+        kron = BlockMatrix.__new__(BlockMatrix)
+        kron._blocks = None
+        kron._factors = (left, right)
+        (left_rows, left_cols), (right_rows, right_cols) = (
+            left.dimensions(), right.dimensions())
+        kron._rows = left_rows * right_rows
+        kron._cols = left_cols * right_cols
+        return kron
+
+    def __init__(self, blocks):
+        """(BlockMatrix, list of list of Matrix or BlockMatrix) -> NoneType
+
+        Creates a block matrix from the given grid of blocks, e.g.
+            BlockMatrix([[A, B], [None, D]])
+        where a block of None is a zero block. The blocks are kept as they
+        are. See Matrix.block() for the requirements on their dimensions.
+        """
+        self._blocks = [list(block_row) for block_row in blocks]
+        self._factors = None
+        self._row_sizes, self._col_sizes = Matrix._block_sizes(self._blocks)
+        self._row_offsets = [0] + list(accumulate(self._row_sizes))
+        self._col_offsets = [0] + list(accumulate(self._col_sizes))
+        self._rows = self._row_offsets[-1]
+        self._cols = self._col_offsets[-1]
+
+    def __repr__(self):
+        if self._factors is not None:
+            return "BlockMatrix.kron({!r}, {!r})".format(*self._factors)
+        return "BlockMatrix({!r})".format(self._blocks)
+
+    def __str__(self):
+        return str(self.to_matrix())
+
+    def __eq__(self, other):
+        if isinstance(other, (Matrix, BlockMatrix)):
+            return self.to_matrix() == _dense(other)
+        return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __neg__(self):
+        return self.__mul__(-1)
+
+    def __mul__(self, other):
+        """(BlockMatrix, Matrix or BlockMatrix or Vector or Scalar)
+            -> Matrix or BlockMatrix or Vector
+
+        Returns a product of this matrix with another value.
+        If other is a...
+          Matrix: returns matrix, result of matrix multiplication.
+          BlockMatrix: returns block matrix (AC (x) BD) if both are Kronecker
+                       products with matching factors, or the block product
+                       if both are grids with matching partitions; otherwise
+                       returns matrix, result of matrix multiplication.
+          Vector: returns vector, result of matrix-vector multiplication.
+          Scalar: returns block matrix, result of scalar multiplication.
+
+        REQ: if other is a matrix, self.columns == other.rows
+        REQ: if other is vector, self.columns == other.dimension
+        """
+        if isinstance(other, Vector):
+            if self._cols != other.dimension():
+                err_msg = "vector must have same dimensions as matrix columns"
+                raise MatrixDimensionError(err_msg)
+            return Vector(*Vector._demote_floats(
+                self._multiply_values(list(other))))
+        elif isinstance(other, (Matrix, BlockMatrix)):
+            if self._cols != other.rows():
+                err_msg = "matrix columns must match the other matrix's rows"
+                raise MatrixDimensionError(err_msg)
+            if isinstance(other, BlockMatrix):
+                return self._multiply_block(other)
+            return self._multiply_matrix(other)
+        elif isinstance(other, (int, float, Fraction)):
+            if self._factors is not None:
+                left, right = self._factors
+                return BlockMatrix._kron_pair(_product(left, other), right)
+            return BlockMatrix([[None if block is None
+                                 else _product(block, other)
+                                 for block in block_row]
+                                for block_row in self._blocks])
+        return NotImplemented
+
+    def __rmul__(self, other):
+        """(BlockMatrix, Matrix or Scalar) -> Matrix or BlockMatrix
+
+        Returns the product of another value with this matrix, as the
+        transpose of (this matrix)^T times (the other value)^T.
+
+        REQ: if other is a matrix, other.columns == self.rows
+        """
+        if isinstance(other, Matrix):
+            if other.columns() != self._rows:
+                err_msg = "matrix columns must match the other matrix's rows"
+                raise MatrixDimensionError(err_msg)
+            return self.transpose()._multiply_matrix(
+                other.transpose()).transpose()
+        return self.__mul__(other)
+
+    def _multiply_values(self, values):
+        """(BlockMatrix, list of Number) -> list of Number
+
+        Returns the product of this matrix with the vector of the given
+        values. A Kronecker product A (x) B, with A m x n and B p x q,
+        reshapes the values into the n x q matrix X and computes the rows
+        of A X B^T, as the columns of B (A X)^T, in O(mq(n+p)) time instead
+        of O(mnpq).
+        """
+        if self._factors is not None:
+            left, right = self._factors
+            num_rows = left.rows()
+            right_rows, right_cols = right.dimensions()
+            reshaped = Matrix(*_split(values, [right_cols] * left.columns()))
+            prod_m = _product(right, _product(left, reshaped).transpose())
+            prod_rows = prod_m._raw_rows()
+            return [prod_rows[r][i]
+                    for i in range(num_rows) for r in range(right_rows)]
+        prod_v = list()
+        segments = [Vector(*segment)
+                    for segment in _split(values, self._col_sizes)]
+        for block_row in self._blocks:
+            total = None
+            for block, segment in zip(block_row, segments):
+                if block is not None:
+                    total = _add_rows(total, [_product(block, segment)])
+            prod_v.extend(total[0])
+        return prod_v
+
+    def _multiply_matrix(self, other):
+        """(BlockMatrix, Matrix) -> Matrix
+
+        Returns the product of this matrix with the other matrix: one column
+        at a time for a Kronecker product, and one block row at a time for a
+        grid, where each block multiplies the rows of the other matrix that
+        line up with its columns.
+        """
+        other_rows = [list(row) for row in other._raw_rows()]
+        if self._factors is not None:
+            columns = [self._multiply_values(list(column))
+                       for column in zip(*other_rows)]
+            prod_m = [list(row) for row in zip(*columns)]
+        else:
+            segments = [Matrix(*segment)
+                        for segment in _split(other_rows, self._col_sizes)]
+            prod_m = list()
+            for block_row in self._blocks:
+                total = None
+                for block, segment in zip(block_row, segments):
+                    if block is not None:
+                        total = _add_rows(
+                            total, _product(block, segment)._raw_rows())
+                prod_m.extend(total)
+        return Matrix(*[Vector._demote_floats(row) for row in prod_m])
+
+    def _multiply_block(self, other):
+        """(BlockMatrix, BlockMatrix) -> BlockMatrix or Matrix
+
+        Returns the product of this matrix with the other block matrix. See
+        __mul__().
+        """
+        if self._factors is not None and other._factors is not None:
+            left, right = self._factors
+            other_left, other_right = other._factors
+            if (left.columns() == other_left.rows() and
+                    right.columns() == other_right.rows()):
+                return BlockMatrix._kron_pair(_product(left, other_left),
+                                              _product(right, other_right))
+        elif (self._blocks is not None and other._blocks is not None and
+                self._col_sizes == other._row_sizes):
+            prod_blocks = list()
+            for block_row in self._blocks:
+                prod_row = list()
+                for j in range(len(other._col_sizes)):
+                    terms = [_product(block, other_row[j])
+                             for block, other_row
+                             in zip(block_row, other._blocks)
+                             if block is not None and other_row[j] is not None]
+                    if len(terms) > 1:
+                        total = None
+                        for term in terms:
+                            total = _add_rows(total,
+                                              _dense(term)._raw_rows())
+                        terms = [Matrix(*total)]
+                    prod_row.append(terms[0] if terms else None)
+                prod_blocks.append(prod_row)
+            return BlockMatrix(prod_blocks)
+        return self._multiply_matrix(other.to_matrix())
+
+    # <!-- basic operations -->
+
+    def rows(self):
+        """(BlockMatrix) -> int
+
+        Returns the number of rows in this matrix.
+        """
+        return self._rows
+
+    def columns(self):
+        """(BlockMatrix) -> int
+
+        Returns the number of columns in this matrix.
+        """
+        return self._cols
+
+    def dimensions(self):
+        """(BlockMatrix) -> int, int
+
+        Returns the dimensions of this matrix.
+        """
+        return self._rows, self._cols
+
+    def is_square(self):
+        """(BlockMatrix) -> bool
+
+        Returns True iff this matrix has as many rows as columns.
+        """
+        return self._rows == self._cols
+
+    def get(self, row_pos, col_pos, by_index=False):
+        """(BlockMatrix, int, int[, bool]) -> Number
+
+        Returns the number at the given row and column position in this matrix.
+
+        REQ: 1 <= row_pos <= self.rows()
+        REQ: 1 <= col_pos <= self.columns()
+        """
+        if not by_index:
+            row_pos, col_pos = row_pos - 1, col_pos - 1
+        if not (0 <= row_pos < self._rows and 0 <= col_pos < self._cols):
+            raise IndexError("position out of range")
+        if self._factors is not None:
+            left, right = self._factors
+            right_rows, right_cols = right.dimensions()
+            return (left.get(row_pos // right_rows, col_pos // right_cols,
+                             True) *
+                    right.get(row_pos % right_rows, col_pos % right_cols,
+                              True))
+        i = bisect_right(self._row_offsets, row_pos) - 1
+        j = bisect_right(self._col_offsets, col_pos) - 1
+        block = self._blocks[i][j]
+        if block is None:
+            return 0
+        return block.get(row_pos - self._row_offsets[i],
+                         col_pos - self._col_offsets[j], True)
+
+    def transpose(self):
+        """(BlockMatrix) -> BlockMatrix
+
+        Returns the transpose of this matrix, with transposed blocks (or
+        factors, since (A (x) B)^T = A^T (x) B^T).
+        """
+        if self._factors is not None:
+            left, right = self._factors
+            return BlockMatrix._kron_pair(left.transpose(), right.transpose())
+        return BlockMatrix([[None if block is None else block.transpose()
+                             for block in block_column]
+                            for block_column in zip(*self._blocks)])
+
+    def to_matrix(self):
+        """(BlockMatrix) -> Matrix
+
+        Returns the dense matrix with the same entries as this matrix.
+        """
+        if self._factors is not None:
+            left, right = self._factors
+            return _dense(left).kron(_dense(right))
+        return Matrix.block([[None if block is None else _dense(block)
+                              for block in block_row]
+                             for block_row in self._blocks])
+
+    # <!-- complex operations -->
+
+    def _triangular(self):
+        """(BlockMatrix) -> str or NoneType
+
+        Returns "lower" or "upper" if this matrix is a grid of square
+        diagonal blocks with only zero blocks above or below them, checking
+        "lower" first (a block-diagonal matrix is both), and None otherwise.
+        """
+        if (self._blocks is None or self._row_sizes != self._col_sizes or
+                any(block_row[i] is None
+                    for i, block_row in enumerate(self._blocks))):
+            return None
+        for shape, beyond in (("lower", 1), ("upper", -1)):
+            if all(block is None
+                   for i, block_row in enumerate(self._blocks)
+                   for j, block in enumerate(block_row)
+                   if (j - i) * beyond > 0):
+                return shape
+        return None
+
+    def solve_for_x(self, vector_b, arithmetic=None):
+        """(BlockMatrix, Vector[, str]) -> Vector
+
+        Returns the vector x given the vector b, such that the following
+        equation is satisfied:
+            Ax = b
+        A Kronecker product A (x) B is solved as A X B^T = Y, with one
+        factorization of A and of B. A block-triangular (or block-diagonal)
+        matrix is solved by block substitution with its diagonal blocks.
+        Any other matrix is solved as a dense matrix. See
+        Matrix.solve_for_x() for the arithmetic.
+
+        REQ: matrix must be a square and not singular
+        REQ: len(vector_b) == self.rows()
+        """
+        if not self.is_square():
+            raise MatrixDimensionError("matrix must be a square matrix")
+        if self._rows != vector_b.dimension():
+            err_msg = "vector must have same dimensions as this matrix's rows"
+            raise MatrixDimensionError(err_msg)
+        values = list(vector_b)
+        if self._factors is not None:
+            left, right = self._factors
+            if left.is_square() and right.is_square():
+                size = right.rows()
+                # the columns of Y solve to the columns of X B^T
+                halfway = _solve_many(
+                    left, [Vector(*values[r::size]) for r in range(size)],
+                    arithmetic)
+                solution = _solve_many(
+                    right, [Vector(*row) for row in zip(*halfway)],
+                    arithmetic)
+                return Vector(*[value for part in solution for value in part])
+        shape = self._triangular()
+        if shape is None:
+            return self.to_matrix().solve_for_x(vector_b, arithmetic)
+        segments = _split(values, self._row_sizes)
+        order = range(len(segments))
+        if shape == "upper":
+            order = reversed(order)
+        solution = [None] * len(segments)
+        for i in order:
+            rhs = segments[i]
+            for j, block in enumerate(self._blocks[i]):
+                if j != i and block is not None:
+                    rhs = list(map(sub, rhs, _product(block, solution[j])))
+            solution[i] = self._blocks[i][i].solve_for_x(Vector(*rhs),
+                                                         arithmetic)
+        return Vector(*[value for part in solution for value in part])
+
+    def determinant(self, arithmetic=None):
+        """(BlockMatrix[, str]) -> Number
+
+        Returns the determinant of this matrix: det(A)^p * det(B)^m for the
+        Kronecker product of an m x m matrix A and a p x p matrix B, the
+        product of the determinants of the diagonal blocks for a
+        block-triangular matrix, and the determinant of the dense matrix
+        otherwise. See Matrix.determinant() for the arithmetic.
+
+        REQ: matrix must be a square
+        """
+        if not self.is_square():
+            raise MatrixDimensionError("matrix must be a square matrix")
+        if self._factors is not None:
+            left, right = self._factors
+            if left.is_square() and right.is_square():
+                return (left.determinant(arithmetic=arithmetic) **
+                        right.rows() *
+                        right.determinant(arithmetic=arithmetic) **
+                        left.rows())
+        elif self._triangular() is not None:
+            det = 1
+            for i, block_row in enumerate(self._blocks):
+                det *= block_row[i].determinant(arithmetic=arithmetic)
+            return det
+        return self.to_matrix().determinant(arithmetic=arithmetic)
+
+
+def examples():
+    """() -> NoneType
+
+    Displays examples of block matrix operations.
+    """
+    mtx_h = Matrix([1, 1], [1, -1])
+    mtx_x = Matrix([0, 1], [1, 0])
+    mtx_a = Matrix([4, 1], [2, 3])
+    mtx_b = Matrix([2, 0, 1], [1, 3, 0], [0, 1, 2])
+    vtr_b = Vector(1, 0, 0, 0, 0, 1, 0, 1)
+
+    print("\nMatrix H:")
+    print(mtx_h)
+    print("\nMatrix X:")
+    print(mtx_x)
+
+    print("\n> Kronecker products")
+    print("-" * 40)
+    kron = BlockMatrix.kron(mtx_h, mtx_x, mtx_h)
+    print("\nH (x) X (x) H, formed by Matrix.kron():")
+    print(mtx_h.kron(mtx_x).kron(mtx_h))
+    print("\nVector b:")
+    print(vtr_b)
+    print("\n(H (x) X (x) H) * b, without forming H (x) X (x) H:")
+    print(kron * vtr_b)
+    print("\nDeterminant of H (x) X (x) H:")
+    print(kron.determinant())
+
+    print("\n> Block matrices")
+    print("-" * 40)
+    print("\nMatrix A:")
+    print(mtx_a)
+    print("\nMatrix B:")
+    print(mtx_b)
+    block = BlockMatrix([[mtx_a, Matrix([1, 0, 0], [0, 1, 0])],
+                         [None, mtx_b]])
+    print("\nBlock matrix M = [[A, C], [0, B]]:")
+    print(block)
+    print("\nM assembled by Matrix.block():")
+    print(Matrix.block([[mtx_a, Matrix([1, 0, 0], [0, 1, 0])],
+                        [None, mtx_b]]))
+    print("\nDeterminant of M:")
+    print(block.determinant())
+    vtr_c = Vector(1, 2, 3, 4, 5)
+    print("\nResult vector x for Mx = {} (block substitution):".format(
+        vtr_c))
+    print(block.solve_for_x(vtr_c))
+
+    print(
+        # end of examples
+    )
+
+
+if __name__ == "__main__":
+    examples()
@@ -25,7 +25,7 @@ class ComplexMatrix(Matrix):
         Returns the conjugate of this matrix.
         """
         conj_mtx = list()
-        for row in self._m:
+        for row in self._mtx:
             conj_row = list()
             for value in row:
                 conj_row.append(value.conjugate())
@@ -46,7 +46,7 @@ class ComplexMatrix(Matrix):
             (U*)U = I <=> U^-1 = U
         """
         herm_adj = self.hermitian_adjoint()
-        prod = self * herm_adj
+        prod = self._multiply(herm_adj)
         identity = ComplexMatrix.identity(prod.rows())
         return prod == identity
 
@@ -59,6 +59,9 @@ class ComplexMatrix(Matrix):
         herm_adj = self.hermitian_adjoint()
         return self == herm_adj
 
+    def _is_self_adjoint(self):
+        return self.is_hermitian()
+
     def is_normal(self):
         """(ComplexMatrix) -> bool
 
@@ -68,7 +71,7 @@ class ComplexMatrix(Matrix):
         if not self.is_square():
             raise ValueError("matrix must be a square matrix")
         herm_adj = self.hermitian_adjoint()
-        return self*herm_adj == herm_adj*self
+        return self._multiply(herm_adj) == herm_adj._multiply(self)
 
 
 def examples():
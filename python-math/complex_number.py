@@ -67,6 +67,14 @@ class Complex(object):
         else:
             return self * self.__pow__(power - 1)
 
+    def __hash__(self):
+        if self._b == 0:
+            return hash(self._a)
+        return hash((self._a, self._b))
+
+    def __complex__(self):
+        return complex(float(self._a), float(self._b))
+
     def __eq__(self, other):
         if isinstance(other, Complex):
             return self._a == other.real() and self._b == other.imaginary()
@@ -12,7 +12,9 @@ class Fraction(object):
 
     @staticmethod
     def _gcd(num1, num2):
-        return num2 if (num1 % num2 == 0) else Fraction._gcd(num2, num1 % num2)
+        while num1 % num2 != 0:
+            num1, num2 = num2, num1 % num2
+        return num2
 
     @staticmethod
     def _lcm(num1, num2):
@@ -75,6 +77,36 @@ class Fraction(object):
             result = result.simplify()
         return result
 
+    @staticmethod
+    def divide(dividend, divisor):
+        """(Number, Number) -> Number
+
+        Returns the exact quotient of the given numbers. Integers and
+        fractions are divided without rounding, returning an int whenever the
+        quotient is whole. Any other numbers are divided normally.
+
+        REQ: divisor != 0
+        """
+        if divisor == 0:
+            raise ZeroDivisionError("division by zero")
+        if isinstance(dividend, int) and isinstance(divisor, int):
+            if dividend % divisor == 0:
+                return dividend // divisor
+            return Fraction(dividend, divisor).simplify()
+        if isinstance(dividend, (int, Fraction)):
+            quotient = None
+            if isinstance(divisor, Fraction):
+                quotient = dividend * divisor.reciprocal()
+            elif isinstance(divisor, int):
+                quotient = dividend * Fraction(1, divisor)
+            if isinstance(quotient, Fraction):
+                return quotient.simplify()
+            elif quotient is not None:
+                return quotient
+        if isinstance(dividend, Fraction) or isinstance(divisor, Fraction):
+            return float(dividend) / float(divisor)
+        return dividend / divisor
+
     def __lt__(self, other):
         if isinstance(other, Fraction):
             other_n = other.numerator()
@@ -95,11 +127,7 @@ class Fraction(object):
         elif isinstance(other, Fraction):
             if self._d == other.denominator():
                 return self._n == other.numerator()
-            simp_self = self.simplify()
-            simp_other = other.simplify()
-            same_n = simp_self.numerator() == simp_other.numerator()
-            same_d = simp_self.denominator() == simp_other.denominator()
-            return same_n and same_d
+            return self._n * other.denominator() == other.numerator() * self._d
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -230,6 +258,9 @@ class Fraction(object):
         Returns the float representation of this fraction.
         """
         simp_self = self.simplify()
+        # a whole fraction simplifies to an int
+        if isinstance(simp_self, int):
+            return float(simp_self)
         return simp_self.numerator() / simp_self.denominator()
 
     def reciprocal(self):
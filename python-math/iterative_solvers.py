@@ -0,0 +1,268 @@
+"""This module contains iterative solvers for large systems of linear
+equations Ax = b: conjugate gradient, Jacobi and Gauss-Seidel.
+
+Each solver works in floating point, stops once the residual norm
+|b - Ax| is at most tolerance * |b|, and calls an optional
+callback(iteration, x, residual_norm) after every iteration.
+
+Conjugate gradient needs only the product of A with a vector, so A may be
+any operator. Jacobi needs the diagonal of A too, which is read from a
+Matrix or SparseMatrix or given explicitly for any other operator.
+Gauss-Seidel updates one entry at a time from the entries of each row, so
+it needs a Matrix or SparseMatrix.
+"""
+
+from math import sqrt
+
+from matrix import ConvergenceError, Matrix, MatrixDimensionError
+from vector import Vector
+
+
+def _dot(values1, values2):
+    return sum(a * b for a, b in zip(values1, values2))
+
+
+def _initial_guess(x0, size):
+    if x0 is None:
+        return [0.0] * size
+    if x0.dimension() != size:
+        raise MatrixDimensionError("initial guess has the wrong dimension")
+    return [float(value) for value in x0]
+
+
+def _sparse_rows(matrix):
+    """(Matrix or SparseMatrix) -> list of list of (int, float)
+
+    Returns the non-zero entries (column index, value) of each row of the
+    given matrix.
+    """
+    if hasattr(matrix, "to_coo"):
+        rows = [list() for i in range(matrix.rows())]
+        for row_pos, col_pos, value in matrix.to_coo():
+            rows[row_pos-1].append((col_pos-1, float(value)))
+        return rows
+    return [[(j, float(value)) for j, value in enumerate(row) if value != 0]
+            for row in matrix]
+
+
+def _split_diagonal(matrix):
+    """(Matrix or SparseMatrix) -> list of float, list of list of (int, float)
+
+    Returns the diagonal of the given square matrix and the off-diagonal
+    non-zero entries of each row.
+    """
+    if not (isinstance(matrix, Matrix) or hasattr(matrix, "to_coo")):
+        raise TypeError("matrix must be a Matrix or a SparseMatrix")
+    if matrix.rows() != matrix.columns():
+        raise MatrixDimensionError("matrix must be a square matrix")
+    diagonal = [0.0] * matrix.rows()
+    off_diagonal = list()
+    for i, row in enumerate(_sparse_rows(matrix)):
+        off_row = list()
+        for j, value in row:
+            if i == j:
+                diagonal[i] = value
+            else:
+                off_row.append((j, value))
+        off_diagonal.append(off_row)
+    if 0.0 in diagonal:
+        raise ValueError("matrix must have a non-zero diagonal")
+    return diagonal, off_diagonal
+
+
+def _residual_norm(diagonal, off_diagonal, values_b, x):
+    total = 0.0
+    for i, off_row in enumerate(off_diagonal):
+        residual = values_b[i] - diagonal[i] * x[i]
+        for j, value in off_row:
+            residual -= value * x[j]
+        total += residual * residual
+    return sqrt(total)
+
+
+def conjugate_gradient(operator, vector_b, x0=None, tolerance=1e-10,
+                       max_iterations=None, callback=None):
+    """(object, Vector[, Vector, float, int, callable]) -> Vector
+
+    Returns the vector x such that Ax = b by the conjugate gradient method.
+    The operator A may be a Matrix, a SparseMatrix or any other object whose
+    product with a Vector (operator * vector) is a Vector, and must be
+    symmetric positive-definite. Runs at most max_iterations iterations,
+    which defaults to the dimension of b.
+
+    REQ: A is symmetric positive-definite
+    """
+    size = vector_b.dimension()
+    values_b = [float(value) for value in vector_b]
+    if max_iterations is None:
+        max_iterations = max(size, 1)
+    x = _initial_guess(x0, size)
+    if x0 is None:
+        residual = list(values_b)
+    else:
+        product = operator * Vector(*x)
+        residual = [b - ax for b, ax in zip(values_b, product)]
+    direction = list(residual)
+    residual_sq = _dot(residual, residual)
+    threshold = tolerance * sqrt(_dot(values_b, values_b))
+    if sqrt(residual_sq) <= threshold:
+        return Vector(*x)
+    for iteration in range(1, max_iterations + 1):
+        product = [float(value) for value in operator * Vector(*direction)]
+        curvature = _dot(direction, product)
+        if curvature <= 0:
+            raise ConvergenceError("operator is not positive-definite")
+        step = residual_sq / curvature
+        x = [value + step * d for value, d in zip(x, direction)]
+        residual = [r - step * p for r, p in zip(residual, product)]
+        new_residual_sq = _dot(residual, residual)
+        residual_norm = sqrt(new_residual_sq)
+        if callback is not None:
+            callback(iteration, Vector(*x), residual_norm)
+        if residual_norm <= threshold:
+            return Vector(*x)
+        beta = new_residual_sq / residual_sq
+        direction = [r + beta * d for r, d in zip(residual, direction)]
+        residual_sq = new_residual_sq
+    raise ConvergenceError(
+        "no convergence after {} iterations".format(max_iterations))
+
+
+def _operator_jacobi(operator, diagonal, vector_b, x0, tolerance,
+                     max_iterations, callback):
+    """(object, sequence of Number, Vector, Vector, float, int, callable)
+        -> Vector
+
+    Returns the vector x such that Ax = b by Jacobi iteration on an operator
+    A with the given diagonal D, using only products of A with vectors:
+        x' = x + D^(-1) (b - Ax)
+    Each iteration takes one product, which also gives the residual.
+    """
+    size = vector_b.dimension()
+    diagonal = [float(value) for value in diagonal]
+    if len(diagonal) != size:
+        raise MatrixDimensionError("diagonal must have same dimensions as b")
+    if 0.0 in diagonal:
+        raise ValueError("matrix must have a non-zero diagonal")
+    values_b = [float(value) for value in vector_b]
+    x = _initial_guess(x0, size)
+    threshold = tolerance * sqrt(_dot(values_b, values_b))
+    residual = [b - float(ax)
+                for b, ax in zip(values_b, operator * Vector(*x))]
+    for iteration in range(1, max_iterations + 1):
+        x = [value + r / d for value, r, d in zip(x, residual, diagonal)]
+        residual = [b - float(ax)
+                    for b, ax in zip(values_b, operator * Vector(*x))]
+        residual_norm = sqrt(_dot(residual, residual))
+        if callback is not None:
+            callback(iteration, Vector(*x), residual_norm)
+        if residual_norm <= threshold:
+            return Vector(*x)
+    raise ConvergenceError(
+        "no convergence after {} iterations".format(max_iterations))
+
+
+def jacobi(matrix, vector_b, x0=None, tolerance=1e-10, max_iterations=1000,
+           callback=None, diagonal=None):
+    """(object, Vector[, Vector, float, int, callable, sequence of Number])
+        -> Vector
+
+    Returns the vector x such that Ax = b by Jacobi iteration, where every
+    entry of the next iterate is computed from the previous one. Converges
+    for strictly diagonally dominant matrices. The matrix A is a Matrix or a
+    SparseMatrix, or, if its diagonal is given, any operator whose product
+    with a Vector (operator * vector) is a Vector, see conjugate_gradient().
+
+    REQ: matrix is square with a non-zero diagonal
+    """
+    if diagonal is not None:
+        return _operator_jacobi(matrix, diagonal, vector_b, x0, tolerance,
+                                max_iterations, callback)
+    diagonal, off_diagonal = _split_diagonal(matrix)
+    size = len(diagonal)
+    if vector_b.dimension() != size:
+        raise MatrixDimensionError("vector must have same dimensions as rows")
+    values_b = [float(value) for value in vector_b]
+    x = _initial_guess(x0, size)
+    threshold = tolerance * sqrt(_dot(values_b, values_b))
+    for iteration in range(1, max_iterations + 1):
+        next_x = list()
+        for i, off_row in enumerate(off_diagonal):
+            total = values_b[i]
+            for j, value in off_row:
+                total -= value * x[j]
+            next_x.append(total / diagonal[i])
+        x = next_x
+        residual_norm = _residual_norm(diagonal, off_diagonal, values_b, x)
+        if callback is not None:
+            callback(iteration, Vector(*x), residual_norm)
+        if residual_norm <= threshold:
+            return Vector(*x)
+    raise ConvergenceError(
+        "no convergence after {} iterations".format(max_iterations))
+
+
+def gauss_seidel(matrix, vector_b, x0=None, tolerance=1e-10,
+                 max_iterations=1000, callback=None):
+    """(Matrix or SparseMatrix, Vector[, Vector, float, int, callable])
+        -> Vector
+
+    Returns the vector x such that Ax = b by Gauss-Seidel iteration, where
+    every entry is updated in place from the newest values. Converges for
+    strictly diagonally dominant or symmetric positive-definite matrices.
+    Unlike the other solvers, it needs the entries of each row, so the
+    matrix must be a Matrix or a SparseMatrix rather than an operator.
+
+    REQ: matrix is square with a non-zero diagonal
+    """
+    diagonal, off_diagonal = _split_diagonal(matrix)
+    size = len(diagonal)
+    if vector_b.dimension() != size:
+        raise MatrixDimensionError("vector must have same dimensions as rows")
+    values_b = [float(value) for value in vector_b]
+    x = _initial_guess(x0, size)
+    threshold = tolerance * sqrt(_dot(values_b, values_b))
+    for iteration in range(1, max_iterations + 1):
+        for i, off_row in enumerate(off_diagonal):
+            total = values_b[i]
+            for j, value in off_row:
+                total -= value * x[j]
+            x[i] = total / diagonal[i]
+        residual_norm = _residual_norm(diagonal, off_diagonal, values_b, x)
+        if callback is not None:
+            callback(iteration, Vector(*x), residual_norm)
+        if residual_norm <= threshold:
+            return Vector(*x)
+    raise ConvergenceError(
+        "no convergence after {} iterations".format(max_iterations))
+
+
+def examples():
+    """() -> NoneType
+
+    Displays examples of the iterative solvers.
+    """
+    mtx_a = Matrix([4, -1, 0], [-1, 4, -1], [0, -1, 4])
+    vtr_b = Vector(2, 4, 10)
+
+    print("\nMatrix A:")
+    print(mtx_a)
+    print("\nVector b:")
+    print(vtr_b)
+
+    print("\n> Ax = b, solving for x")
+    print("-" * 40)
+    print("\nConjugate gradient:")
+    print(conjugate_gradient(mtx_a, vtr_b))
+    print("\nJacobi:")
+    print(jacobi(mtx_a, vtr_b))
+    print("\nGauss-Seidel:")
+    print(gauss_seidel(mtx_a, vtr_b))
+
+    print(
+        # end of examples
+    )
+
+
+if __name__ == "__main__":
+    examples()
@@ -7,7 +7,17 @@ Software Engineering
 University of Toronto
 """
 
+from collections import OrderedDict
+from math import sqrt
+from operator import add, mul, sub
+
+import matrix_eigen
+import matrix_io
+import matrix_modular
+import matrix_parallel
+import numpy_backend
 from fraction import Fraction
+from matrix_storage import FlatStorage
 from vector import Vector
 
 
@@ -19,15 +29,658 @@ class SingularMatrixError(Exception):
     """An exception for invalid singular matrix operations."""
 
 
+class ConvergenceError(Exception):
+    """An exception for iterative methods that fail to converge."""
+
+
+class _SharedResults(object):
+    """A least recently used table of the derived results of matrices,
+    shared between all equal matrices in the process. It is bounded both by
+    the number of matrices and by their total number of entries, since it
+    keeps each matrix and its results (inverse, factorizations, ...) alive
+    until they are evicted."""
+
+    def __init__(self):
+        """(_SharedResults) -> NoneType
+
+        Creates an empty table.
+        """
+        self._entries = OrderedDict()
+        self._weight = 0
+
+    def clear(self):
+        """(_SharedResults) -> NoneType
+
+        Removes every entry from this table.
+        """
+        self._entries.clear()
+        self._weight = 0
+
+    def weight(self):
+        """(_SharedResults) -> int
+
+        Returns the total number of entries of the matrices in this table.
+        """
+        return self._weight
+
+    def results(self, matrix, max_size, max_weight):
+        """(_SharedResults, Matrix, int, int) -> dict
+
+        Returns the results dictionary shared by all matrices of the same
+        class that are equal to the given one, adding a new one if there is
+        none. Subclasses such as ComplexMatrix compute some results
+        differently, so they never share a dictionary with a Matrix. Only
+        the max_size most recently used dictionaries are kept, and only as
+        long as their matrices have at most max_weight entries in total; a
+        matrix with more entries than that is not shared at all.
+        """
+        rows, columns = matrix.dimensions()
+        weight = max(rows * columns, 1)
+        if max_size <= 0 or weight > max_weight:
+            return dict()
+        key = (type(matrix), matrix.storage(), matrix.dtype(),
+               matrix.dimensions(), hash(matrix))
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == matrix:
+            self._entries.move_to_end(key)
+            return entry[1]
+        if entry is not None:
+            self._weight -= entry[2]
+        results = dict()
+        self._entries[key] = (matrix, results, weight)
+        self._entries.move_to_end(key)
+        self._weight += weight
+        while (len(self._entries) > max_size or
+               self._weight > max_weight):
+            self._weight -= self._entries.popitem(last=False)[1][2]
+        return results
+
+
+_SHARED_RESULTS = _SharedResults()
+
+
+class _RowReduction(object):
+    """A workspace for reducing a matrix by elementary row operations.
+
+    The rows are copied once and every row operation then updates them in
+    place, so no intermediate matrices are built during elimination.
+    """
+
+    def __init__(self, rows, record_operations=False):
+        """(_RowReduction, iterable of iterable of Number[, bool]) -> NoneType
+
+        Creates a workspace holding a copy of the given rows. If
+        record_operations is set, every row operation is logged, see
+        operations().
+        """
+        self._rows = [list(row) for row in rows]
+        self._operations = list() if record_operations else None
+
+    def _record(self, *operation):
+        if self._operations is not None:
+            self._operations.append(operation)
+
+    def rows(self):
+        """(_RowReduction) -> list of list of Number
+
+        Returns the current rows of this workspace.
+        """
+        return self._rows
+
+    def operations(self):
+        """(_RowReduction) -> list of tuple
+
+        Returns the logged row operations, in order. Each one is the name of
+        the method that applied it followed by its arguments, for example
+        ("add_multiple", 2, 0, -3), and can be applied again with apply().
+        """
+        return self._operations
+
+    def apply(self, operation):
+        """(_RowReduction, tuple) -> NoneType
+
+        Applies a row operation from the log of operations().
+        """
+        getattr(self, operation[0])(*operation[1:])
+
+    def to_float(self):
+        """(_RowReduction) -> NoneType
+
+        Converts every entry to a float. This is not a row operation and is
+        not logged.
+        """
+        for row in self._rows:
+            row[:] = [float(value) for value in row]
+
+    def interchange(self, index1, index2):
+        """(_RowReduction, int, int) -> NoneType
+
+        Swaps the rows at the given indices.
+        """
+        if index1 != index2:
+            rows = self._rows
+            rows[index1], rows[index2] = rows[index2], rows[index1]
+            self._record("interchange", index1, index2)
+
+    def multiply(self, index, mult):
+        """(_RowReduction, int, Number) -> NoneType
+
+        Multiplies the row at the given index by a scalar.
+        """
+        if mult != 1:
+            self._rows[index] = [value * mult for value in self._rows[index]]
+            self._record("multiply", index, mult)
+
+    def add_multiple(self, index1, index2, mult2):
+        """(_RowReduction, int, int, Number) -> NoneType
+
+        Adds the row at index2 multiplied by a scalar to the row at index1.
+        """
+        if mult2 != 0:
+            row = self._rows[index1]
+            for j, value in enumerate(self._rows[index2]):
+                if value != 0:
+                    row[j] = row[j] + mult2 * value
+            self._record("add_multiple", index1, index2, mult2)
+
+    def clear_column(self, col_index, first_index):
+        """(_RowReduction, int, int) -> NoneType
+
+        Sets the entries of the column at col_index to zero in every row from
+        first_index on. Float arithmetic uses this on entries that are zero
+        within its tolerance.
+        """
+        for row in self._rows[first_index:]:
+            row[col_index] = 0.0
+        self._record("clear_column", col_index, first_index)
+
+    def reduce(self, tolerance=None):
+        """(_RowReduction[, float]) -> list of int
+
+        Reduces the rows to reduced row echelon form and returns the indices
+        of the pivot columns. Without a tolerance the reduction is exact;
+        with one, see _reduce_float().
+
+        Credits: https://rosettacode.org/wiki/Reduced_row_echelon_form
+        """
+        if tolerance is not None:
+            return self._reduce_float(tolerance)
+        rows = self._rows
+        num_rows = len(rows)
+        num_cols = len(rows[0])
+        pivot_cols = list()
+        lead = 0
+        for r in range(num_rows):
+            if lead >= num_cols:
+                break
+            i = r
+            while rows[i][lead] == 0:
+                i += 1
+                if i == num_rows:
+                    i = r
+                    lead += 1
+                    if lead == num_cols:
+                        return pivot_cols
+            self.interchange(i, r)
+            self.multiply(r, Fraction.divide(1, rows[r][lead]))
+            for i in range(num_rows):
+                if i != r:
+                    self.add_multiple(i, r, -rows[i][lead])
+            pivot_cols.append(lead)
+            lead += 1
+        return pivot_cols
+
+    def _reduce_float(self, tolerance):
+        """(_RowReduction, float) -> list of int
+
+        Reduces the rows to reduced row echelon form in floating point with
+        partial pivoting: each pivot is the entry of largest magnitude left
+        in its column, and a column whose entries are all at most tolerance
+        in magnitude has no pivot. Those entries are set to zero.
+        """
+        rows = self._rows
+        self.to_float()
+        num_rows = len(rows)
+        pivot_cols = list()
+        r = 0
+        for lead in range(len(rows[0])):
+            if r == num_rows:
+                break
+            i = max(range(r, num_rows), key=lambda k: abs(rows[k][lead]))
+            if abs(rows[i][lead]) <= tolerance:
+                self.clear_column(lead, r)
+                continue
+            self.interchange(i, r)
+            self.multiply(r, 1.0 / rows[r][lead])
+            for i in range(num_rows):
+                if i != r:
+                    self.add_multiple(i, r, -rows[i][lead])
+            pivot_cols.append(lead)
+            r += 1
+        return pivot_cols
+
+
 class Matrix(object):
     """A class to represent a matrix."""
 
+    # rows and columns per tile in matrix multiplication
+    BLOCK_SIZE = 64
+    # smallest dimension at which matrix multiplication switches to the
+    # Strassen-Winograd algorithm, or None to always multiply classically
+    STRASSEN_THRESHOLD = 128
+    # number of distinct matrices whose derived results (determinant, RREF,
+    # factorizations, ...) are shared process-wide, or 0 to disable sharing
+    SHARED_CACHE_SIZE = 128
+    # total number of entries of the matrices whose results are shared; the
+    # table keeps them alive until they are evicted, least recently used
+    # first, and a larger matrix keeps its results to itself
+    SHARED_CACHE_ENTRIES = 1 << 20
+    # entries of a float arithmetic elimination at most this many times the
+    # largest absolute entry of the matrix in magnitude are treated as zero
+    FLOAT_TOLERANCE = 1e-12
+    # whether int and float matrices run their products and float arithmetic
+    # elimination on NumPy, when it is installed
+    USE_NUMPY = True
+    # number of worker processes for large products, float arithmetic LU
+    # eliminations and batches of determinants or inverses, or 0 to do all
+    # of the work in this process
+    PARALLEL_WORKERS = 0
+    # smallest dimension at which products and eliminations are split into
+    # row blocks across the worker processes
+    PARALLEL_THRESHOLD = 256
+    # whether sums, differences, products and scalar multiples of matrices
+    # build lazy expressions instead of new matrices, see lazy()
+    LAZY = False
+    # smallest dimension at which exact ranks and determinants of int
+    # matrices are computed modulo word-sized primes on NumPy, or None to
+    # always eliminate over the rationals; without NumPy, the fraction-free
+    # eliminations are faster than the pure Python modular ones
+    MODULAR_THRESHOLD = 64
+
+    @staticmethod
+    def _bareiss_determinant(rows):
+        """(list of list of Number) -> Number
+
+        Returns the determinant of the square matrix with the given rows using
+        fraction-free Bareiss elimination. Every division in the elimination
+        is exact, so int entries never leave the integers. The given rows are
+        overwritten.
+        """
+        size = len(rows)
+        exact_int = all(isinstance(val, int) for row in rows for val in row)
+        sign = 1
+        prev_pivot = 1
+        for k in range(size - 1):
+            if rows[k][k] == 0:
+                for i in range(k + 1, size):
+                    if rows[i][k] != 0:
+                        rows[k], rows[i] = rows[i], rows[k]
+                        sign = -sign
+                        break
+                else:
+                    return 0
+            pivot_row = rows[k]
+            pivot = pivot_row[k]
+            for i in range(k + 1, size):
+                row = rows[i]
+                lead = row[k]
+                for j in range(k + 1, size):
+                    value = pivot * row[j] - lead * pivot_row[j]
+                    if exact_int:
+                        row[j] = value // prev_pivot
+                    else:
+                        row[j] = Fraction.divide(value, prev_pivot)
+            prev_pivot = pivot
+        return sign * rows[size-1][size-1]
+
     @staticmethod
-    def _pivot_position(vector):
-        for pos in range(vector.dimension(), 0, -1):
-            if vector.get(pos) != 0:
-                return pos
-        return vector.dimension()
+    def _bareiss_rank(rows):
+        """(list of list of int) -> int
+
+        Returns the rank of the integer matrix with the given rows using
+        fraction-free Bareiss elimination to row echelon form, which keeps
+        every entry in the integers. The given rows are overwritten.
+        """
+        num_rows = len(rows)
+        rank = 0
+        prev_pivot = 1
+        for col in range(len(rows[0]) if rows else 0):
+            if rank == num_rows:
+                break
+            pos = next((i for i in range(rank, num_rows) if rows[i][col]),
+                       None)
+            if pos is None:
+                continue
+            rows[rank], rows[pos] = rows[pos], rows[rank]
+            pivot_row = rows[rank]
+            pivot = pivot_row[col]
+            tail = pivot_row[col+1:]
+            for i in range(rank + 1, num_rows):
+                row = rows[i]
+                lead = row[col]
+                row[col+1:] = [(pivot * value - lead * pivot_value) //
+                               prev_pivot for value, pivot_value
+                               in zip(row[col+1:], tail)]
+                row[col] = 0
+            prev_pivot = pivot
+            rank += 1
+        return rank
+
+    @staticmethod
+    def _lu_decompose(rows, tolerance=None):
+        """(list of list of Number[, float])
+            -> list of list of Number, list of int, int
+
+        Returns the PLU factorization of the square matrix with the given rows
+        as (lu, perm, sign). The unit lower triangular L is stored below the
+        diagonal of lu and U on and above it, row i of lu is row perm[i] of
+        the original matrix and sign is the sign of the permutation.
+        The given rows are overwritten.
+
+        Without a tolerance, the first non-zero entry of each column is the
+        pivot and the factorization is exact. With one, the entries are
+        converted to floats and the entry of largest magnitude is the pivot
+        (partial pivoting), which must be greater than tolerance. Large float
+        eliminations run on the PARALLEL_WORKERS processes.
+
+        Raises SingularMatrixError as soon as a column has no non-zero pivot.
+        """
+        size = len(rows)
+        workers = Matrix.PARALLEL_WORKERS
+        if (tolerance is not None and workers > 1 and
+                size > Matrix.PARALLEL_THRESHOLD):
+            factorization = matrix_parallel.lu_decompose(
+                rows, tolerance, workers, Matrix.PARALLEL_THRESHOLD)
+            if factorization is None:
+                raise SingularMatrixError("matrix is not invertible")
+            return factorization
+        perm = list(range(size))
+        sign = 1
+        if tolerance is not None:
+            for row in rows:
+                row[:] = [float(value) for value in row]
+        for k in range(size):
+            pivot_pos = k
+            if tolerance is not None:
+                pivot_pos = max(range(k, size), key=lambda i: abs(rows[i][k]))
+                if abs(rows[pivot_pos][k]) <= tolerance:
+                    raise SingularMatrixError("matrix is not invertible")
+            while rows[pivot_pos][k] == 0:
+                pivot_pos += 1
+                if pivot_pos == size:
+                    raise SingularMatrixError("matrix is not invertible")
+            if pivot_pos != k:
+                rows[k], rows[pivot_pos] = rows[pivot_pos], rows[k]
+                perm[k], perm[pivot_pos] = perm[pivot_pos], perm[k]
+                sign = -sign
+            pivot_row = rows[k]
+            pivot = pivot_row[k]
+            for i in range(k + 1, size):
+                row = rows[i]
+                if row[k] != 0:
+                    factor = Fraction.divide(row[k], pivot)
+                    row[k] = factor
+                    if tolerance is not None:
+                        row[k+1:] = [value - factor * pivot_value
+                                     for value, pivot_value
+                                     in zip(row[k+1:], pivot_row[k+1:])]
+                        continue
+                    for j in range(k + 1, size):
+                        if pivot_row[j] != 0:
+                            row[j] = row[j] - factor * pivot_row[j]
+        return rows, perm, sign
+
+    @staticmethod
+    def _lu_solve(lu, perm, values):
+        """(list of list of Number, list of int, list of Number)
+            -> list of Number
+
+        Returns the solution x of Ax = b, where lu and perm are the PLU
+        factorization of A from _lu_decompose() and values are the entries
+        of b. Runs in O(n^2) by forward and back substitution.
+        """
+        size = len(lu)
+        solution = [values[pos] for pos in perm]
+        if isinstance(lu[0][0], float):
+            # a float factorization from partial pivoting is dense, so the
+            # zero checks below would not pay off
+            for i in range(size):
+                solution[i] -= sum(map(mul, lu[i][:i], solution[:i]))
+            for i in range(size - 1, -1, -1):
+                row = lu[i]
+                solution[i] = (solution[i] - sum(
+                    map(mul, row[i+1:], solution[i+1:]))) / row[i]
+            return solution
+        for i in range(size):
+            row = lu[i]
+            total = solution[i]
+            for j in range(i):
+                if row[j] != 0 and solution[j] != 0:
+                    total = total - row[j] * solution[j]
+            solution[i] = total
+        for i in range(size - 1, -1, -1):
+            row = lu[i]
+            total = solution[i]
+            for j in range(i + 1, size):
+                if row[j] != 0 and solution[j] != 0:
+                    total = total - row[j] * solution[j]
+            solution[i] = Fraction.divide(total, row[i])
+        return solution
+
+    @staticmethod
+    def _ldl_decompose(rows, tolerance=None):
+        """(sequence of sequence of Number[, float])
+            -> list of list of Number, list of Number
+
+        Returns the LDL^T factorization of the symmetric matrix with the
+        given rows as (lower, diagonal), where lower[i] holds the entries of
+        row i of the unit lower triangular L left of the diagonal and
+        diagonal holds the entries of D. Only the lower triangle of the
+        matrix is read, and no rows are interchanged, so this takes about
+        half the work of _lu_decompose(). Without a tolerance the
+        factorization is exact; with one, it is done in floats.
+
+        Raises SingularMatrixError as soon as a pivot is zero (at most
+        tolerance in magnitude).
+        """
+        size = len(rows)
+        if tolerance is not None:
+            rows = [[float(value) for value in row] for row in rows]
+        lower = [list() for i in range(size)]
+        diagonal = list()
+        for j in range(size):
+            # scaled[k] = L[j][k] * D[k]
+            scaled = list(map(mul, lower[j], diagonal))
+            pivot = rows[j][j] - sum(map(mul, lower[j], scaled))
+            if (pivot == 0 if tolerance is None else abs(pivot) <= tolerance):
+                raise SingularMatrixError("matrix has a zero pivot")
+            for i in range(j + 1, size):
+                lower[i].append(Fraction.divide(
+                    rows[i][j] - sum(map(mul, lower[i], scaled)), pivot))
+            diagonal.append(pivot)
+        return lower, diagonal
+
+    @staticmethod
+    def _ldl_solve(lower, diagonal, values):
+        """(list of list of Number, list of Number, list of Number)
+            -> list of Number
+
+        Returns the solution x of Ax = b, where lower and diagonal are the
+        LDL^T factorization of A from _ldl_decompose() and values are the
+        entries of b. The given values are overwritten.
+        """
+        size = len(diagonal)
+        for i in range(size):
+            values[i] = values[i] - sum(map(mul, lower[i], values[:i]))
+        for i in range(size):
+            values[i] = Fraction.divide(values[i], diagonal[i])
+        for i in range(size - 1, -1, -1):
+            total = values[i]
+            for k in range(i + 1, size):
+                if lower[k][i] != 0:
+                    total = total - lower[k][i] * values[k]
+            values[i] = total
+        return values
+
+    @staticmethod
+    def _householder_qr(rows):
+        """(sequence of sequence of Number)
+            -> list of list of float, list of list of float, list of float
+
+        Returns the QR factorization of the m x n matrix with the given rows
+        by Householder reflections, as (columns, vectors, betas). columns are
+        the n columns of R, of length m each, and Q = H_0 H_1 ... H_(k-1)
+        for k = min(m, n), where H_i = I - betas[i] * v * v^T and v is
+        vectors[i] in the rows i to m - 1. The matrix is reduced column by
+        column, so each reflection updates whole lists at once.
+        """
+        num_rows = len(rows)
+        columns = [[float(value) for value in col] for col in zip(*rows)]
+        vectors = list()
+        betas = list()
+        for k in range(min(num_rows, len(columns))):
+            vector = columns[k][k:]
+            sigma = sum(map(mul, vector[1:], vector[1:]))
+            if sigma == 0:
+                # the column is already zero below the diagonal
+                vectors.append(vector)
+                betas.append(0.0)
+                continue
+            norm = sqrt(vector[0] * vector[0] + sigma)
+            alpha = -norm if vector[0] >= 0 else norm
+            vector[0] -= alpha
+            beta = 2.0 / (vector[0] * vector[0] + sigma)
+            columns[k][k:] = [alpha] + [0.0] * (num_rows - k - 1)
+            for col in columns[k+1:]:
+                scale = beta * sum(map(mul, vector, col[k:]))
+                if scale != 0:
+                    col[k:] = [value - scale * entry
+                               for value, entry in zip(col[k:], vector)]
+            vectors.append(vector)
+            betas.append(beta)
+        return columns, vectors, betas
+
+    @staticmethod
+    def _apply_reflectors(vectors, betas, values, transpose):
+        """(list of list of float, list of float, list of float, bool)
+            -> list of float
+
+        Returns Q^T b if transpose is set and Qb otherwise, where Q is given
+        by the Householder vectors and betas of _householder_qr() and values
+        are the entries of b. The given values are overwritten.
+        """
+        order = range(len(vectors))
+        for k in (order if transpose else reversed(order)):
+            if betas[k]:
+                vector = vectors[k]
+                scale = betas[k] * sum(map(mul, vector, values[k:]))
+                values[k:] = [value - scale * entry
+                              for value, entry in zip(values[k:], vector)]
+        return values
+
+    @staticmethod
+    def _multiply_rows(rows_a, rows_b, block_size):
+        """(list of list of Number, list of list of Number, int)
+            -> list of list of Number
+
+        Returns the rows of the product of the matrices with the given rows.
+        The second matrix is transposed once up front and the loops are tiled
+        into block_size x block_size blocks of the product, so each block of
+        columns is reused across a block of rows while it is hot in cache.
+        """
+        cols_b = list(zip(*rows_b))
+        num_rows = len(rows_a)
+        num_cols = len(cols_b)
+        product = [[0] * num_cols for i in range(num_rows)]
+        for row_start in range(0, num_rows, block_size):
+            row_block = rows_a[row_start:row_start + block_size]
+            for col_start in range(0, num_cols, block_size):
+                col_block = cols_b[col_start:col_start + block_size]
+                for i, row in enumerate(row_block, row_start):
+                    prod_row = product[i]
+                    for j, col in enumerate(col_block, col_start):
+                        prod_row[j] = sum(map(mul, row, col))
+        return product
+
+    @staticmethod
+    def _strassen_rows(rows_a, rows_b, threshold):
+        """(list of list of Number, list of list of Number, int)
+            -> list of list of Number
+
+        Returns the rows of the product of the matrices with the given rows
+        using the Strassen-Winograd algorithm: 7 half-size products and 15
+        additions per level instead of 8 products. Odd dimensions are padded
+        with a zero row or column at each level, and blocks with a dimension
+        below threshold are multiplied classically.
+        """
+        num_rows, num_inner, num_cols = (
+            len(rows_a), len(rows_b), len(rows_b[0]))
+        if min(num_rows, num_inner, num_cols) < max(threshold, 2):
+            return Matrix._multiply_rows(rows_a, rows_b, Matrix.BLOCK_SIZE)
+        # pad every dimension to an even length
+        if num_inner % 2:
+            rows_a = [list(row) + [0] for row in rows_a]
+            rows_b = list(rows_b) + [[0] * num_cols]
+        if num_rows % 2:
+            rows_a = list(rows_a) + [[0] * len(rows_a[0])]
+        if num_cols % 2:
+            rows_b = [list(row) + [0] for row in rows_b]
+        half_r = len(rows_a) // 2
+        half_i = len(rows_b) // 2
+        half_c = len(rows_b[0]) // 2
+
+        def block(rows, row_half, col_half, top, left):
+            row_slice = rows[:row_half] if top else rows[row_half:]
+            if left:
+                return [row[:col_half] for row in row_slice]
+            return [row[col_half:] for row in row_slice]
+
+        def plus(rows1, rows2):
+            return [list(map(add, r1, r2)) for r1, r2 in zip(rows1, rows2)]
+
+        def minus(rows1, rows2):
+            return [list(map(sub, r1, r2)) for r1, r2 in zip(rows1, rows2)]
+
+        def product(rows1, rows2):
+            return Matrix._strassen_rows(rows1, rows2, threshold)
+
+        a11 = block(rows_a, half_r, half_i, True, True)
+        a12 = block(rows_a, half_r, half_i, True, False)
+        a21 = block(rows_a, half_r, half_i, False, True)
+        a22 = block(rows_a, half_r, half_i, False, False)
+        b11 = block(rows_b, half_i, half_c, True, True)
+        b12 = block(rows_b, half_i, half_c, True, False)
+        b21 = block(rows_b, half_i, half_c, False, True)
+        b22 = block(rows_b, half_i, half_c, False, False)
+
+        s1 = plus(a21, a22)
+        s2 = minus(s1, a11)
+        s3 = minus(a11, a21)
+        s4 = minus(a12, s2)
+        t1 = minus(b12, b11)
+        t2 = minus(b22, t1)
+        t3 = minus(b22, b12)
+        t4 = minus(t2, b21)
+
+        m1 = product(a11, b11)
+        m2 = product(a12, b21)
+        m3 = product(s4, b22)
+        m4 = product(a22, t4)
+        m5 = product(s1, t1)
+        m6 = product(s2, t2)
+        m7 = product(s3, t3)
+
+        u2 = plus(m1, m6)
+        u3 = plus(u2, m7)
+        c11 = plus(m1, m2)
+        c12 = plus(plus(u2, m5), m3)
+        c21 = minus(u3, m4)
+        c22 = plus(u3, m5)
+
+        prod_m = [r1 + r2 for r1, r2 in zip(c11, c12)]
+        prod_m.extend(r1 + r2 for r1, r2 in zip(c21, c22))
+        # strip the padding
+        return [row[:num_cols] for row in prod_m[:num_rows]]
 
     @staticmethod
     def zero(rows, columns=None):
@@ -55,22 +708,313 @@ class Matrix(object):
             identity_mtx.append([0]*i + [1] + [0]*(rows-i-1))
         return Matrix(*identity_mtx)
 
-    def __init__(self, *rows):
-        """(Matrix, tuple of iterable) -> NoneType
+    @staticmethod
+    def _block_sizes(blocks):
+        """(list of list of object) -> list of int, list of int
+
+        Returns the number of rows of each block row and the number of
+        columns of each block column of the given grid of blocks, where a
+        block is anything with dimensions() or None for a zero block.
+        Raises MatrixDimensionError if the grid is not rectangular, if the
+        blocks of a block row or block column do not line up, or if one of
+        them has only zero blocks.
+        """
+        if not blocks or not blocks[0]:
+            raise MatrixDimensionError("block grid must not be empty")
+        row_sizes = [None] * len(blocks)
+        col_sizes = [None] * len(blocks[0])
+        for i, block_row in enumerate(blocks):
+            if len(block_row) != len(col_sizes):
+                raise MatrixDimensionError("block rows must all have the "
+                                           "same number of blocks")
+            for j, block in enumerate(block_row):
+                if block is None:
+                    continue
+                num_rows, num_cols = block.dimensions()
+                if row_sizes[i] not in (None, num_rows):
+                    raise MatrixDimensionError(
+                        "blocks in block row {} must have the same number "
+                        "of rows".format(i + 1))
+                if col_sizes[j] not in (None, num_cols):
+                    raise MatrixDimensionError(
+                        "blocks in block column {} must have the same "
+                        "number of columns".format(j + 1))
+                row_sizes[i], col_sizes[j] = num_rows, num_cols
+        if None in row_sizes or None in col_sizes:
+            raise MatrixDimensionError("every block row and block column "
+                                       "needs a non-zero block")
+        return row_sizes, col_sizes
+
+    @staticmethod
+    def block(blocks):
+        """(list of list of Matrix) -> Matrix
+
+        Returns the matrix assembled from the given grid of blocks, e.g.
+            Matrix.block([[A, B], [C, D]])
+        A block of None is a zero block. The matrix is built in one pass and
+        stored like the first block.
+
+        REQ: the blocks of each block row have the same number of rows
+        REQ: the blocks of each block column have the same number of columns
+        """
+        row_sizes, col_sizes = Matrix._block_sizes(blocks)
+        block_m = list()
+        for block_row, num_rows in zip(blocks, row_sizes):
+            sources = [[0] * num_cols if block is None else block._raw_rows()
+                       for block, num_cols in zip(block_row, col_sizes)]
+            for r in range(num_rows):
+                row = list()
+                for block, source in zip(block_row, sources):
+                    row.extend(source if block is None else source[r])
+                block_m.append(row)
+        like = next(block for block_row in blocks for block in block_row
+                    if block is not None)
+        return like._new(block_m)
+
+    @staticmethod
+    def load(path, mmap=True):
+        """(str[, bool]) -> Matrix
+
+        Returns the matrix saved by save() in the file at the given path,
+        with flat storage. If mmap is set, int and float entries are
+        memory-mapped read-only instead of read, so even a very large matrix
+        opens at once and its entries are paged in as they are used; the
+        file must not be modified while the matrix is in use. NumPy .npy
+        files of 2-D int64 and float64 arrays can be loaded too.
+        """
+        return Matrix._wrap(matrix_io.load(path, mmap))
+
+    @staticmethod
+    def from_csv(path_or_file, dtype=None, chunk_rows=1024, delimiter=","):
+        """(str or file[, str, int, str]) -> Matrix
+
+        Returns the matrix with the rows of the given CSV file (a path or an
+        open text file), with flat storage. The file is parsed chunk_rows
+        rows at a time straight into one buffer, without a list per row.
+        See Matrix.iter_row_blocks() for the dtype and delimiter.
+        """
+        return Matrix._wrap(matrix_io.read_csv(
+            path_or_file, dtype, chunk_rows, delimiter))
+
+    @staticmethod
+    def iter_row_blocks(path_or_file, dtype=None, chunk_rows=1024,
+                        delimiter=","):
+        """(str or file[, str, int, str]) -> generator of Matrix
+
+        Yields the rows of the given CSV file (a path or an open text file)
+        as matrices of chunk_rows rows each (the last one may have fewer),
+        so that files larger than memory can be processed one block at a
+        time, e.g. for a matrix-vector product:
+            product = list()
+            for block in Matrix.iter_row_blocks(path):
+                product.extend(block * vector)
+        With a delimiter of None, fields are separated by any whitespace.
+        Blank lines and lines starting with "#" are skipped. Entries are
+        parsed as the given dtype, "int", "float" or "object"; without one,
+        ints and Fractions (written p/q) stay exact, floats are floats and
+        each block gets the narrowest dtype for its values.
+        Raises ValueError if the rows do not all have the same length.
+        """
+        for block in matrix_io.csv_blocks(path_or_file, dtype, chunk_rows,
+                                          delimiter):
+            yield Matrix._wrap(block)
+
+    @staticmethod
+    def _wrap(mtx):
+        """(list of list or FlatStorage) -> Matrix
+
+        Returns a matrix that uses the given storage without copying it.
+        """
+        matrix = Matrix.__new__(Matrix)
+        matrix._set_storage(mtx)
+        return matrix
+
+    def __init__(self, *rows, storage="list", dtype=None, arithmetic=None):
+        """(Matrix, tuple of iterable[, str, str, str]) -> NoneType
 
         Creates a matrix with the given elements in the iterables.
+        The storage is one of:
+          "list": a nested list of rows.
+          "flat": one contiguous row-major buffer. This is an array.array for
+                  the "int" and "float" dtypes and a list for the "object"
+                  dtype (Fraction, Complex, ...). The dtype is inferred from
+                  the elements if it is not given.
+        The arithmetic used by elimination (reduced row echelon form, rank,
+        determinant, inverse, ...) is one of:
+          "exact": Fraction arithmetic, taking the first non-zero pivot.
+          "float": float arithmetic with partial pivoting, where entries
+                   within FLOAT_TOLERANCE of zero count as zero.
+        If it is not given, it depends on the elements, see arithmetic().
+        Elimination methods can also override it per call.
+        """
+        if arithmetic not in (None, "exact", "float"):
+            raise ValueError("unknown arithmetic: {}".format(arithmetic))
+        if storage == "list":
+            self._set_storage([list(row) for row in rows])
+        elif storage == "flat":
+            self._set_storage(FlatStorage.from_rows(rows, dtype))
+        else:
+            raise ValueError("unknown matrix storage: {}".format(storage))
+        self._arithmetic = arithmetic
+
+    def _set_storage(self, mtx):
+        self._mtx = mtx
+        self._rows = len(mtx)
+        self._cols = len(mtx[0])
+        # A, A^2, A^4, ... computed so far by power()
+        self._squarings = None
+        # derived results, see _cached()
+        self._results = None
+        # hash of this matrix and of each of its rows, computed on demand;
+        # row modifiers pass the row hashes on to the matrices they return
+        self._hash = None
+        self._row_hashes = None
+        # arithmetic given to __init__(), see arithmetic()
+        self._arithmetic = None
+
+    def _cached(self, key, compute):
+        """(Matrix, object, callable) -> object
+
+        Returns the derived result of this matrix stored under key, calling
+        compute() to get it on the first request. Since matrices are never
+        modified in place, results are kept for the lifetime of this matrix
+        and shared with equal matrices through the process-wide cache, which
+        is bounded by SHARED_CACHE_SIZE and SHARED_CACHE_ENTRIES. Set
+        SHARED_CACHE_SIZE to 0 to keep results on each matrix only.
+        """
+        if self._results is None:
+            self._results = _SHARED_RESULTS.results(
+                self, Matrix.SHARED_CACHE_SIZE, Matrix.SHARED_CACHE_ENTRIES)
+        if key not in self._results:
+            self._results[key] = compute()
+        return self._results[key]
+
+    @staticmethod
+    def clear_shared_cache():
+        """() -> NoneType
+
+        Forgets the derived results shared between matrices, releasing the
+        matrices held by the process-wide cache. Results already attached
+        to existing matrices are kept.
+        """
+        _SHARED_RESULTS.clear()
+
+    @staticmethod
+    def shutdown_workers():
+        """() -> NoneType
+
+        Stops the worker processes started for PARALLEL_WORKERS. They are
+        started again when they are next needed.
+        """
+        matrix_parallel.shutdown()
+
+    def __getstate__(self):
+        # derived results stay behind when a matrix is sent to a worker
+        state = self.__dict__.copy()
+        state["_squarings"] = None
+        state["_results"] = None
+        return state
+
+    def _raw_rows(self):
+        """(Matrix) -> list of list of Number
+
+        Returns the rows of this matrix as plain lists. For list storage these
+        are the rows of this matrix itself and must not be modified.
+        """
+        if isinstance(self._mtx, FlatStorage):
+            return self._mtx.copy()
+        return self._mtx
+
+    def _new(self, rows):
+        """(Matrix, iterable of iterable) -> Matrix
+
+        Returns a new matrix with the given rows, stored the same way as this
+        matrix.
+        """
+        if isinstance(self._mtx, FlatStorage):
+            return Matrix(*rows, storage="flat", arithmetic=self._arithmetic)
+        return Matrix(*rows, arithmetic=self._arithmetic)
+
+    def _numpy_dtype(self):
+        """(Matrix) -> str or NoneType
+
+        Returns the dtype of this matrix if its kernels can run on NumPy,
+        which is "int" or "float", or None otherwise.
+        """
+        if not (Matrix.USE_NUMPY and numpy_backend.available()):
+            return None
+        dtype = self.dtype()
+        return dtype if dtype in numpy_backend.NUMPY_DTYPES else None
+
+    def _uses_modular(self, zero_tolerance):
+        """(Matrix, float) -> bool
+
+        Returns True iff exact arithmetic (no zero tolerance) on this matrix
+        is done by the multi-modular routines of matrix_modular, i.e. NumPy
+        is in use, and the matrix has only int entries and at least
+        MODULAR_THRESHOLD rows and columns. This applies to both ranks and
+        determinants.
+        """
+        return (zero_tolerance is None and
+                Matrix.USE_NUMPY and numpy_backend.available() and
+                Matrix.MODULAR_THRESHOLD is not None and
+                min(self._rows, self._cols) >= Matrix.MODULAR_THRESHOLD and
+                all(isinstance(value, int)
+                    for row in self._raw_rows() for value in row))
+
+    def _uses_numpy(self, zero_tolerance):
+        """(Matrix, float or NoneType) -> bool
+
+        Returns True iff elimination on this matrix with the given zero
+        tolerance, see _zero_tolerance(), runs on NumPy.
+        """
+        return zero_tolerance is not None and self._numpy_dtype() is not None
+
+    def _zero_tolerance(self, arithmetic=None, tolerance=None):
+        """(Matrix[, str, float]) -> float or NoneType
+
+        Returns None if elimination on this matrix uses exact arithmetic, or
+        the magnitude at or below which an entry counts as zero if it uses
+        float arithmetic. This is the relative tolerance (FLOAT_TOLERANCE by
+        default) times the largest absolute entry of this matrix. The
+        arithmetic defaults to the one of this matrix, see arithmetic().
+        """
+        if arithmetic is None:
+            arithmetic = self.arithmetic()
+        if arithmetic == "exact":
+            return None
+        if arithmetic != "float":
+            raise ValueError("unknown arithmetic: {}".format(arithmetic))
+        if tolerance is None:
+            tolerance = Matrix.FLOAT_TOLERANCE
+        scale = max((abs(float(value)) for row in self._mtx for value in row),
+                    default=0.0)
+        return tolerance * scale
+
+    @staticmethod
+    def _row_hash(row):
+        """(iterable of Number) -> int
+
+        Returns the hash of the given row. Fractions are hashed in lowest
+        terms, and whole ones as ints, since equal Fractions written with
+        different terms do not hash equally themselves.
         """
-        self._rows = len(rows)
-        self._cols = len(rows[0])
-        self._mtx = list()
-        for row in rows:
-            self._mtx.append(list(row))
+        values = list()
+        for value in row:
+            if isinstance(value, Fraction):
+                value = value.simplify()
+                if isinstance(value, Fraction):
+                    value = (value.numerator(), value.denominator())
+            values.append(value)
+        return hash(tuple(values))
 
     def __hash__(self):
-        row_vector_hashes = list()
-        for row_vector in self:
-            row_vector_hashes.append(hash(row_vector))
-        return hash(tuple(row_vector_hashes))
+        if self._hash is None:
+            if self._row_hashes is None:
+                self._row_hashes = tuple(Matrix._row_hash(row)
+                                         for row in self._mtx)
+            self._hash = hash(self._row_hashes)
+        return self._hash
 
     def __repr__(self):
         str_mtx = str(self._mtx)[1:-1]
@@ -84,6 +1028,8 @@ class Matrix(object):
         return "\n".join(str_mtx)
 
     def __iter__(self):
+        if isinstance(self._mtx, FlatStorage):
+            return (Vector._view(row) for row in self._mtx)
         row_vectors_list = list()
         for row in self._mtx:
             row_vectors_list.append(Vector(*row))
@@ -99,15 +1045,20 @@ class Matrix(object):
 
         REQ: self.dimensions == other.dimensions
         """
+        # other matrix types (e.g. SparseMatrix) implement the sum themselves
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        if Matrix.LAZY:
+            return self.lazy().__add__(other)
         if not self.same_dimensions(other):
             err_msg = "matrices must have the same dimensions"
             raise MatrixDimensionError(err_msg)
-        sum_m = list()
-        for row_pos in range(self._rows):
-            row1 = self.row_vector(row_pos+1)
-            row2 = other.row_vector(row_pos+1)
-            sum_m.append(row1 + row2)
-        return Matrix(*sum_m)
+        sum_m = [list(map(add, row1, row2))
+                 for row1, row2 in zip(self._mtx, other._mtx)]
+        # flat storage keeps its dtype, as in _multiply()
+        if not isinstance(self._mtx, FlatStorage):
+            sum_m = [Vector._demote_floats(row) for row in sum_m]
+        return self._new(sum_m)
 
     def __mul__(self, other):
         """(Matrix, Matrix or Scalar) -> Matrix or Vector
@@ -118,62 +1069,123 @@ class Matrix(object):
           Vector: returns vector, result of matrix-vector multiplication.
           Scalar (int, float): returns matrix, result of scalar multiplication.
 
-        REQ: if other is matrix, self.rows == other.columns
-        REQ: if other is vector, self.rows == other.dimension
+        REQ: if other is matrix, self.columns == other.rows
+        REQ: if other is vector, self.columns == other.dimension
         """
-        prod_m = list()
+        if Matrix.LAZY and (isinstance(other, Matrix) or not (
+                isinstance(other, Vector) or hasattr(other, "dimensions"))):
+            return self.lazy().__mul__(other)
+        return self._multiply(other)
+
+    def _multiply(self, other):
+        """(Matrix, Matrix or Vector or Scalar) -> Matrix or Vector
+
+        Returns the product of this matrix with another value right away.
+        See __mul__().
+        """
+        demote = not isinstance(self._mtx, FlatStorage)
         # matrix multiplication
         if isinstance(other, Matrix):
-            if not self._rows == other.columns():
-                err_msg = "matrices must have opposite dimensions"
+            if self._cols != other.rows():
+                err_msg = "matrix columns must match the other matrix's rows"
                 raise MatrixDimensionError(err_msg)
-            row_vectors_a = [Vector(*row) for row in self._mtx]
-            col_vectors_b = [other.column_vector(
-                i+1) for i in range(other.columns())]
-            for row_vector in row_vectors_a:
-                prod_row = list()
-                for col_vector in col_vectors_b:
-                    prod_row.append(row_vector * col_vector)
-                prod_m.append(prod_row)
+            threshold = Matrix.STRASSEN_THRESHOLD
+            workers = Matrix.PARALLEL_WORKERS
+            dtypes = {self._numpy_dtype(), other._numpy_dtype()}
+            if None not in dtypes and "float" in dtypes:
+                prod_m = numpy_backend.multiply(self._mtx, other._mtx)
+            elif (workers > 1 and min(self._rows, other.columns()) >=
+                    Matrix.PARALLEL_THRESHOLD and
+                    "object" not in {self.dtype(), other.dtype()}):
+                dtype = "float" if "float" in {self.dtype(),
+                                               other.dtype()} else "int"
+                prod_m = matrix_parallel.multiply(
+                    self._raw_rows(), other._raw_rows(), dtype, workers)
+            elif threshold and min(self._rows, self._cols,
+                                   other.columns()) >= threshold:
+                prod_m = Matrix._strassen_rows(
+                    self._raw_rows(), other._raw_rows(), threshold)
+            else:
+                prod_m = Matrix._multiply_rows(
+                    self._raw_rows(), other._raw_rows(), Matrix.BLOCK_SIZE)
         # matrix-vector multiplication
         elif isinstance(other, Vector):
-            prod_v = prod_m
-            for row_vector in self:
-                prod_v.append(row_vector * other)
-            return Vector(*prod_v)
+            if self._cols != other.dimension():
+                err_msg = "vector must have same dimensions as matrix columns"
+                raise MatrixDimensionError(err_msg)
+            values = list(other)
+            dtype = self._numpy_dtype()
+            if dtype is not None:
+                dtypes = {dtype, FlatStorage.infer_dtype(values)}
+                if "float" in dtypes and "object" not in dtypes:
+                    prod_v = numpy_backend.multiply_vector(self._mtx, values)
+                    return Vector(*Vector._demote_floats(prod_v))
+            prod_v = [sum(map(mul, row, values)) for row in self._raw_rows()]
+            return Vector(*Vector._demote_floats(prod_v))
+        # other matrix types (e.g. SparseMatrix) implement the product
+        elif hasattr(other, "dimensions"):
+            return NotImplemented
         # scalar multiplication
         else:
-            for row in self._mtx:
-                row_vector = Vector(*row)
-                prod_m.append(row_vector * other)
-        return Matrix(*prod_m)
+            prod_m = [[value * other for value in row] for row in self._mtx]
+        if demote:
+            prod_m = [Vector._demote_floats(row) for row in prod_m]
+        return self._new(prod_m)
 
     def __rmul__(self, other):
         return self.__mul__(other)
 
     def __sub__(self, other):
-        return self.__add__(other.__neg__())
+        """(Matrix, Matrix) -> Matrix
+
+        Returns the difference of the two matrices.
+
+        REQ: self.dimensions == other.dimensions
+        """
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        if Matrix.LAZY:
+            return self.lazy().__sub__(other)
+        if not self.same_dimensions(other):
+            err_msg = "matrices must have the same dimensions"
+            raise MatrixDimensionError(err_msg)
+        diff_m = [list(map(sub, row1, row2))
+                  for row1, row2 in zip(self._mtx, other._mtx)]
+        # flat storage keeps its dtype, as in _multiply()
+        if not isinstance(self._mtx, FlatStorage):
+            diff_m = [Vector._demote_floats(row) for row in diff_m]
+        return self._new(diff_m)
 
     def __pow__(self, power):
-        prod_m = self
-        for i in range(power):
-            prod_m = prod_m.__mul__(self)
-        return prod_m
+        """(Matrix, int) -> Matrix
+
+        See power().
+        """
+        return self.power(power)
 
     def __neg__(self):
         return self.__mul__(-1)
 
     def __eq__(self, other):
-        if isinstance(other, Matrix):
-            if self.same_dimensions(other):
-                for i in range(self._rows):
-                    if self.row_vector(i+1) != other.row_vector(i+1):
-                        return False
-                return True
-        return False
+        if isinstance(other, MatrixExpression):
+            other = other.evaluate()
+        # other matrix types (e.g. SparseMatrix) implement the comparison
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        if not self.same_dimensions(other):
+            return False
+        if self is other:
+            return True
+        if self._hash is not None and other._hash is not None:
+            if self._hash != other._hash:
+                return False
+        return self._raw_rows() == other._raw_rows()
 
     def __ne__(self, other):
-        return not self.__eq__(other)
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
 
     # <!-- basic operations -->
 
@@ -198,6 +1210,59 @@ class Matrix(object):
         """
         return self._rows, self._cols
 
+    def storage(self):
+        """(Matrix) -> str
+
+        Returns how this matrix is stored, "list" or "flat".
+        """
+        return "flat" if isinstance(self._mtx, FlatStorage) else "list"
+
+    def dtype(self):
+        """(Matrix) -> str
+
+        Returns the dtype of the elements of this matrix, "int", "float" or
+        "object". For list storage this is inferred from the elements.
+        """
+        if isinstance(self._mtx, FlatStorage):
+            return self._mtx.dtype()
+        return FlatStorage.infer_dtype(
+            value for row in self._mtx for value in row)
+
+    def arithmetic(self):
+        """(Matrix) -> str
+
+        Returns the arithmetic used by elimination on this matrix, "exact" or
+        "float". Unless it was given when this matrix was created, this is
+        "float" for matrices of dtype "float" and "exact" otherwise.
+        """
+        if self._arithmetic is not None:
+            return self._arithmetic
+        return "float" if self.dtype() == "float" else "exact"
+
+    def as_storage(self, storage, dtype=None):
+        """(Matrix, str[, str]) -> Matrix
+
+        Returns this matrix with the given storage (and dtype, for flat
+        storage). See __init__() for the storage options.
+        """
+        if storage == self.storage() and dtype in (None, self.dtype()):
+            return self
+        return Matrix(*self._mtx, storage=storage, dtype=dtype,
+                      arithmetic=self._arithmetic)
+
+    def save(self, path):
+        """(Matrix, str) -> NoneType
+
+        Saves this matrix to the file at the given path, in the NumPy .npy
+        format: a header with the shape and dtype followed by the entries in
+        row-major order. Int and float matrices take 8 bytes per entry, and
+        matrices of ints and Fractions 16 bytes per entry, as 64-bit
+        numerator and denominator pairs. See Matrix.load().
+
+        REQ: entries are ints, floats or Fractions that fit in 64 bits
+        """
+        matrix_io.save(self._mtx, path)
+
     def same_dimensions(self, other):
         """(Matrix, Matrix) -> bool
 
@@ -233,18 +1298,24 @@ class Matrix(object):
         """(Matrix, int) -> Vector
 
         Returns the row vector at the given row position.
+        For flat storage this is a view of this matrix's buffer.
 
         REQ: 1 <= position <= self.rows()
         """
+        if isinstance(self._mtx, FlatStorage):
+            return Vector._view(self._mtx.row(position-1))
         return Vector(*self._mtx[position-1])
 
     def column_vector(self, position):
         """(Matrix, int) -> Vector
 
         Returns the column vector at the given column position.
+        For flat storage this is a view of this matrix's buffer.
 
         REQ: 1 <= position <= self.columns()
         """
+        if isinstance(self._mtx, FlatStorage):
+            return Vector._view(self._mtx.column(position-1))
         col_values = list()
         for row in self._mtx:
             col_values.append(row[position-1])
@@ -254,11 +1325,90 @@ class Matrix(object):
         """(Matrix) -> Matrix
 
         Returns the transpose of this matrix.
+        For flat storage this is a view that shares this matrix's buffer.
         """
+        if isinstance(self._mtx, FlatStorage):
+            transpose = Matrix._wrap(self._mtx.transpose())
+            transpose._arithmetic = self._arithmetic
+            return transpose
+        dtype = self._numpy_dtype()
+        if dtype is not None:
+            return self._new(numpy_backend.transpose(self._mtx, dtype))
         col_vectors = list()
         for cindex in range(self._cols):
             col_vectors.append(self.column_vector(cindex+1))
-        return Matrix(*col_vectors)
+        return self._new(col_vectors)
+
+    def power(self, exponent, cache=True):
+        """(Matrix, int[, bool]) -> Matrix
+
+        Returns this matrix raised to the given exponent by repeated squaring,
+        which takes O(log exponent) matrix products. A^0 is the identity and
+        a negative exponent raises the inverse. If cache is set, the squarings
+        A, A^2, A^4, ... are kept on this matrix and reused by later calls.
+
+        REQ: matrix must be a square
+        REQ: if exponent < 0, matrix must not be singular
+        """
+        if not self.is_square():
+            raise MatrixDimensionError("matrix must be a square matrix")
+        if not isinstance(exponent, int):
+            raise TypeError("matrix exponent must be an integer")
+        if exponent < 0:
+            return self.inverse().power(-exponent, cache)
+        if exponent == 0:
+            return self._new(Matrix.identity(self._rows)._mtx)
+        if cache:
+            if self._squarings is None:
+                self._squarings = [self]
+            squarings = self._squarings
+        else:
+            squarings = [self]
+        result = None
+        bit = 0
+        while exponent:
+            if bit == len(squarings):
+                squarings.append(squarings[-1]._multiply(squarings[-1]))
+            if exponent & 1:
+                if result is None:
+                    result = squarings[bit]
+                else:
+                    result = result._multiply(squarings[bit])
+            exponent >>= 1
+            bit += 1
+        return result
+
+    def kron(self, other):
+        """(Matrix, Matrix) -> Matrix
+
+        Returns the Kronecker product of this matrix with the other matrix,
+        the block matrix whose block (i, j) is self[i][j] * other. It is built
+        in one pass. See BlockMatrix.kron() to use it without building it.
+        """
+        if not isinstance(other, Matrix):
+            raise TypeError("Kronecker product needs two matrices")
+        dtypes = {self._numpy_dtype(), other._numpy_dtype()}
+        if None not in dtypes and "float" in dtypes:
+            kron_m = numpy_backend.kron(self._mtx, other._mtx)
+        else:
+            other_rows = other._raw_rows()
+            kron_m = [[value * other_value for value in row
+                       for other_value in other_row]
+                      for row in self._raw_rows() for other_row in other_rows]
+        if not isinstance(self._mtx, FlatStorage):
+            kron_m = [Vector._demote_floats(row) for row in kron_m]
+        return self._new(kron_m)
+
+    def lazy(self):
+        """(Matrix) -> MatrixExpression
+
+        Returns this matrix as a lazy expression. Sums, differences, scalar
+        multiples, products and transposes of it build an expression tree
+        instead of new matrices, which is evaluated in one fused pass when it
+        is forced, see MatrixExpression. Setting LAZY makes the operators of
+        all matrices lazy.
+        """
+        return MatrixExpression("matrix", (self,), (self._rows, self._cols))
 
     # <!-- matrix modifiers -->
 
@@ -274,11 +1424,15 @@ class Matrix(object):
         if len(row) != self._cols:
             raise MatrixDimensionError("incorrect number of values for row")
         new_m = self._mtx.copy()
-        if pos:
-            new_m.insert(pos-1, row)
-        else:
-            new_m.append(row)
-        return Matrix(*new_m)
+        if not pos:
+            pos = self._rows + 1
+        new_m.insert(pos-1, row)
+        matrix = self._new(new_m)
+        if self._row_hashes is not None:
+            row_hashes = list(self._row_hashes)
+            row_hashes.insert(pos-1, Matrix._row_hash(row))
+            matrix._row_hashes = tuple(row_hashes)
+        return matrix
 
     def add_column(self, col, pos=None):
         """(Matrix, list or Vector[, int]) -> Matrix
@@ -298,7 +1452,7 @@ class Matrix(object):
         else:
             for i, value in enumerate(col):
                 new_m[i] += [value]
-        return Matrix(*new_m)
+        return self._new(new_m)
 
     def remove_row(self, pos):
         """(Matrix, list or Vector[, int]) -> Matrix
@@ -310,7 +1464,12 @@ class Matrix(object):
         """
         new_m = self._mtx.copy()
         new_m.pop(pos-1)
-        return Matrix(*new_m)
+        matrix = self._new(new_m)
+        if self._row_hashes is not None:
+            row_hashes = list(self._row_hashes)
+            row_hashes.pop(pos-1)
+            matrix._row_hashes = tuple(row_hashes)
+        return matrix
 
     def remove_column(self, pos):
         """(Matrix, list or Vector[, int]) -> Matrix
@@ -323,7 +1482,7 @@ class Matrix(object):
         new_m = [row.copy() for row in self._mtx]
         for i in range(self._rows):
             new_m[i] = new_m[i][:pos-1] + new_m[i][pos:]
-        return Matrix(*new_m)
+        return self._new(new_m)
 
     # <!-- elementary row operations -->
 
@@ -340,7 +1499,13 @@ class Matrix(object):
         temp = row_vectors[pos1-1]
         row_vectors[pos1-1] = row_vectors[pos2-1]
         row_vectors[pos2-1] = temp
-        return Matrix(*row_vectors)
+        matrix = self._new(row_vectors)
+        if self._row_hashes is not None:
+            row_hashes = list(self._row_hashes)
+            row_hashes[pos1-1], row_hashes[pos2-1] = (
+                row_hashes[pos2-1], row_hashes[pos1-1])
+            matrix._row_hashes = tuple(row_hashes)
+        return matrix
 
     def row_multiply(self, pos, mult):
         """(Matrix, int, Number) -> Matrix
@@ -353,7 +1518,7 @@ class Matrix(object):
             return self
         row_vectors = [Vector(*row) for row in self._mtx]
         row_vectors[pos-1] *= mult
-        return Matrix(*row_vectors)
+        return self._new(row_vectors)
 
     def row_add_multiple(self, pos1, pos2, mult2):
         """(Matrix, int, int, Number) -> Matrix
@@ -364,100 +1529,207 @@ class Matrix(object):
         """
         row_vectors = [Vector(*row) for row in self._mtx]
         row_vectors[pos1-1] += row_vectors[pos2-1] * mult2
-        return Matrix(*row_vectors)
+        return self._new(row_vectors)
 
     # <!-- row echelon form operations -->
 
-    def _rref(self, all_steps=False):
-        steps = [self]
-        result = self
-        lead = 0
-        for r in range(self._rows):
-            if lead >= self._cols:
-                return steps if all_steps else result
-            i = r
-            while result.get(i, lead, by_index=True) == 0:
-                i += 1
-                if i == self._rows:
-                    i = r
-                    lead += 1
-                    if self._cols == lead:
-                        # return the matrix in RREF
-                        return steps if all_steps else result
-            result = result.row_interchange(i+1, r+1)
-            steps.append(result)
-            lv = result.get(r, lead, by_index=True)
-            result = result.row_multiply(r+1, Fraction(1, lv))
-            steps.append(result)
-            for i in range(self._rows):
-                if i != r:
-                    lv = result.get(i, lead, by_index=True)
-                    result = result.row_add_multiple(i+1, r+1, -1*lv)
-                    steps.append(result)
-            lead += 1
-        return result
+    def _rref(self, all_steps=False, arithmetic=None, tolerance=None):
+        if all_steps:
+            return list(self.iter_rref_steps(arithmetic, tolerance))
+        return self._rref_and_pivots(arithmetic, tolerance)[0]
 
-    def reduced_row_echelon_form(self):
-        """(Matrix) -> Matrix
+    def _rref_log(self, arithmetic=None, tolerance=None):
+        """(Matrix[, str, float]) -> list of tuple
+
+        Returns the log of the row operations that reduce this matrix to
+        reduced row echelon form, see _RowReduction.operations().
+        """
+        zero_tolerance = self._zero_tolerance(arithmetic, tolerance)
+
+        def compute():
+            reduction = _RowReduction(self._mtx, record_operations=True)
+            reduction.reduce(zero_tolerance)
+            return reduction.operations()
+        return self._cached(("rref log", zero_tolerance), compute)
+
+    def _rref_and_pivots(self, arithmetic=None, tolerance=None):
+        """(Matrix[, str, float]) -> Matrix, tuple of int
+
+        Returns the reduced row echelon form of this matrix and the indices
+        of its pivot columns.
+        """
+        zero_tolerance = self._zero_tolerance(arithmetic, tolerance)
+
+        def compute():
+            reduction = _RowReduction(self._mtx)
+            pivot_cols = reduction.reduce(zero_tolerance)
+            return self._new(reduction.rows()), tuple(pivot_cols)
+        return self._cached(("rref", zero_tolerance), compute)
+
+    def _pivot_columns(self, arithmetic=None, tolerance=None):
+        """(Matrix[, str, float]) -> tuple of int
+
+        Returns the indices of the pivot columns of this matrix.
+        """
+        return self._rref_and_pivots(arithmetic, tolerance)[1]
+
+    def reduced_row_echelon_form(self, arithmetic=None, tolerance=None):
+        """(Matrix[, str, float]) -> Matrix
 
         Returns the matrix in reduced row echelon form that is row equivalent
-        to this matrix.
+        to this matrix. The arithmetic and tolerance override the ones of
+        this matrix, see __init__().
 
         Credits: https://rosettacode.org/wiki/Reduced_row_echelon_form
         """
-        return self._rref(all_steps=False)
+        return self._rref(False, arithmetic, tolerance)
 
-    def rref_all_steps(self):
-        """(Matrix) -> list of Matrix
+    def rref_all_steps(self, arithmetic=None, tolerance=None):
+        """(Matrix[, str, float]) -> list of Matrix
 
         Returns all the steps (row equivalent matrices) in reducing this matrix
-        to reduced row echelon form.
+        to reduced row echelon form. See iter_rref_steps() to build the steps
+        one at a time instead.
 
         Credits: https://rosettacode.org/wiki/Reduced_row_echelon_form
         """
-        rref_all_steps = self._rref(all_steps=True)
-        rref_main_steps = [self]
-        prev_step = self
-        for step in rref_all_steps:
-            if step != prev_step:
-                rref_main_steps.append(step)
-            prev_step = step
-        return rref_main_steps
-
-    def rank(self):
-        """(Matrix) -> int
-
-        Returns the rank of this matrix.
-        The rank is calculated via the rank equation:
-            rank(A) = columns(A) - nullity(A)
+        return self._rref(True, arithmetic, tolerance)
+
+    def rref_operations(self, arithmetic=None, tolerance=None):
+        """(Matrix[, str, float]) -> list of tuple
+
+        Returns the elementary row operations that reduce this matrix to
+        reduced row echelon form, in order. Each one is the name of the
+        matrix method that applies it followed by its arguments:
+          ("row_interchange", pos1, pos2)
+          ("row_multiply", pos, mult)
+          ("row_add_multiple", pos1, pos2, mult2)
+        In float arithmetic, ("column_clear", col_pos, row_pos) also sets the
+        entries of a column from a row down to zero, as they are zero within
+        the tolerance.
         """
-        return self._cols - self.nullity()
-
-    def nullity(self):
-        """(Matrix) -> int
+        operations = list()
+        for operation in self._rref_log(arithmetic, tolerance):
+            name, args = operation[0], operation[1:]
+            if name == "interchange":
+                operations.append(("row_interchange", args[0]+1, args[1]+1))
+            elif name == "multiply":
+                operations.append(("row_multiply", args[0]+1, args[1]))
+            elif name == "add_multiple":
+                operations.append(
+                    ("row_add_multiple", args[0]+1, args[1]+1, args[2]))
+            else:
+                operations.append(("column_clear", args[0]+1, args[1]+1))
+        return operations
+
+    def iter_rref_steps(self, arithmetic=None, tolerance=None):
+        """(Matrix[, str, float]) -> iterator of Matrix
+
+        Returns an iterator over the same steps as rref_all_steps(): this
+        matrix, then the matrix after each row operation. Only the log of row
+        operations is kept, and each step is rebuilt from it when the
+        iterator reaches it.
+        """
+        zero_tolerance = self._zero_tolerance(arithmetic, tolerance)
+        operations = self._rref_log(arithmetic, tolerance)
+        yield self
+        replay = _RowReduction(self._mtx)
+        if zero_tolerance is not None:
+            replay.to_float()
+        for operation in operations:
+            replay.apply(operation)
+            if operation[0] != "clear_column":
+                yield self._new(replay.rows())
+
+    def rank(self, arithmetic=None, tolerance=None):
+        """(Matrix[, str, float]) -> int
+
+        Returns the rank of this matrix, the number of pivot columns in its
+        reduced row echelon form. In float arithmetic, columns without an
+        entry greater than the tolerance do not count. On NumPy, the rank is
+        the number of singular values greater than the tolerance instead.
+        The exact rank of an int matrix is found by fraction-free
+        elimination or, if it is large and NumPy is in use, as its rank
+        modulo a random prime, certified over the rationals (see
+        MODULAR_THRESHOLD).
+        """
+        zero_tolerance = self._zero_tolerance(arithmetic, tolerance)
+        if self._uses_numpy(zero_tolerance):
+            return self._cached(("rank", zero_tolerance), lambda: (
+                numpy_backend.rank(self._mtx, zero_tolerance)))
+        if self._uses_modular(zero_tolerance):
+            rank = self._cached(("rank", zero_tolerance), lambda: (
+                matrix_modular.rank(self._raw_rows(), Matrix.USE_NUMPY)))
+            if rank is not None:
+                return rank
+        if zero_tolerance is None and all(
+                isinstance(value, int)
+                for row in self._raw_rows() for value in row):
+            return self._cached(("rank", zero_tolerance, "bareiss"), lambda: (
+                Matrix._bareiss_rank([list(row) for row in self._mtx])))
+        return len(self._pivot_columns(arithmetic, tolerance))
+
+    def nullity(self, arithmetic=None, tolerance=None):
+        """(Matrix[, str, float]) -> int
 
         Returns the nullity of this matrix.
         The nullity is calculated via the rank equation:
             nullity(A) = columns(A) - rank(A)
         """
-        nullity = 0
-        rref = self.reduced_row_echelon_form()
-        for row_vector in rref:
-            if row_vector.is_zero():
-                nullity += 1
-        return nullity
+        return self._cols - self.rank(arithmetic, tolerance)
 
     # <!-- determinant operations -->
 
-    def determinant(self):
-        """(Matrix) -> Number
+    def determinant(self, method="bareiss", arithmetic=None, tolerance=None,
+                    spd=None):
+        """(Matrix[, str, str, float, bool]) -> Number
 
         Returns the determinant of this matrix.
+        The method is one of:
+          "bareiss": fraction-free Bareiss elimination, O(n^3). The result is
+                     exact for int and Fraction entries. In float arithmetic,
+                     LU elimination with partial pivoting is used instead.
+                     Large int matrices on NumPy are instead eliminated
+                     modulo many primes, whose results are combined by the
+                     Chinese Remainder Theorem (see MODULAR_THRESHOLD); the
+                     primes are spread across the PARALLEL_WORKERS.
+          "cofactor": cofactor expansion along the first row, O(n!). This is
+                      only kept as a reference implementation.
+        A symmetric positive-definite matrix has the determinant det(D) of
+        its LDL^T factorization. This is used in float arithmetic when the
+        matrix is detected to be positive-definite, and in exact arithmetic
+        (where Bareiss stays in the integers) only if spd is set. See
+        solve_for_x() for the spd hint.
 
         REQ: matrix must be a square
         """
         if not self.is_square():
             raise MatrixDimensionError("matrix must be a square matrix")
+        if method == "bareiss":
+            zero_tolerance = self._zero_tolerance(arithmetic, tolerance)
+            if zero_tolerance is None and not spd:
+                if self._uses_modular(zero_tolerance):
+                    return self._cached("determinant", lambda: (
+                        matrix_modular.determinant(
+                            self._raw_rows(), Matrix.PARALLEL_WORKERS)))
+                return self._cached("determinant", lambda: (
+                    Matrix._bareiss_determinant([list(r) for r in self._mtx])))
+            if self._uses_numpy(zero_tolerance):
+                if self.rank(arithmetic, tolerance) < self._rows:
+                    return 0.0
+                return self._cached(("determinant", zero_tolerance), lambda: (
+                    numpy_backend.determinant(self._mtx)))
+            if self._is_positive_definite(zero_tolerance, spd):
+                det = 1
+                for pivot in self._ldl_factorization(zero_tolerance)[1]:
+                    det *= pivot
+                return det
+            factorization = self._lu_factorization(zero_tolerance)
+            if factorization is None:
+                return 0.0
+            return LUFactorization(*factorization).determinant()
+        elif method != "cofactor":
+            raise ValueError("unknown determinant method: {}".format(method))
         det = 0
         if self._rows == 1:
             det = self.get(1, 1)
@@ -466,56 +1738,227 @@ class Matrix(object):
         else:
             for cindex in range(self._cols):
                 if self.get(1, cindex+1) != 0:
-                    det += self.get(1, cindex+1) * self.cofactor(1, cindex+1)
+                    det += self.get(1, cindex+1) * self.cofactor(
+                        1, cindex+1, method)
         return det
 
-    def minor(self, row_pos, col_pos):
-        """(Matrix) -> Number
+    def minor(self, row_pos, col_pos, method="bareiss"):
+        """(Matrix, int, int[, str]) -> Number
 
         Returns the minor at the given positions of this matrix.
+        See determinant() for the available methods.
 
         REQ: 1 <= row_pos <= self.rows()
         REQ: 1 <= col_pos <= self.columns()
         """
-        return self.remove_row(row_pos).remove_column(col_pos).determinant()
+        submatrix = self.remove_row(row_pos).remove_column(col_pos)
+        return submatrix.determinant(method)
 
-    def cofactor(self, row_pos, col_pos):
-        """(Matrix) -> Number
+    def cofactor(self, row_pos, col_pos, method="bareiss"):
+        """(Matrix, int, int[, str]) -> Number
 
         Returns the cofactor at the given positions of this matrix.
+        See determinant() for the available methods.
 
         REQ: 1 <= row_pos <= self.rows()
         REQ: 1 <= col_pos <= self.columns()
         """
-        return (-1)**(row_pos+col_pos) * self.minor(row_pos, col_pos)
+        return (-1)**(row_pos+col_pos) * self.minor(row_pos, col_pos, method)
 
-    def adjugate(self):
-        """(Matrix) -> Matrix
+    @staticmethod
+    def _null_vector(rref_rows, zero_tolerance=None):
+        """(list of list of Number[, float]) -> list of Number
+
+        Returns a non-zero vector x with Ax = 0, for the reduced row echelon
+        form of a square matrix A of rank one less than its size. Entries at
+        most the zero tolerance in magnitude are treated as zero, where None
+        means exact arithmetic.
+        """
+        size = len(rref_rows)
+        pivots = list()
+        for row in rref_rows:
+            col = next((j for j, value in enumerate(row)
+                        if (value != 0 if zero_tolerance is None
+                            else abs(value) > zero_tolerance)), None)
+            if col is None:
+                break
+            pivots.append(col)
+        free = next(j for j in range(size) if j not in pivots)
+        vector = [0] * size
+        vector[free] = 1
+        for row, col in zip(rref_rows, pivots):
+            vector[col] = -row[free]
+        return vector
+
+    def adjugate(self, arithmetic=None, tolerance=None):
+        """(Matrix[, str, float]) -> Matrix
 
         Returns the adjugate of this matrix, where:
-            adj(A) = cofactor(A)^T
+            adj(A) = det(A) * A^(-1)
+        Both det(A) and A^(-1) come from the same PLU factorization, in the
+        given arithmetic. If this matrix is singular, the adjugate is zero
+        unless the rank is exactly one less than the size, in which case it
+        has rank one: adj(A) = c * x * y^T, where Ax = 0 and A^T y = 0, and
+        the scale c is fixed by one cofactor. All of this takes O(n^3) time.
 
         REQ: matrix must be a square
         """
-        cofactor_mtx = list()
-        for i in range(self._rows):
-            cofactor_row = list()
-            for j in range(self._cols):
-                cofactor_row.append(self.cofactor(i+1, j+1))
-            cofactor_mtx.append(cofactor_row)
-        return Matrix(*cofactor_mtx).transpose()
+        if not self.is_square():
+            raise MatrixDimensionError("matrix must be a square matrix")
+        zero_tolerance = self._zero_tolerance(arithmetic, tolerance)
+        if self._rows == 1:
+            return self._new([[1 if zero_tolerance is None else 1.0]])
+        factorization = self._lu_factorization(zero_tolerance)
+        if factorization is not None:
+            lu, perm, det = factorization
+            for i in range(self._rows):
+                det *= lu[i][i]
+            zero = 0 if zero_tolerance is None else 0.0
+            adjugate_cols = list()
+            for k in range(self._rows):
+                unit = [zero] * self._rows
+                unit[k] = det
+                adjugate_cols.append(Matrix._lu_solve(lu, perm, unit))
+            return self._new(zip(*adjugate_cols))
+        if self.rank(arithmetic, tolerance) < self._rows - 1:
+            return self._new(Matrix.zero(self._rows)._mtx)
+        vector_x = Matrix._null_vector(
+            self.reduced_row_echelon_form(arithmetic, tolerance)._raw_rows(),
+            zero_tolerance)
+        vector_y = Matrix._null_vector(
+            self.transpose().reduced_row_echelon_form(
+                arithmetic, tolerance)._raw_rows(),
+            zero_tolerance)
+        # adj(A)[j][i] is the cofactor of row i and column j
+        j = max(range(self._rows), key=lambda k: abs(vector_x[k]))
+        i = max(range(self._rows), key=lambda k: abs(vector_y[k]))
+        minor = self.remove_row(i+1).remove_column(j+1).determinant(
+            arithmetic=arithmetic, tolerance=tolerance)
+        cofactor = (-1) ** (i + j) * minor
+        if zero_tolerance is None:
+            scale = Fraction.divide(cofactor, vector_x[j] * vector_y[i])
+            adjugate_m = [[Fraction.divide(scale * x * y, 1) for y in vector_y]
+                          for x in vector_x]
+        else:
+            scale = cofactor / (vector_x[j] * vector_y[i])
+            adjugate_m = [[scale * x * y for y in vector_y] for x in vector_x]
+        return self._new(adjugate_m)
 
-    def inverse(self):
-        """(Matrix) -> bool
+    def inverse(self, arithmetic=None, tolerance=None):
+        """(Matrix[, str, float]) -> Matrix
+
+        Returns the inverse of this matrix, computed by solving against each
+        column of the identity with a single PLU factorization.
+        Raises SingularMatrixError as soon as a zero pivot column is found.
+
+        REQ: matrix must be a square and not singular
+        """
+        if not self.is_square():
+            raise MatrixDimensionError("matrix must be a square matrix")
+        zero_tolerance = self._zero_tolerance(arithmetic, tolerance)
+
+        def compute():
+            if self._uses_numpy(zero_tolerance):
+                if self.rank(arithmetic, tolerance) < self._rows:
+                    return None
+                return self._new(numpy_backend.inverse(self._mtx))
+            factorization = self._lu_factorization(zero_tolerance)
+            if factorization is None:
+                return None
+            lu, perm, sign = factorization
+            one = 1 if zero_tolerance is None else 1.0
+            inverse_cols = list()
+            for k in range(self._rows):
+                unit = [one - one] * self._rows
+                unit[k] = one
+                inverse_cols.append(Matrix._lu_solve(lu, perm, unit))
+            return self._new(zip(*inverse_cols))
+        inverse = self._cached(("inverse", zero_tolerance), compute)
+        if inverse is None:
+            raise SingularMatrixError("matrix is not invertible")
+        return inverse
+
+    @staticmethod
+    def _batch(matrices):
+        """(list of Matrix) -> list of (list of list of Number, str, tuple)
+
+        Returns the rows, dtype and (storage, arithmetic) of each of the given
+        matrices, as matrix_parallel.map_rows() takes them.
+        """
+        return [(matrix._raw_rows(), matrix.dtype(),
+                 (matrix.storage(), matrix._arithmetic))
+                for matrix in matrices]
+
+    @staticmethod
+    def determinants(matrices, method="bareiss"):
+        """(iterable of Matrix[, str]) -> list of Number
+
+        Returns the determinant of each of the given matrices, in the same
+        order. If PARALLEL_WORKERS is set, the matrices are spread across the
+        worker processes, which read int and float matrices from shared
+        memory. See determinant() for the available methods.
+
+        REQ: each matrix must be a square
+        """
+        matrices = list(matrices)
+        if Matrix.PARALLEL_WORKERS > 1 and len(matrices) > 1:
+            return matrix_parallel.map_rows(
+                _determinant_task, Matrix._batch(matrices),
+                Matrix.PARALLEL_WORKERS, method)
+        return [matrix.determinant(method) for matrix in matrices]
+
+    @staticmethod
+    def inverses(matrices):
+        """(iterable of Matrix) -> list of Matrix
 
-        Returns the inverse of this matrix.
+        Returns the inverse of each of the given matrices, in the same order.
+        If PARALLEL_WORKERS is set, the matrices are spread across the worker
+        processes, which read int and float matrices from shared memory.
+
+        REQ: each matrix must be a square and not singular
+        """
+        matrices = list(matrices)
+        if Matrix.PARALLEL_WORKERS > 1 and len(matrices) > 1:
+            return matrix_parallel.map_rows(
+                _inverse_task, Matrix._batch(matrices),
+                Matrix.PARALLEL_WORKERS)
+        return [matrix.inverse() for matrix in matrices]
+
+    def factorize(self, arithmetic=None, tolerance=None):
+        """(Matrix[, str, float]) -> LUFactorization
+
+        Returns the PLU factorization of this matrix, which solves Ax = b for
+        any number of vectors b in O(n^2) each. The factorization is computed
+        once and cached on this matrix.
 
         REQ: matrix must be a square and not singular
         """
-        det = self.determinant()
-        if det == 0:
+        if not self.is_square():
+            raise MatrixDimensionError("matrix must be a square matrix")
+        zero_tolerance = self._zero_tolerance(arithmetic, tolerance)
+        factorization = self._lu_factorization(zero_tolerance)
+        if factorization is None:
             raise SingularMatrixError("matrix is not invertible")
-        return self.adjugate() * Fraction(1, det)
+        return self._cached(("factorize", zero_tolerance),
+                            lambda: LUFactorization(*factorization))
+
+    def _lu_factorization(self, zero_tolerance=None):
+        """(Matrix[, float]) -> (list of list of Number, list of int, int)
+            or NoneType
+
+        Returns the PLU factorization of this matrix from _lu_decompose(), or
+        None if this matrix is singular. The zero tolerance is the one from
+        _zero_tolerance(), where None means exact arithmetic.
+
+        REQ: matrix must be a square
+        """
+        def compute():
+            try:
+                return Matrix._lu_decompose([list(row) for row in self._mtx],
+                                            zero_tolerance)
+            except SingularMatrixError:
+                return None
+        return self._cached(("lu", zero_tolerance), compute)
 
     # <!-- boolean operations -->
 
@@ -534,61 +1977,749 @@ class Matrix(object):
             A == A^T
         """
         if self.is_square():
-            return self == self.transpose()
+            return self._cached(
+                "symmetric", lambda: self == self.transpose())
         return False
 
-    def is_singular(self):
-        """(Matrix) -> bool
+    def _is_positive_definite(self, zero_tolerance=None, spd=None):
+        """(Matrix[, float, bool]) -> bool
+
+        Returns True iff this square matrix is symmetric positive-definite,
+        i.e. it has an LDL^T factorization with a positive D, using the zero
+        tolerance from _zero_tolerance(). If spd is None, the matrix must
+        first pass the cheap checks of being symmetric with a positive
+        diagonal; if it is False, the answer is False. If spd is True, the
+        checks are skipped and ValueError is raised if the factorization
+        shows that the matrix is not positive-definite.
+        """
+        if spd is False:
+            return False
+        if spd is None:
+            if not self.is_symmetric():
+                return False
+            for i in range(self._rows):
+                value = self._mtx[i][i]
+                if not isinstance(value, (int, float, Fraction)) or value <= 0:
+                    return False
+        factorization = self._ldl_factorization(zero_tolerance)
+        positive = factorization is not None and all(
+            (pivot > 0 if zero_tolerance is None else pivot > zero_tolerance)
+            for pivot in factorization[1])
+        if spd and not positive:
+            raise ValueError("matrix is not positive-definite")
+        return positive
+
+    def _ldl_factorization(self, zero_tolerance=None):
+        """(Matrix[, float]) -> (list of list of Number, list of Number)
+            or NoneType
+
+        Returns the LDL^T factorization of this matrix from _ldl_decompose(),
+        or None if it has a zero pivot. The zero tolerance is the one from
+        _zero_tolerance(), where None means exact arithmetic.
+
+        REQ: matrix must be a square
+        """
+        def compute():
+            try:
+                return Matrix._ldl_decompose(self._mtx, zero_tolerance)
+            except SingularMatrixError:
+                return None
+        return self._cached(("ldl", zero_tolerance), compute)
+
+    def ldl(self, arithmetic=None, tolerance=None):
+        """(Matrix[, str, float]) -> Matrix, Matrix
+
+        Returns the factors L and D of the factorization A = L D L^T of this
+        symmetric matrix, where L is unit lower triangular and D is
+        diagonal. This needs about half the work of an LU factorization and
+        no square roots, so it is exact in exact arithmetic.
+        Raises ValueError if a pivot is zero, since the factorization does
+        not interchange rows.
+
+        REQ: matrix must be symmetric
+        """
+        if not self.is_square():
+            raise MatrixDimensionError("matrix must be a square matrix")
+        if not self.is_symmetric():
+            raise ValueError("matrix must be symmetric")
+        factorization = self._ldl_factorization(
+            self._zero_tolerance(arithmetic, tolerance))
+        if factorization is None:
+            raise ValueError("matrix has no LDL^T factorization")
+        lower, diagonal = factorization
+        size = self._rows
+        return (self._new(row + [1] + [0]*(size-i-1)
+                          for i, row in enumerate(lower)),
+                self._new([0]*i + [pivot] + [0]*(size-i-1)
+                          for i, pivot in enumerate(diagonal)))
+
+    def cholesky(self, arithmetic=None, tolerance=None):
+        """(Matrix[, str, float]) -> Matrix
+
+        Returns the lower triangular matrix L with a positive diagonal such
+        that A = L L^T, for this symmetric positive-definite matrix. L is
+        built from the LDL^T factorization as L sqrt(D), so its entries are
+        floats.
+        Raises ValueError if this matrix is not positive-definite.
+
+        REQ: matrix must be symmetric positive-definite
+        """
+        if not self.is_square():
+            raise MatrixDimensionError("matrix must be a square matrix")
+        if not self.is_symmetric():
+            raise ValueError("matrix must be symmetric")
+        zero_tolerance = self._zero_tolerance(arithmetic, tolerance)
+        self._is_positive_definite(zero_tolerance, True)
+        lower, diagonal = self._ldl_factorization(zero_tolerance)
+        roots = [sqrt(float(pivot)) for pivot in diagonal]
+        size = self._rows
+        return self._new(
+            [float(value) * root for value, root in zip(row, roots)] +
+            [roots[i]] + [0.0]*(size-i-1) for i, row in enumerate(lower))
+
+    def is_singular(self, arithmetic=None, tolerance=None):
+        """(Matrix[, str, float]) -> bool
 
         Returns True iff this matrix is singular (not invertible).
         """
         if not self.is_square():
             raise MatrixDimensionError("matrix must be a square matrix")
-        return self.determinant() == 0
+        return self.determinant("bareiss", arithmetic, tolerance) == 0
 
     # <!-- complex operations -->
 
-    def solve_for_x(self, vector_b):
-        """(Matrix, Vector) -> Vector
+    def solve_for_x(self, vector_b, arithmetic=None, tolerance=None,
+                    spd=None):
+        """(Matrix, Vector[, str, float, bool]) -> Vector
 
         Returns the vector x given the vector b, such that the following
         equation is satisfied:
             Ax = b
+        A symmetric positive-definite matrix is solved with its LDL^T
+        factorization, in about half the work of LU. Whether this matrix is
+        one is detected by default; spd=True skips the detection (raising
+        ValueError if the matrix turns out not to be positive-definite) and
+        spd=False never uses LDL^T.
 
         REQ: len(vector_b) == self.rows()
         """
         if self._rows != vector_b.dimension():
             err_msg = "vector must have same dimensions as this matrix's rows"
             raise MatrixDimensionError(err_msg)
-        augmented = self.add_column(vector_b)
-        rref = augmented.reduced_row_echelon_form()
-        return rref.column_vector(self._cols + 1)
+        zero_tolerance = self._zero_tolerance(arithmetic, tolerance)
+        if self.is_square() and self._uses_numpy(zero_tolerance):
+            if self.rank(arithmetic, tolerance) == self._rows:
+                return Vector(*numpy_backend.solve(self._mtx, list(vector_b)))
+        elif (self.is_square() and
+                self._is_positive_definite(zero_tolerance, spd)):
+            values = list(vector_b)
+            if zero_tolerance is not None:
+                values = [float(value) for value in values]
+            return Vector(*Matrix._ldl_solve(
+                *self._ldl_factorization(zero_tolerance), values))
+        elif (self.is_square() and
+                self._lu_factorization(zero_tolerance) is not None):
+            return self.factorize(arithmetic, tolerance).solve(vector_b)
+        reduction = _RowReduction(
+            list(row) + [value] for row, value in zip(self._mtx, vector_b))
+        reduction.reduce(zero_tolerance)
+        return Vector(*[row[-1] for row in reduction.rows()])
+
+    def _qr(self):
+        """(Matrix) -> list of list of float, list of list of float,
+            list of float
+
+        Returns the Householder QR factorization of this matrix from
+        _householder_qr().
+        """
+        return self._cached(
+            "qr", lambda: Matrix._householder_qr(self._mtx))
+
+    def qr(self, economy=False):
+        """(Matrix[, bool]) -> Matrix, Matrix
+
+        Returns the QR factorization A = QR of this m x n matrix, computed by
+        Householder reflections, where Q has orthonormal columns and R is
+        upper triangular. Q is m x m and R is m x n, unless economy is set,
+        in which case Q is m x k and R is k x n for k = min(m, n). For a
+        tall, skinny matrix the economy size leaves out the columns of Q
+        that only multiply zero rows of R. The factors are float matrices.
+        """
+        if self._numpy_dtype() is not None:
+            q_rows, r_rows = numpy_backend.qr(self._mtx, economy)
+            return self._new(q_rows), self._new(r_rows)
+        num_rows = self._rows
+        size = min(num_rows, self._cols) if economy else num_rows
+        columns, vectors, betas = self._qr()
+        q_cols = list()
+        for j in range(size):
+            unit = [0.0] * num_rows
+            unit[j] = 1.0
+            q_cols.append(
+                Matrix._apply_reflectors(vectors, betas, unit, False))
+        r_rows = [[col[i] for col in columns] for i in range(size)]
+        return self._new(zip(*q_cols)), self._new(r_rows)
+
+    def least_squares(self, vector_b, tolerance=None):
+        """(Matrix, Vector[, float]) -> Vector
+
+        Returns the vector x that minimizes |Ax - b|, which solves Ax = b
+        whenever the system is consistent. x is the solution of Rx = Q^T b
+        for the QR factorization of this matrix, so A^T A is never formed and
+        the conditioning is that of A rather than its square. The result is
+        a float vector.
+        Raises SingularMatrixError if the columns of this matrix are linearly
+        dependent, comparing the diagonal of R against the float tolerance
+        (see _zero_tolerance()), since x is then not unique.
+
+        REQ: len(vector_b) == self.rows()
+        REQ: self.rows() >= self.columns()
+        """
+        if self._rows != vector_b.dimension():
+            err_msg = "vector must have same dimensions as this matrix's rows"
+            raise MatrixDimensionError(err_msg)
+        if self._rows < self._cols:
+            raise SingularMatrixError("matrix columns are linearly dependent")
+        zero_tolerance = self._zero_tolerance("float", tolerance)
+        if self._numpy_dtype() is not None:
+            solution = numpy_backend.least_squares(
+                self._mtx, list(vector_b), zero_tolerance)
+        else:
+            columns, vectors, betas = self._qr()
+            values = Matrix._apply_reflectors(
+                vectors, betas, [float(value) for value in vector_b], True)
+            solution = [0.0] * self._cols
+            for i in range(self._cols - 1, -1, -1):
+                if abs(columns[i][i]) <= zero_tolerance:
+                    solution = None
+                    break
+                total = values[i]
+                for j in range(i + 1, self._cols):
+                    total -= columns[j][i] * solution[j]
+                solution[i] = total / columns[i][i]
+        if solution is None:
+            raise SingularMatrixError("matrix columns are linearly dependent")
+        return Vector(*solution)
+
+    # <!-- eigenvalue operations -->
+
+    def _is_self_adjoint(self):
+        """(Matrix) -> bool
+
+        Returns True iff this matrix equals its conjugate transpose, which
+        lets the eigenvalue operations use the symmetric algorithm. Only a
+        symmetric matrix of real entries (ints, floats and Fractions) is
+        detected; any other entry, such as a Complex, may be non-real, see
+        ComplexMatrix for Hermitian matrices.
+        """
+        return self.is_symmetric() and all(
+            isinstance(value, (int, float, Fraction))
+            for row in self._mtx for value in row)
+
+    def _eigen(self, want_vectors):
+        """(Matrix, bool) -> list of Number, list of list of Number or None
+
+        Returns the eigenvalues of this matrix from matrix_eigen.finish() and,
+        if want_vectors is set, the matching eigenvectors as lists of entries.
+        Raises ConvergenceError if the QR iterations do not converge.
+
+        REQ: matrix must be a square
+        """
+        if not self.is_square():
+            raise MatrixDimensionError("matrix must be a square matrix")
+
+        def compute():
+            hermitian = self._is_self_adjoint()
+            if self._numpy_dtype() is not None:
+                values, vectors = numpy_backend.eigen(
+                    self._mtx, hermitian, want_vectors)
+                return matrix_eigen.finish(values, vectors, True)
+            rows, real = matrix_eigen.numbers(self._mtx)
+            if hermitian:
+                result = matrix_eigen.symmetric_eigen(rows, want_vectors)
+            else:
+                result = matrix_eigen.general_eigen(rows, want_vectors)
+            if result is None:
+                raise ConvergenceError("QR iterations did not converge")
+            return matrix_eigen.finish(result[0], result[1], real)
+        return self._cached(("eigen", want_vectors), compute)
+
+    def eigenvalues(self):
+        """(Matrix) -> list of Number
+
+        Returns the eigenvalues of this matrix, repeated by multiplicity and
+        sorted by real and then imaginary part. They are floats, or complex
+        numbers for the non-real eigenvalues of a non-symmetric matrix.
+        Symmetric (and Hermitian) matrices are reduced to tridiagonal form
+        and diagonalized by shifted QL iterations, and any other matrix is
+        reduced to Hessenberg form and then to Schur form by shifted QR
+        iterations, see matrix_eigen.
+
+        REQ: matrix must be a square
+        """
+        return self._eigen(False)[0]
+
+    def eigenpairs(self):
+        """(Matrix) -> list of (Number, Vector)
+
+        Returns the eigenvalues of this matrix in the order of eigenvalues(),
+        each paired with a matching unit eigenvector. For a symmetric or
+        Hermitian matrix the eigenvectors are orthonormal.
+
+        REQ: matrix must be a square
+        """
+        values, vectors = self._eigen(True)
+        return [(value, Vector(*vector))
+                for value, vector in zip(values, vectors)]
+
+    def dominant_eigenpair(self, tolerance=1e-10, max_iterations=1000):
+        """(Matrix[, float, int]) -> Number, Vector
+
+        Returns the eigenvalue of largest magnitude of this matrix with a
+        matching unit eigenvector, found by power iteration. Each iteration
+        is one matrix-vector product, and the iterations stop once the
+        residual |Ax - value x| is at most tolerance * |value|.
+        Raises ConvergenceError after max_iterations iterations, as happens
+        when the two largest eigenvalues have (nearly) the same magnitude.
+
+        REQ: matrix must be a square
+        """
+        if not self.is_square():
+            raise MatrixDimensionError("matrix must be a square matrix")
+        rows = matrix_eigen.numbers(self._mtx)[0]
+        result = matrix_eigen.power_iteration(rows, tolerance, max_iterations)
+        if result is None:
+            raise ConvergenceError(
+                "no convergence after {} iterations".format(max_iterations))
+        return result[0], Vector(*result[1])
 
     def row_space(self):
         """(Matrix) -> set of Vector
 
-        Returns the basis of the row space of this matrix.
+        Returns the basis of the row space of this matrix, the non-zero rows
+        of its reduced row echelon form.
         """
-        rref = self.reduced_row_echelon_form()
-        row_space = {self.row_vector(
-            i+1) for i, row_v in enumerate(rref) if not row_v.is_zero()}
-        return row_space
+        rref, pivot_cols = self._rref_and_pivots()
+        return {rref.row_vector(i+1) for i in range(len(pivot_cols))}
 
     def column_space(self):
         """(Matrix) -> set of Vector
 
-        Returns the basis of the column space of this matrix.
-        """
-        col_space = set()
-        rref = self.reduced_row_echelon_form()
-        column_vectors = [rref.column_vector(i+1) for i in range(self._cols)]
-        prev_pivot_pos = -1
-        for col_vector in column_vectors:
-            pivot_pos = Matrix._pivot_position(col_vector)
-            if pivot_pos != prev_pivot_pos:
-                col_space.add(col_vector)
-            prev_pivot_pos = pivot_pos
-        return col_space
+        Returns the basis of the column space of this matrix, the columns of
+        this matrix in the pivot columns of its reduced row echelon form.
+        """
+        return {self.column_vector(j+1) for j in self._pivot_columns()}
+
+
+class LUFactorization(object):
+    """A class to represent the PLU factorization PA = LU of a square,
+    non-singular matrix A."""
+
+    def __init__(self, lu, perm, sign):
+        """(LUFactorization, list of list of Number, list of int, int)
+            -> NoneType
+
+        Creates a factorization from the packed result of
+        Matrix._lu_decompose(). Use Matrix.factorize() instead.
+        """
+        self._lu = lu
+        self._perm = perm
+        self._sign = sign
+        self._size = len(lu)
+        # a float factorization solves for float right-hand sides only
+        self._floating = isinstance(lu[0][0], float)
+
+    def _values(self, vector_b):
+        if self._floating:
+            return [float(value) for value in vector_b]
+        return list(vector_b)
+
+    def size(self):
+        """(LUFactorization) -> int
+
+        Returns the number of rows (and columns) of the factorized matrix.
+        """
+        return self._size
+
+    def lower(self):
+        """(LUFactorization) -> Matrix
+
+        Returns the unit lower triangular factor L.
+        """
+        return Matrix(*[row[:i] + [1] + [0]*(self._size-i-1)
+                        for i, row in enumerate(self._lu)])
+
+    def upper(self):
+        """(LUFactorization) -> Matrix
+
+        Returns the upper triangular factor U.
+        """
+        return Matrix(*[[0]*i + row[i:] for i, row in enumerate(self._lu)])
+
+    def permutation(self):
+        """(LUFactorization) -> Matrix
+
+        Returns the permutation matrix P.
+        """
+        return Matrix(*[[int(j == pos) for j in range(self._size)]
+                        for pos in self._perm])
+
+    def determinant(self):
+        """(LUFactorization) -> Number
+
+        Returns the determinant of the factorized matrix.
+        """
+        det = self._sign
+        for i in range(self._size):
+            det *= self._lu[i][i]
+        return det
+
+    def solve(self, vector_b):
+        """(LUFactorization, Vector) -> Vector
+
+        Returns the vector x such that Ax = b, by forward and back
+        substitution in O(n^2).
+
+        REQ: len(vector_b) == self.size()
+        """
+        if vector_b.dimension() != self._size:
+            err_msg = "vector must have same dimensions as this matrix's rows"
+            raise MatrixDimensionError(err_msg)
+        return Vector(*Matrix._lu_solve(self._lu, self._perm,
+                                        self._values(vector_b)))
+
+    def solve_many(self, vectors_b):
+        """(LUFactorization, iterable of Vector) -> list of Vector
+
+        Returns the vectors x such that Ax = b for each of the given vectors
+        b, in the same order. The substitutions are run for all of the
+        vectors together, one row operation at a time.
+
+        REQ: len(b) == self.size() for each vector b
+        """
+        vectors_b = list(vectors_b)
+        for vector_b in vectors_b:
+            if vector_b.dimension() != self._size:
+                err_msg = "vectors must have same dimensions as matrix rows"
+                raise MatrixDimensionError(err_msg)
+        if not vectors_b:
+            return list()
+        # solutions[i] holds the i-th entry of every solution
+        columns = [self._values(vector_b) for vector_b in vectors_b]
+        solutions = [[column[pos] for column in columns]
+                     for pos in self._perm]
+        for i in range(self._size):
+            row = self._lu[i]
+            for j in range(i):
+                if row[j] != 0:
+                    scaled = [row[j] * value for value in solutions[j]]
+                    solutions[i] = list(map(sub, solutions[i], scaled))
+        for i in range(self._size - 1, -1, -1):
+            row = self._lu[i]
+            for j in range(i + 1, self._size):
+                if row[j] != 0:
+                    scaled = [row[j] * value for value in solutions[j]]
+                    solutions[i] = list(map(sub, solutions[i], scaled))
+            solutions[i] = [Fraction.divide(value, row[i])
+                            for value in solutions[i]]
+        return [Vector(*values) for values in zip(*solutions)]
+
+
+class MatrixExpression(object):
+    """A class to represent a lazily evaluated expression of matrices.
+
+    An expression is a tree of sums, scalar multiples, transposes and
+    products whose leaves are matrices. It is evaluated when it is forced,
+    by evaluate(), str(), get() or any other method of the resulting
+    Matrix. Before evaluation the tree is simplified:
+      - transposes are pushed down to the leaves, so (A^T)^T = A,
+      - scalar multiples are folded, so 2(3A) = 6A and (2A)(3B) = 6(AB),
+      - like terms are collected, so A + A = 2A and A - A = 0.
+    What remains is a linear combination of matrices and products, which is
+    computed one row at a time, without an intermediate matrix per operator.
+    """
+
+    def __init__(self, operator, operands, dimensions):
+        """(MatrixExpression, str, tuple, (int, int)) -> NoneType
+
+        Creates an expression node with the given operator and operands:
+          "matrix": a leaf, the operand is a Matrix.
+          "sum": the sum of two expressions.
+          "scale": an expression times a scalar.
+          "transpose": the transpose of an expression.
+          "product": the matrix product of two expressions.
+        Use Matrix.lazy() instead.
+        """
+        self._operator = operator
+        self._operands = operands
+        self._dims = dimensions
+        # the Matrix this expression evaluates to, once it is forced
+        self._value = operands[0] if operator == "matrix" else None
+        # the [coefficient, Matrix] term of a product, once it is computed,
+        # so that a product shared by several parents is computed only once
+        self._product = None
+
+    @staticmethod
+    def _wrap(value):
+        """(object) -> MatrixExpression or NoneType
+
+        Returns the given Matrix or expression as an expression, or None if
+        it is neither.
+        """
+        if isinstance(value, MatrixExpression):
+            return value
+        if isinstance(value, Matrix):
+            return value.lazy()
+        return None
+
+    def __repr__(self):
+        return repr(self.evaluate())
+
+    def __str__(self):
+        return str(self.evaluate())
+
+    def __iter__(self):
+        return iter(self.evaluate())
+
+    def __getattr__(self, name):
+        # any other Matrix method forces the expression
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.evaluate(), name)
+
+    def __eq__(self, other):
+        return self.evaluate() == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.evaluate())
+
+    def __add__(self, other):
+        """(MatrixExpression, Matrix or MatrixExpression) -> MatrixExpression
+
+        Returns the lazy sum of the two expressions.
+
+        REQ: self.dimensions == other.dimensions
+        """
+        other = MatrixExpression._wrap(other)
+        if other is None:
+            return NotImplemented
+        if self._dims != other._dims:
+            err_msg = "matrices must have the same dimensions"
+            raise MatrixDimensionError(err_msg)
+        return MatrixExpression("sum", (self, other), self._dims)
+
+    def __radd__(self, other):
+        other = MatrixExpression._wrap(other)
+        if other is None:
+            return NotImplemented
+        return other.__add__(self)
+
+    def __sub__(self, other):
+        """(MatrixExpression, Matrix or MatrixExpression) -> MatrixExpression
+
+        Returns the lazy difference of the two expressions.
+
+        REQ: self.dimensions == other.dimensions
+        """
+        other = MatrixExpression._wrap(other)
+        if other is None:
+            return NotImplemented
+        return self.__add__(other.__neg__())
+
+    def __rsub__(self, other):
+        other = MatrixExpression._wrap(other)
+        if other is None:
+            return NotImplemented
+        return other.__sub__(self)
+
+    def __neg__(self):
+        return self.__mul__(-1)
+
+    def __mul__(self, other):
+        """(MatrixExpression, Matrix or MatrixExpression or Vector or Scalar)
+            -> MatrixExpression or Vector
+
+        Returns a product of this expression with another value.
+        If other is a...
+          Matrix or MatrixExpression: returns the lazy matrix product.
+          Vector: returns vector, the product with the evaluated expression.
+          Scalar: returns the lazy scalar multiple.
+
+        REQ: if other is matrix, self.columns == other.rows
+        REQ: if other is vector, self.columns == other.dimension
+        """
+        if isinstance(other, Vector):
+            return self.evaluate() * other
+        if isinstance(other, (Matrix, MatrixExpression)):
+            other = MatrixExpression._wrap(other)
+            if self._dims[1] != other._dims[0]:
+                err_msg = "matrix columns must match the other matrix's rows"
+                raise MatrixDimensionError(err_msg)
+            return MatrixExpression("product", (self, other),
+                                    (self._dims[0], other._dims[1]))
+        # other matrix types (e.g. SparseMatrix) implement the product
+        if hasattr(other, "dimensions"):
+            return NotImplemented
+        return MatrixExpression("scale", (self, other), self._dims)
+
+    def __rmul__(self, other):
+        if isinstance(other, Matrix):
+            return other.lazy().__mul__(self)
+        return self.__mul__(other)
+
+    def rows(self):
+        """(MatrixExpression) -> int
+
+        Returns the number of rows of this expression, without evaluating it.
+        """
+        return self._dims[0]
+
+    def columns(self):
+        """(MatrixExpression) -> int
+
+        Returns the number of columns of this expression, without evaluating
+        it.
+        """
+        return self._dims[1]
+
+    def dimensions(self):
+        """(MatrixExpression) -> int, int
+
+        Returns the dimensions of this expression, without evaluating it.
+        """
+        return self._dims
+
+    def transpose(self):
+        """(MatrixExpression) -> MatrixExpression
+
+        Returns the lazy transpose of this expression.
+        """
+        if self._operator == "transpose":
+            return self._operands[0]
+        return MatrixExpression("transpose", (self,),
+                                (self._dims[1], self._dims[0]))
+
+    def get(self, row_pos, col_pos, by_index=False):
+        """(MatrixExpression, int, int[, bool]) -> Number
+
+        Returns the number at the given position of the evaluated expression.
+        See Matrix.get().
+        """
+        return self.evaluate().get(row_pos, col_pos, by_index)
+
+    def evaluate(self):
+        """(MatrixExpression) -> Matrix
+
+        Returns the matrix this expression evaluates to, computing it on the
+        first call. The result is stored like the first matrix of the
+        simplified expression.
+        """
+        if self._value is None:
+            self._value = MatrixExpression._combine(self._terms(), self._dims)
+        return self._value
+
+    def _terms(self):
+        """(MatrixExpression) -> list of [Number, Matrix, bool]
+
+        Returns the simplified linear combination of this expression as
+        terms [coefficient, matrix, transposed], with at most one term per
+        matrix and transposition, and no zero coefficients. Products are
+        evaluated to matrices, with the scalar multiples of their operands
+        moved into the coefficient, and each product node is evaluated only
+        once.
+        """
+        operator = self._operator
+        if operator == "matrix" or self._value is not None:
+            return [[1, self.evaluate(), False]]
+        if operator == "scale":
+            scalar = self._operands[1]
+            terms = [[coef * scalar, matrix, transposed] for coef, matrix,
+                     transposed in self._operands[0]._terms()]
+        elif operator == "transpose":
+            terms = [[coef, matrix, not transposed] for coef, matrix,
+                     transposed in self._operands[0]._terms()]
+        elif operator == "sum":
+            terms = self._operands[0]._terms() + self._operands[1]._terms()
+        else:
+            if self._product is None:
+                coef = 1
+                factors = list()
+                for operand in self._operands:
+                    operand_terms = operand._terms()
+                    if len(operand_terms) == 1:
+                        operand_coef, matrix, transposed = operand_terms[0]
+                        coef = coef * operand_coef
+                        factors.append(matrix.transpose() if transposed
+                                       else matrix)
+                    else:
+                        factors.append(MatrixExpression._combine(
+                            operand_terms, operand._dims))
+                self._product = [coef, factors[0]._multiply(factors[1])]
+            coef, product = self._product
+            terms = [[coef, product, False]]
+        # collect like terms
+        collected = OrderedDict()
+        for coef, matrix, transposed in terms:
+            key = (id(matrix), transposed)
+            if key in collected:
+                collected[key][0] = collected[key][0] + coef
+            else:
+                collected[key] = [coef, matrix, transposed]
+        return [term for term in collected.values() if term[0] != 0]
+
+    @staticmethod
+    def _combine(terms, dimensions):
+        """(list of [Number, Matrix, bool], (int, int)) -> Matrix
+
+        Returns the matrix with the given dimensions that is the linear
+        combination of the given terms from _terms(), computed one row at a
+        time.
+        """
+        num_rows, num_cols = dimensions
+        if not terms:
+            return Matrix.zero(num_rows, num_cols)
+        coef, like, transposed = terms[0]
+        if len(terms) == 1 and coef == 1:
+            return like.transpose() if transposed else like
+        comb_m = list()
+        for i in range(num_rows):
+            row = None
+            for coef, matrix, transposed in terms:
+                if transposed:
+                    values = [matrix_row[i] for matrix_row in matrix._mtx]
+                else:
+                    values = matrix._mtx[i]
+                if row is None:
+                    if coef == 1:
+                        row = list(values)
+                    else:
+                        row = [value * coef for value in values]
+                elif coef == 1:
+                    row = list(map(add, row, values))
+                elif coef == -1:
+                    row = list(map(sub, row, values))
+                else:
+                    row = [total + value * coef
+                           for total, value in zip(row, values)]
+            comb_m.append(Vector._demote_floats(row))
+        return like._new(comb_m)
+
+
+def _determinant_task(rows, options, method):
+    # worker processes cannot start worker processes of their own
+    Matrix.PARALLEL_WORKERS = 0
+    storage, arithmetic = options
+    return Matrix(*rows, storage=storage,
+                  arithmetic=arithmetic).determinant(method)
+
+
+def _inverse_task(rows, options):
+    Matrix.PARALLEL_WORKERS = 0
+    storage, arithmetic = options
+    return Matrix(*rows, storage=storage, arithmetic=arithmetic).inverse()
 
 
 def examples():
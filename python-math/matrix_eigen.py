@@ -0,0 +1,350 @@
+"""This module contains the eigenvalue routines behind Matrix.eigenvalues(),
+Matrix.eigenpairs() and Matrix.dominant_eigenpair().
+
+Every routine works in floating point on the rows of a square matrix, with
+floats for real matrices and complex numbers otherwise. Both decompositions
+start with a Householder reduction to upper Hessenberg form, which is
+tridiagonal for symmetric and Hermitian matrices:
+  - symmetric/Hermitian: implicitly shifted QL iterations on the real
+    tridiagonal matrix, O(n^3) with eigenvectors and O(n^2) after the
+    reduction without them.
+  - any other matrix: Wilkinson-shifted QR iterations in complex arithmetic
+    down to the Schur form, whose eigenvectors are found by back
+    substitution.
+The routines return None if the iterations do not converge.
+"""
+
+from cmath import sqrt as complex_sqrt
+from math import copysign, hypot, sqrt
+from operator import mul
+from random import Random
+from sys import float_info
+
+EPSILON = float_info.epsilon
+# iterations allowed per eigenvalue before giving up
+MAX_SWEEPS = 30
+
+
+def numbers(rows):
+    """(sequence of sequence of Number) -> list of list of Number, bool
+
+    Returns a copy of the given rows with every entry converted to a float,
+    or to a complex if it has no real value, and whether all entries are
+    real.
+    """
+    converted = list()
+    real = True
+    for row in rows:
+        new_row = list()
+        for value in row:
+            try:
+                new_row.append(float(value))
+            except TypeError:
+                new_row.append(complex(value))
+                real = False
+        converted.append(new_row)
+    return converted, real
+
+
+def _identity(size):
+    return [[float(i == j) for j in range(size)] for i in range(size)]
+
+
+def hessenberg(rows, want_q):
+    """(list of list of Number, bool) -> list of list of Number,
+        list of list of Number or NoneType
+
+    Reduces the given rows to upper Hessenberg form H by Householder
+    reflections and returns (H, Q), where A = QHQ* and Q is unitary, or
+    (H, None) if want_q is not set. The given rows are overwritten.
+    """
+    size = len(rows)
+    basis = _identity(size) if want_q else None
+    for k in range(size - 2):
+        vector = [rows[i][k] for i in range(k + 1, size)]
+        sigma = sum(abs(value) ** 2 for value in vector[1:])
+        if sigma == 0:
+            continue
+        head = vector[0]
+        norm = sqrt(abs(head) ** 2 + sigma)
+        alpha = -norm * (head / abs(head) if head != 0 else 1.0)
+        vector[0] = head - alpha
+        beta = 2.0 / (abs(vector[0]) ** 2 + sigma)
+        conjugates = [value.conjugate() for value in vector]
+        # H A = A - beta v (v* A), on the rows below k
+        weights = [0.0] * (size - k)
+        for value, row in zip(conjugates, rows[k+1:]):
+            scaled = beta * value
+            weights = [weight + scaled * entry
+                       for weight, entry in zip(weights, row[k:])]
+        for value, row in zip(vector, rows[k+1:]):
+            row[k:] = [entry - value * weight
+                       for entry, weight in zip(row[k:], weights)]
+        # A H = A - beta (A v) v*, on the columns right of k
+        for row in rows + (basis or []):
+            scale = beta * sum(map(mul, row[k+1:], vector))
+            if scale != 0:
+                row[k+1:] = [entry - scale * value
+                             for entry, value in zip(row[k+1:], conjugates)]
+        rows[k+1][k] = alpha
+        for i in range(k + 2, size):
+            rows[i][k] = 0.0 * alpha
+    return rows, basis
+
+
+def symmetric_eigen(rows, want_vectors):
+    """(list of list of Number, bool)
+        -> list of float, list of list of Number or NoneType
+
+    Returns the eigenvalues of the symmetric or Hermitian matrix with the
+    given rows and, if want_vectors is set, the matching eigenvectors as
+    lists of entries (otherwise None). Returns None if the iterations do not
+    converge. The given rows are overwritten.
+    """
+    size = len(rows)
+    tri, basis = hessenberg(rows, want_vectors)
+    diagonal = [tri[i][i].real for i in range(size)]
+    # a diagonal unitary D makes the tridiagonal matrix real, as D*TD
+    off_diagonal = [0.0] * size
+    phases = [1.0] * size
+    for i in range(size - 1):
+        entry = tri[i+1][i]
+        off_diagonal[i] = abs(entry)
+        phases[i+1] = phases[i] * (entry / abs(entry) if entry != 0 else 1.0)
+    vectors = None
+    if want_vectors:
+        # vectors[i] is column i of QD, rotated into the eigenvectors below
+        vectors = [[row[i] * phases[i] for row in basis] for i in range(size)]
+    if not _tridiagonal_ql(diagonal, off_diagonal, vectors):
+        return None
+    return diagonal, vectors
+
+
+def _tridiagonal_ql(diagonal, off_diagonal, vectors):
+    """(list of float, list of float, list of list of Number or NoneType)
+        -> bool
+
+    Diagonalizes the real symmetric tridiagonal matrix with the given
+    diagonal and off-diagonal (off_diagonal[i] joins rows i and i+1) by QL
+    iterations with implicit shifts, leaving the eigenvalues in diagonal.
+    Each rotation is also applied to vectors, if given. Returns False if
+    the iterations do not converge.
+    """
+    size = len(diagonal)
+    for low in range(size):
+        sweeps = 0
+        while True:
+            high = low
+            while high < size - 1:
+                scale = abs(diagonal[high]) + abs(diagonal[high+1])
+                if abs(off_diagonal[high]) <= EPSILON * scale:
+                    break
+                high += 1
+            if high == low:
+                break
+            sweeps += 1
+            if sweeps > MAX_SWEEPS:
+                return False
+            g = (diagonal[low+1] - diagonal[low]) / (2.0 * off_diagonal[low])
+            r = hypot(g, 1.0)
+            g = (diagonal[high] - diagonal[low] +
+                 off_diagonal[low] / (g + copysign(r, g)))
+            s = c = 1.0
+            p = 0.0
+            restart = False
+            for i in range(high - 1, low - 1, -1):
+                f = s * off_diagonal[i]
+                b = c * off_diagonal[i]
+                r = hypot(f, g)
+                off_diagonal[i+1] = r
+                if r == 0.0:
+                    diagonal[i+1] -= p
+                    off_diagonal[high] = 0.0
+                    restart = True
+                    break
+                s = f / r
+                c = g / r
+                g = diagonal[i+1] - p
+                r = (diagonal[i] - g) * s + 2.0 * c * b
+                p = s * r
+                diagonal[i+1] = g + p
+                g = c * r - b
+                if vectors is not None:
+                    left, right = vectors[i], vectors[i+1]
+                    vectors[i+1] = [s * u + c * w
+                                    for u, w in zip(left, right)]
+                    vectors[i] = [c * u - s * w for u, w in zip(left, right)]
+            if restart:
+                continue
+            diagonal[low] -= p
+            off_diagonal[low] = g
+            off_diagonal[high] = 0.0
+    return True
+
+
+def _wilkinson_shift(rows, high):
+    a, b = rows[high-1][high-1], rows[high-1][high]
+    c, d = rows[high][high-1], rows[high][high]
+    mean = (a + d) / 2
+    root = complex_sqrt(((a - d) / 2) ** 2 + b * c)
+    shift1, shift2 = mean + root, mean - root
+    return shift1 if abs(shift1 - d) <= abs(shift2 - d) else shift2
+
+
+def _schur(rows, basis):
+    """(list of list of complex, list of list of complex or NoneType)
+        -> bool
+
+    Reduces the upper Hessenberg matrix with the given rows to upper
+    triangular (Schur) form T by shifted QR iterations, accumulating the
+    unitary transformations into basis, if given. Returns False if the
+    iterations do not converge.
+    """
+    size = len(rows)
+    norm = max(abs(value) for row in rows for value in row) or 1.0
+    high = size - 1
+    sweeps = 0
+    total_sweeps = 0
+    while high > 0:
+        low = high
+        while low > 0:
+            scale = abs(rows[low-1][low-1]) + abs(rows[low][low]) or norm
+            if abs(rows[low][low-1]) <= EPSILON * scale:
+                rows[low][low-1] = 0j
+                break
+            low -= 1
+        if low == high:
+            high -= 1
+            sweeps = 0
+            continue
+        sweeps += 1
+        total_sweeps += 1
+        if total_sweeps > MAX_SWEEPS * size:
+            return False
+        if sweeps % 10 == 0:
+            # an exceptional shift breaks cycles of the Wilkinson shift
+            shift = rows[high][high] + abs(rows[high][high-1])
+        else:
+            shift = _wilkinson_shift(rows, high)
+        for k in range(low, high + 1):
+            rows[k][k] -= shift
+        rotations = list()
+        for k in range(low, high):
+            upper, lower = rows[k], rows[k+1]
+            x, y = upper[k], lower[k]
+            r = sqrt(abs(x) ** 2 + abs(y) ** 2)
+            c, s = (x / r, y / r) if r else (1.0, 0.0)
+            cc, sc = c.conjugate(), s.conjugate()
+            upper[k:], lower[k:] = (
+                [cc * u + sc * w for u, w in zip(upper[k:], lower[k:])],
+                [c * w - s * u for u, w in zip(upper[k:], lower[k:])])
+            rotations.append((k, c, s))
+        for k, c, s in rotations:
+            cc, sc = c.conjugate(), s.conjugate()
+            for row in rows[:min(k + 2, high) + 1] + (basis or []):
+                u, w = row[k], row[k+1]
+                row[k], row[k+1] = c * u + s * w, cc * w - sc * u
+        for k in range(low, high + 1):
+            rows[k][k] += shift
+    return True
+
+
+def general_eigen(rows, want_vectors):
+    """(list of list of Number, bool)
+        -> list of complex, list of list of complex or NoneType
+
+    Returns the eigenvalues of the square matrix with the given rows and, if
+    want_vectors is set, the matching eigenvectors as lists of entries
+    (otherwise None). Returns None if the iterations do not converge.
+    """
+    size = len(rows)
+    rows = [[complex(value) for value in row] for row in rows]
+    schur, basis = hessenberg(rows, want_vectors)
+    if not _schur(schur, basis):
+        return None
+    values = [schur[i][i] for i in range(size)]
+    if not want_vectors:
+        return values, None
+    norm = max(abs(value) for row in schur for value in row) or 1.0
+    smallest = EPSILON * norm
+    vectors = list()
+    for k, value in enumerate(values):
+        # solve (T - value I)y = 0 with y[k] = 1 and y[j] = 0 for j > k
+        entries = [0j] * (k + 1)
+        entries[k] = 1.0
+        for i in range(k - 1, -1, -1):
+            total = sum(map(mul, schur[i][i+1:k+1], entries[i+1:]))
+            denominator = schur[i][i] - value
+            if abs(denominator) < smallest:
+                denominator = smallest
+            entries[i] = -total / denominator
+        vectors.append([sum(map(mul, row[:k+1], entries)) for row in basis])
+    return values, vectors
+
+
+def _normalize(values, real):
+    length = sqrt(sum(abs(value) ** 2 for value in values))
+    if length == 0:
+        return values
+    largest = max(values, key=abs)
+    phase = largest / abs(largest)
+    values = [value / (phase * length) for value in values]
+    if real and all(abs(value.imag) <= 1e-12 for value in values):
+        return [value.real for value in values]
+    return values
+
+
+def finish(values, vectors, real):
+    """(list of Number, list of list of Number or NoneType, bool)
+        -> list of Number, list of list of Number or NoneType
+
+    Returns the given eigenvalues sorted by real and then imaginary part,
+    with the eigenvectors in the same order, scaled to unit length with the
+    entry of largest magnitude real and positive. For a real matrix, complex
+    values and vectors whose imaginary parts are only rounding errors become
+    real.
+    """
+    scale = max((abs(value) for value in values), default=0.0) or 1.0
+    cleaned = list()
+    for value in values:
+        value = complex(value)
+        if real and abs(value.imag) <= 1e-12 * scale:
+            cleaned.append(value.real)
+        elif abs(value.imag) == 0:
+            cleaned.append(value.real)
+        else:
+            cleaned.append(value)
+    order = sorted(range(len(values)),
+                   key=lambda i: (complex(cleaned[i]).real,
+                                  complex(cleaned[i]).imag))
+    cleaned = [cleaned[i] for i in order]
+    if vectors is None:
+        return cleaned, None
+    return cleaned, [_normalize(vectors[i], real) for i in order]
+
+
+def power_iteration(rows, tolerance, max_iterations):
+    """(list of list of Number, float, int) -> Number, list of Number
+
+    Returns the eigenvalue of largest magnitude of the square matrix with the
+    given rows and a matching unit eigenvector by power iteration, once the
+    residual |Ax - value x| is at most tolerance * |value|, or None if that
+    takes more than max_iterations iterations. The start vector is random
+    but fixed, so it is never orthogonal to the eigenvector in practice.
+    """
+    generator = Random(0)
+    vector = [generator.uniform(-1.0, 1.0) for row in rows]
+    length = sqrt(sum(value * value for value in vector))
+    vector = [value / length for value in vector]
+    for iteration in range(max_iterations):
+        product = [sum(map(mul, row, vector)) for row in rows]
+        value = sum(x.conjugate() * y for x, y in zip(vector, product))
+        residual = sqrt(sum(abs(y - value * x) ** 2
+                            for x, y in zip(vector, product)))
+        if residual <= tolerance * abs(value):
+            return value, vector
+        length = sqrt(sum(abs(y) ** 2 for y in product))
+        if length == 0:
+            return 0.0, vector
+        vector = [y / length for y in product]
+    return None
@@ -0,0 +1,306 @@
+"""This module contains the file formats behind Matrix.save(),
+Matrix.load(), Matrix.from_csv() and Matrix.iter_row_blocks().
+
+Matrices are stored in the NumPy .npy format (version 1.0): a short text
+header with the dtype and shape, padded to 64 bytes, followed by the entries
+in row-major order. Int and float entries are 64-bit little-endian values
+("<i8" and "<f8"), so a saved float matrix can be memory-mapped and its
+entries read in place. Exact rational matrices (ints and Fractions) are
+stored as (numerator, denominator) pairs of 64-bit ints. Files written by
+NumPy with these dtypes can be loaded too.
+
+CSV and other delimited text files are read as a stream of row blocks, so
+only one block has to be in memory at a time.
+"""
+
+from array import array
+from ast import literal_eval
+from contextlib import nullcontext
+import csv
+import mmap
+from os import PathLike
+import sys
+
+from fraction import Fraction
+from matrix_storage import INT64_MAX, INT64_MIN, TYPECODES, FlatStorage
+
+MAGIC = b"\x93NUMPY"
+DESCRS = {"int": "<i8", "float": "<f8",
+          "fraction": [("numerator", "<i8"), ("denominator", "<i8")]}
+# the header, with its preamble, is padded to a multiple of this many bytes
+HEADER_ALIGNMENT = 64
+# flat storage dtypes, from the narrowest to the widest
+DTYPES = ["int", "float", "object"]
+
+
+def _fraction_pairs(values):
+    """(iterable of Number) -> array
+
+    Returns the numerators and denominators of the given ints and Fractions,
+    interleaved in an array of 64-bit ints.
+    """
+    pairs = array(TYPECODES["int"])
+    for value in values:
+        if isinstance(value, Fraction):
+            value = value.simplify()
+        if isinstance(value, int):
+            numerator, denominator = value, 1
+        elif isinstance(value, Fraction):
+            numerator, denominator = value.numerator(), value.denominator()
+        else:
+            raise ValueError("cannot save entry: {!r}".format(value))
+        if not (INT64_MIN <= numerator <= INT64_MAX and
+                denominator <= INT64_MAX):
+            raise ValueError("entry does not fit in 64 bits: {}".format(
+                value))
+        pairs.append(numerator)
+        pairs.append(denominator)
+    return pairs
+
+
+def _header(kind, shape):
+    """(str, (int, int)) -> bytes
+
+    Returns the .npy preamble and header for a row-major array of the given
+    kind ("int", "float" or "fraction") and shape.
+    """
+    text = "{{'descr': {!r}, 'fortran_order': False, 'shape': {!r}, }}".format(
+        DESCRS[kind], tuple(shape))
+    # magic string, version (2 bytes), header length (2 bytes), newline
+    padding = -(len(MAGIC) + 4 + len(text) + 1) % HEADER_ALIGNMENT
+    text += " " * padding + "\n"
+    return (MAGIC + b"\x01\x00" + len(text).to_bytes(2, "little") +
+            text.encode("latin1"))
+
+
+def save(storage, path):
+    """(list of list or FlatStorage, str) -> NoneType
+
+    Writes the given matrix storage to the file at the given path.
+    Raises ValueError if it has entries other than ints, floats and
+    Fractions, or ints and Fractions that do not fit in 64 bits.
+    """
+    if isinstance(storage, FlatStorage):
+        dtype = storage.dtype()
+    else:
+        dtype = FlatStorage.infer_dtype(
+            value for row in storage for value in row)
+    shape = (len(storage), len(storage[0]) if len(storage) else 0)
+    rows = iter(storage)
+    if dtype in TYPECODES:
+        kind = dtype
+        if (isinstance(storage, FlatStorage) and storage.is_contiguous() and
+                storage.offset() == 0 and
+                len(storage.buffer()) == shape[0] * shape[1]):
+            values = storage.buffer()
+        else:
+            values = array(TYPECODES[dtype])
+            for row in rows:
+                values.extend(row)
+    else:
+        kind = "fraction"
+        values = _fraction_pairs(value for row in rows for value in row)
+    values = memoryview(values)
+    if sys.byteorder != "little":
+        values = array(values.format, values)
+        values.byteswap()
+    with open(path, "wb") as file:
+        file.write(_header(kind, shape))
+        file.write(values)
+
+
+def _read_header(file):
+    """(file) -> str, (int, int), bool
+
+    Reads the .npy preamble and header from the given binary file and
+    returns the kind of its entries, its shape and whether it is stored in
+    column-major (Fortran) order. Raises ValueError if it is not a two
+    dimensional array of a supported dtype.
+    """
+    if file.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not a .npy file")
+    major = file.read(2)[0]
+    length_size = 2 if major == 1 else 4
+    header_len = int.from_bytes(file.read(length_size), "little")
+    header = literal_eval(file.read(header_len).decode("latin1"))
+    shape = tuple(header["shape"])
+    if len(shape) != 2:
+        raise ValueError("matrix file must hold a two dimensional array")
+    for kind, descr in DESCRS.items():
+        if header["descr"] == descr:
+            return kind, shape, header["fortran_order"]
+    raise ValueError("unsupported dtype: {}".format(header["descr"]))
+
+
+def load(path, use_mmap=True):
+    """(str[, bool]) -> FlatStorage
+
+    Returns the flat storage of the matrix saved in the file at the given
+    path. If use_mmap is set, int and float entries are memory-mapped
+    read-only instead of read, so the file is paged in only as its entries
+    are used; it must not be modified while the storage is in use.
+    Fraction entries are always read into Fraction objects.
+    """
+    with open(path, "rb") as file:
+        kind, shape, fortran_order = _read_header(file)
+        start = file.tell()
+        num_values = shape[0] * shape[1] * (2 if kind == "fraction" else 1)
+        typecode = TYPECODES["int" if kind == "fraction" else kind]
+        if (use_mmap and kind != "fraction" and num_values and
+                sys.byteorder == "little"):
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            size = num_values * array(typecode).itemsize
+            values = memoryview(mapping)[start:start+size].cast(typecode)
+        else:
+            values = array(typecode)
+            values.fromfile(file, num_values)
+            if sys.byteorder != "little":
+                values.byteswap()
+    if kind == "fraction":
+        pairs = iter(values)
+        values = [numerator if denominator == 1
+                  else Fraction(numerator, denominator).simplify()
+                  for numerator, denominator in zip(pairs, pairs)]
+        kind = "object"
+    strides = (1, shape[0]) if fortran_order else None
+    return FlatStorage(values, shape[0], shape[1], strides=strides,
+                       dtype=kind)
+
+
+def _parse_number(token):
+    """(str) -> Number
+
+    Returns the number written in the given token: an int, a Fraction
+    (written p/q) or a float.
+    """
+    token = token.strip()
+    if "/" in token:
+        numerator, denominator = token.split("/")
+        return Fraction(int(numerator), int(denominator)).simplify()
+    if token.lstrip("+-").isdigit():
+        return int(token)
+    return float(token)
+
+
+# the parser of each dtype given to csv_blocks()
+PARSERS = {None: _parse_number, "object": _parse_number, "int": int,
+           "float": float}
+
+
+def _text_file(path_or_file):
+    """(str or file) -> context manager
+
+    Returns a context manager for the text file at the given path, which is
+    closed afterwards, or for the given open file, which is left open.
+    """
+    if isinstance(path_or_file, (str, bytes, PathLike)):
+        return open(path_or_file, newline="")
+    return nullcontext(path_or_file)
+
+
+def _block(values, num_rows, num_cols, dtype):
+    if dtype is None:
+        dtype = FlatStorage.infer_dtype(values)
+    return FlatStorage(FlatStorage.make_buffer(values, dtype), num_rows,
+                       num_cols, dtype=dtype)
+
+
+def _csv_values(path_or_file, dtype, chunk_rows, delimiter):
+    """(str or file, str, int, str) -> generator of (list, int, int)
+
+    Yields the parsed entries of the rows of the given CSV file in blocks
+    of chunk_rows rows, as (values, number of rows, number of columns).
+    See csv_blocks().
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be positive")
+    if dtype not in PARSERS:
+        raise ValueError("unknown dtype: {}".format(dtype))
+    parse = PARSERS[dtype]
+    with _text_file(path_or_file) as file:
+        lines = (line for line in file
+                 if line.strip() and not line.lstrip().startswith("#"))
+        if delimiter is None:
+            records = (line.split() for line in lines)
+        else:
+            records = csv.reader(lines, delimiter=delimiter)
+        num_cols = None
+        values = list()
+        num_rows = 0
+        for record in records:
+            if num_cols is None:
+                num_cols = len(record)
+            elif len(record) != num_cols:
+                raise ValueError("rows must all have the same length")
+            values.extend(map(parse, record))
+            num_rows += 1
+            if num_rows == chunk_rows:
+                yield values, num_rows, num_cols
+                values = list()
+                num_rows = 0
+        if num_rows:
+            yield values, num_rows, num_cols
+
+
+def csv_blocks(path_or_file, dtype=None, chunk_rows=1024, delimiter=","):
+    """(str or file[, str, int, str]) -> generator of FlatStorage
+
+    Yields the rows of the given CSV file in blocks of chunk_rows rows (the
+    last block may be shorter), each in its own flat storage, so that only
+    one block is in memory at a time. With a delimiter of None, fields are
+    separated by any whitespace instead. Blank lines and lines starting
+    with "#" are skipped. Entries are parsed as the given dtype, "int",
+    "float" or "object"; without one, ints and Fractions (p/q) are exact and
+    each block gets the narrowest dtype for its values.
+    Raises ValueError if the rows do not all have the same length.
+    """
+    for values, num_rows, num_cols in _csv_values(path_or_file, dtype,
+                                                  chunk_rows, delimiter):
+        yield _block(values, num_rows, num_cols, dtype)
+
+
+def read_csv(path_or_file, dtype=None, chunk_rows=1024, delimiter=","):
+    """(str or file[, str, int, str]) -> FlatStorage
+
+    Returns the flat storage of all rows of the given CSV file, read in
+    blocks of chunk_rows rows and appended to a single buffer, which is
+    widened from "int" to "float" or "object" when a block needs it.
+    Without a dtype, the result is the same for any chunk_rows: the
+    narrowest dtype for all of the values, with the ints kept as ints if
+    that is "object".
+    Raises ValueError if the file has no rows.
+    """
+    buffer = None
+    buffer_dtype = None
+    # the positions and values of the ints held as floats in a "float"
+    # buffer, put back as ints if the buffer is widened to "object"
+    int_positions = array(TYPECODES["int"])
+    int_values = array(TYPECODES["int"])
+    num_rows = 0
+    for values, block_rows, num_cols in _csv_values(
+            path_or_file, dtype, chunk_rows, delimiter):
+        block_dtype = dtype or FlatStorage.infer_dtype(values)
+        if buffer is None:
+            buffer = FlatStorage.make_buffer((), block_dtype)
+            buffer_dtype = block_dtype
+        widest = max(buffer_dtype, block_dtype, key=DTYPES.index)
+        if widest != buffer_dtype:
+            if widest == "float":
+                int_positions.extend(range(len(buffer)))
+                int_values.extend(buffer)
+            buffer = FlatStorage.make_buffer(buffer, widest)
+            if buffer_dtype == "float":
+                for position, value in zip(int_positions, int_values):
+                    buffer[position] = value
+                del int_positions[:], int_values[:]
+            buffer_dtype = widest
+        if buffer_dtype == "float" and dtype is None:
+            for k, value in enumerate(values):
+                if isinstance(value, int):
+                    int_positions.append(len(buffer) + k)
+                    int_values.append(value)
+        buffer.extend(values)
+        num_rows += block_rows
+    if buffer is None:
+        raise ValueError("file has no rows")
+    return FlatStorage(buffer, num_rows, num_cols, dtype=buffer_dtype)
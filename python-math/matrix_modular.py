@@ -0,0 +1,277 @@
+"""This module contains the multi-modular routines behind exact
+determinants and ranks of large integer matrices.
+
+Fraction-free elimination keeps integer matrices in the integers, but its
+intermediate entries grow to the size of the minors, so each step works on
+numbers with thousands of digits. These routines eliminate modulo word-sized
+primes instead, where every entry stays below 2^31:
+  - determinant: the determinant modulo enough primes for their product to
+    exceed twice the Hadamard bound, recombined by the Chinese Remainder
+    Theorem. The primes are independent, so they can be spread across
+    worker processes.
+  - rank: the rank modulo one random large prime, which is never more than
+    the rank and almost always equal to it. It is certified exactly, by
+    checking that the non-pivot columns are rational combinations of the
+    pivot columns; rank() returns None if the certificate fails.
+With NumPy installed, each elimination runs on int64 arrays.
+"""
+
+from math import log2
+from random import randrange
+
+import matrix_parallel
+import numpy_backend
+
+# the primes are the largest ones below this bound
+PRIME_BOUND = 2 ** 31
+_PRIMES = list()
+
+
+def is_prime(number):
+    """(int) -> bool
+
+    Returns True iff the given number below 3215031751 is prime, by the
+    Miller-Rabin test with the bases 2, 3, 5 and 7, which is deterministic
+    in that range.
+    """
+    if number < 2:
+        return False
+    for base in (2, 3, 5, 7):
+        if number % base == 0:
+            return number == base
+    odd, twos = number - 1, 0
+    while odd % 2 == 0:
+        odd, twos = odd // 2, twos + 1
+    for base in (2, 3, 5, 7):
+        power = pow(base, odd, number)
+        if power in (1, number - 1):
+            continue
+        for i in range(twos - 1):
+            power = power * power % number
+            if power == number - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def primes(count):
+    """(int) -> list of int
+
+    Returns the given number of largest primes below PRIME_BOUND, in
+    decreasing order.
+    """
+    candidate = _PRIMES[-1] if _PRIMES else PRIME_BOUND
+    while len(_PRIMES) < count:
+        candidate -= 1
+        if is_prime(candidate):
+            _PRIMES.append(candidate)
+    return _PRIMES[:count]
+
+
+def random_prime():
+    """() -> int
+
+    Returns a random prime between PRIME_BOUND / 2 and PRIME_BOUND.
+    """
+    while True:
+        candidate = randrange(PRIME_BOUND // 2, PRIME_BOUND)
+        if is_prime(candidate):
+            return candidate
+
+
+def reduce_mod(rows, prime, use_numpy=True):
+    """(list of list of int, int[, bool]) -> list of (int, int), int
+
+    Returns the pivots of Gaussian elimination of the integer matrix with
+    the given rows modulo the given prime, as (row index, column index)
+    pairs into the given rows, and the residue of the determinant of a
+    square matrix (meaningful only if every column has a pivot). The pivot
+    rows and columns index a minor that is non-singular modulo the prime,
+    and so over the integers too. Runs on NumPy if use_numpy is set and it
+    is installed.
+    """
+    if use_numpy and numpy_backend.available():
+        return numpy_backend.reduce_mod(rows, prime)
+    work = [[value % prime for value in row] for row in rows]
+    num_rows = len(work)
+    order = list(range(num_rows))
+    pivots = list()
+    det = 1
+    r = 0
+    for col in range(len(work[0]) if work else 0):
+        if r == num_rows:
+            break
+        pos = next((i for i in range(r, num_rows) if work[i][col]), None)
+        if pos is None:
+            continue
+        if pos != r:
+            work[r], work[pos] = work[pos], work[r]
+            order[r], order[pos] = order[pos], order[r]
+            det = -det
+        pivot_row = work[r]
+        det = det * pivot_row[col] % prime
+        inverse = pow(pivot_row[col], -1, prime)
+        tail = pivot_row[col+1:]
+        for i in range(r + 1, num_rows):
+            row = work[i]
+            if row[col]:
+                factor = row[col] * inverse % prime
+                row[col+1:] = [(value - factor * pivot_value) % prime
+                               for value, pivot_value
+                               in zip(row[col+1:], tail)]
+        pivots.append((order[r], col))
+        r += 1
+    return pivots, det % prime
+
+
+def _determinant_residues(group, rows, use_numpy):
+    residues = list()
+    for prime in group:
+        pivots, det = reduce_mod(rows, prime, use_numpy)
+        residues.append(det if len(pivots) == len(rows) else 0)
+    return residues
+
+
+def hadamard_bits(rows):
+    """(list of list of int) -> float
+
+    Returns log2 of the Hadamard bound on the absolute determinant of the
+    square integer matrix with the given rows, the smaller of the products
+    of the Euclidean norms of its rows and of its columns, or None if the
+    matrix has a zero row or column.
+    """
+    bounds = list()
+    for vectors in (rows, zip(*rows)):
+        bits = 0.0
+        for vector in vectors:
+            norm_sq = sum(value * value for value in vector)
+            if norm_sq == 0:
+                return None
+            bits += log2(norm_sq) / 2
+        bounds.append(bits)
+    return min(bounds)
+
+
+def chinese_remainder(residues, moduli):
+    """(list of int, list of int) -> int
+
+    Returns the integer of least magnitude that has the given residues
+    modulo the given pairwise coprime moduli, by Garner's algorithm.
+    """
+    value, modulus = 0, 1
+    for residue, prime in zip(residues, moduli):
+        step = (residue - value) * pow(modulus, -1, prime) % prime
+        value += modulus * step
+        modulus *= prime
+    if value > modulus // 2:
+        value -= modulus
+    return value
+
+
+def determinant(rows, workers=0, use_numpy=True):
+    """(list of list of int[, int, bool]) -> int
+
+    Returns the determinant of the square integer matrix with the given
+    rows, from its residues modulo enough primes for their product to
+    exceed twice the Hadamard bound. If workers is more than one, the
+    primes are split into groups across that many worker processes. See
+    reduce_mod() for use_numpy.
+    """
+    bits = hadamard_bits(rows)
+    if bits is None:
+        return 0
+    # each prime holds more than 30 bits; one more bit is for the sign
+    moduli = primes(int(bits // 30) + 2)
+    if workers > 1 and len(moduli) > 1:
+        groups = [moduli[start:stop] for start, stop
+                  in matrix_parallel.row_blocks(0, len(moduli), workers)]
+        residues = list()
+        for group_residues in matrix_parallel.map_batch(
+                _determinant_residues, groups, workers, rows, use_numpy):
+            residues.extend(group_residues)
+    else:
+        residues = _determinant_residues(moduli, rows, use_numpy)
+    return chinese_remainder(residues, moduli)
+
+
+def _fraction_free_solve(rows, size):
+    """(list of list of int, int) -> int, list of list of int
+
+    Returns (d, y) for the integer rows [A | B] of a non-singular size x
+    size matrix A augmented by the columns of B, where d is the determinant
+    of A up to sign and the columns of y are the integer vectors d * x with
+    Ax equal to a column of B. Uses fraction-free Bareiss elimination, whose
+    divisions are all exact. The given rows are overwritten.
+    """
+    width = len(rows[0]) if rows else size
+    prev_pivot = 1
+    for k in range(size):
+        if rows[k][k] == 0:
+            pos = next(i for i in range(k + 1, size) if rows[i][k] != 0)
+            rows[k], rows[pos] = rows[pos], rows[k]
+        pivot_row = rows[k]
+        pivot = pivot_row[k]
+        for i in range(k + 1, size):
+            row = rows[i]
+            lead = row[k]
+            row[k+1:] = [(pivot * value - lead * pivot_value) // prev_pivot
+                         for value, pivot_value
+                         in zip(row[k+1:], pivot_row[k+1:])]
+            row[k] = 0
+        prev_pivot = pivot
+    det = prev_pivot
+    solution = [[0] * (width - size) for k in range(size)]
+    for c in range(width - size):
+        for k in range(size - 1, -1, -1):
+            row = rows[k]
+            total = det * row[size+c]
+            for j in range(k + 1, size):
+                total -= row[j] * solution[j][c]
+            solution[k][c] = total // row[k]
+    return det, solution
+
+
+def certify_rank(rows, pivots):
+    """(list of list of int, list of (int, int)) -> bool
+
+    Returns True iff the rank of the integer matrix with the given rows is
+    exactly the number of the given pivots from reduce_mod(), i.e. every
+    non-pivot column is a rational combination of the pivot columns.
+    """
+    num_cols = len(rows[0]) if rows else 0
+    pivot_rows = [i for i, j in pivots]
+    pivot_cols = [j for i, j in pivots]
+    pivot_set = set(pivot_cols)
+    other_cols = [j for j in range(num_cols) if j not in pivot_set]
+    if not other_cols:
+        return True
+    if not pivots:
+        return not any(value for row in rows for value in row)
+    det, solution = _fraction_free_solve(
+        [[rows[i][j] for j in pivot_cols + other_cols] for i in pivot_rows],
+        len(pivots))
+    for row in rows:
+        pivot_values = [row[j] for j in pivot_cols]
+        for c, j in enumerate(other_cols):
+            total = sum(value * solution[k][c]
+                        for k, value in enumerate(pivot_values))
+            if total != det * row[j]:
+                return False
+    return True
+
+
+def rank(rows, use_numpy=True):
+    """(list of list of int[, bool]) -> int or NoneType
+
+    Returns the rank of the integer matrix with the given rows, from its
+    rank modulo a random prime, or None if that rank could not be
+    certified to be the rank over the rationals. See reduce_mod() for
+    use_numpy.
+    """
+    pivots, det = reduce_mod(rows, random_prime(), use_numpy)
+    if len(pivots) == min(len(rows), len(rows[0]) if rows else 0):
+        return len(pivots)
+    if certify_rank(rows, pivots):
+        return len(pivots)
+    return None
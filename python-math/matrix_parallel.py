@@ -0,0 +1,370 @@
+"""This module contains the process pool behind parallel matrix operations.
+
+Large int and float operands, and whole batches of int and float matrices,
+are copied once into shared memory, and each worker process attaches to
+them by name to compute one block of rows or one chunk of the batch, so the
+operands are never pickled per task. Only what a task produces is sent
+back. Values that cannot live in a flat buffer (Fraction, Complex, ...)
+are not shared this way.
+"""
+
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import shared_memory
+from operator import mul
+
+from matrix_storage import TYPECODES
+
+
+class _WorkerPool(object):
+    """A process pool that is started on first use and kept for reuse."""
+
+    def __init__(self):
+        self._executor = None
+        self._workers = 0
+
+    def executor(self, workers):
+        """(_WorkerPool, int) -> ProcessPoolExecutor
+
+        Returns a pool of the given number of worker processes, replacing
+        the current pool if it has a different size.
+        """
+        if self._executor is None or self._workers != workers:
+            self.shutdown()
+            self._executor = ProcessPoolExecutor(workers)
+            self._workers = workers
+        return self._executor
+
+    def shutdown(self):
+        """(_WorkerPool) -> NoneType
+
+        Stops the worker processes, if any are running.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._workers = 0
+
+
+_POOL = _WorkerPool()
+# number of columns of float LU factored by this process between two rounds
+# of row updates on the worker processes
+PANEL_COLUMNS = 32
+
+
+def shutdown():
+    """() -> NoneType
+
+    Stops the worker processes. A new pool is started when it is next needed.
+    """
+    _POOL.shutdown()
+
+
+class SharedRows(object):
+    """A block of shared memory holding the rows of an int or float matrix
+    back to back."""
+
+    def __init__(self, rows, dtype):
+        """(SharedRows, list of list of Number, str) -> NoneType
+
+        Copies the given rows into a new block of shared memory, as 64-bit
+        values of the given dtype, "int" or "float".
+
+        REQ: all rows have the same length
+        """
+        self._typecode = TYPECODES[dtype]
+        self._rows = len(rows)
+        self._cols = len(rows[0])
+        values = array(self._typecode)
+        for row in rows:
+            values.extend(row)
+        self._memory = shared_memory.SharedMemory(
+            create=True, size=max(len(values) * values.itemsize, 1))
+        self._values = self._memory.buf.cast(self._typecode)
+        self._values[:len(values)] = values
+
+    def spec(self):
+        """(SharedRows) -> (str, str, int, int)
+
+        Returns what a worker needs to attach to these rows: the name of the
+        shared memory, the typecode and the number of rows and columns.
+        """
+        return self._memory.name, self._typecode, self._rows, self._cols
+
+    def values(self):
+        """(SharedRows) -> memoryview
+
+        Returns the flat, row-major view of the shared values.
+        """
+        return self._values
+
+    def rows(self):
+        """(SharedRows) -> list of list of Number
+
+        Returns a copy of the shared rows.
+        """
+        cols = self._cols
+        return [self._values[i*cols:(i+1)*cols].tolist()
+                for i in range(self._rows)]
+
+    def release(self):
+        """(SharedRows) -> NoneType
+
+        Frees the shared memory. No worker may use it afterwards.
+        """
+        self._values.release()
+        self._memory.close()
+        self._memory.unlink()
+
+
+def _attach(spec):
+    name, typecode, num_rows, num_cols = spec
+    memory = shared_memory.SharedMemory(name=name)
+    return memory, memory.buf.cast(typecode)
+
+
+def _detach(memory, values):
+    values.release()
+    memory.close()
+
+
+def row_blocks(start, stop, parts):
+    """(int, int, int) -> list of (int, int)
+
+    Returns the bounds of at most parts contiguous, non-empty blocks of
+    nearly equal size that together cover range(start, stop).
+    """
+    size = stop - start
+    parts = max(1, min(parts, size))
+    bounds = [start + size * part // parts for part in range(parts + 1)]
+    return [(bounds[p], bounds[p+1]) for p in range(parts)
+            if bounds[p] < bounds[p+1]]
+
+
+def _multiply_task(spec_a, spec_bt, start, stop):
+    memory_a, values_a = _attach(spec_a)
+    memory_bt, values_bt = _attach(spec_bt)
+    try:
+        size = spec_a[3]
+        cols_b = [values_bt[j*size:(j+1)*size].tolist()
+                  for j in range(spec_bt[2])]
+        block = list()
+        for i in range(start, stop):
+            row = values_a[i*size:(i+1)*size].tolist()
+            block.append([sum(map(mul, row, col)) for col in cols_b])
+        return block
+    finally:
+        _detach(memory_a, values_a)
+        _detach(memory_bt, values_bt)
+
+
+def multiply(rows_a, rows_b, dtype, workers):
+    """(list of list of Number, list of list of Number, str, int)
+        -> list of list of Number
+
+    Returns the rows of the product of the two matrices with the given rows,
+    computed by the given number of worker processes, one block of rows of
+    the product each. Both operands are shared as the given dtype.
+
+    REQ: len(rows_a[0]) == len(rows_b)
+    """
+    shared_a = SharedRows(rows_a, dtype)
+    shared_bt = SharedRows(list(zip(*rows_b)), dtype)
+    try:
+        futures = [_POOL.executor(workers).submit(
+                       _multiply_task, shared_a.spec(), shared_bt.spec(),
+                       start, stop)
+                   for start, stop in row_blocks(0, len(rows_a), workers)]
+        prod_m = list()
+        for future in futures:
+            prod_m.extend(future.result())
+        return prod_m
+    finally:
+        shared_a.release()
+        shared_bt.release()
+
+
+def _update_rows(values, size, first, last, col, start, stop):
+    """(memoryview, int, int, int, int, int, int) -> NoneType
+
+    Subtracts from columns col to size - 1 of the rows start to stop - 1 of
+    the size x size float LU workspace in values the multiples of rows first
+    to last - 1 whose multipliers are stored in columns first to last - 1.
+    """
+    pivot_tails = [values[j*size+col:(j+1)*size].tolist()
+                   for j in range(first, last)]
+    for i in range(start, stop):
+        factors = values[i*size+first:i*size+last].tolist()
+        tail = values[i*size+col:(i+1)*size].tolist()
+        for factor, pivot_tail in zip(factors, pivot_tails):
+            if factor != 0:
+                tail = [value - factor * pivot_value
+                        for value, pivot_value in zip(tail, pivot_tail)]
+        values[i*size+col:(i+1)*size] = array("d", tail)
+
+
+def _update_task(spec, first, last, start, stop):
+    memory, values = _attach(spec)
+    try:
+        _update_rows(values, spec[2], first, last, last, start, stop)
+    finally:
+        _detach(memory, values)
+
+
+def _factor_panel(values, size, first, last, tolerance):
+    """(memoryview, int, int, int, float) -> list of int or NoneType
+
+    Factors columns first to last - 1 of the size x size float LU workspace
+    in values with partial pivoting, updating only those columns below the
+    diagonal, and swaps whole rows. Returns the position of the pivot row of
+    each column, or None if one of them is not greater than tolerance.
+    """
+    pivots = list()
+    for k in range(first, last):
+        column = values[k*size+k::size].tolist()
+        offset = max(range(len(column)), key=lambda i: abs(column[i]))
+        if abs(column[offset]) <= tolerance:
+            return None
+        pivot_pos = k + offset
+        if offset:
+            pivot_row = values[pivot_pos*size:(pivot_pos+1)*size].tolist()
+            row_k = values[k*size:(k+1)*size].tolist()
+            values[pivot_pos*size:(pivot_pos+1)*size] = array("d", row_k)
+            values[k*size:(k+1)*size] = array("d", pivot_row)
+        pivots.append(pivot_pos)
+        pivot = values[k*size+k]
+        pivot_part = values[k*size+k+1:k*size+last].tolist()
+        for i in range(k + 1, size):
+            lead = values[i*size+k]
+            if lead != 0:
+                factor = lead / pivot
+                values[i*size+k] = factor
+                part = values[i*size+k+1:i*size+last].tolist()
+                values[i*size+k+1:i*size+last] = array("d", [
+                    value - factor * pivot_value
+                    for value, pivot_value in zip(part, pivot_part)])
+    return pivots
+
+
+def lu_decompose(rows, tolerance, workers, threshold):
+    """(list of list of Number, float, int, int)
+        -> (list of list of float, list of int, int) or NoneType
+
+    Returns the float PLU factorization (lu, perm, sign) of the square matrix
+    with the given rows, as Matrix._lu_decompose() does with a tolerance, or
+    None if the matrix is singular.
+
+    The columns are factored in panels of PANEL_COLUMNS, each by this
+    process. The update of the rows below a panel is then split into row
+    blocks across the given number of worker processes, as long as at least
+    threshold rows are left, so there is one round trip to the workers per
+    panel rather than per pivot.
+    """
+    size = len(rows)
+    shared = SharedRows(rows, "float")
+    values = shared.values()
+    perm = list(range(size))
+    sign = 1
+    try:
+        for first in range(0, size, PANEL_COLUMNS):
+            last = min(first + PANEL_COLUMNS, size)
+            pivots = _factor_panel(values, size, first, last, tolerance)
+            if pivots is None:
+                return None
+            for k, pivot_pos in enumerate(pivots, first):
+                if pivot_pos != k:
+                    perm[k], perm[pivot_pos] = perm[pivot_pos], perm[k]
+                    sign = -sign
+            # the rows of U to the right of the panel, by forward substitution
+            for k in range(first + 1, last):
+                _update_rows(values, size, first, k, last, k, k + 1)
+            if size - last >= threshold:
+                executor = _POOL.executor(workers)
+                futures = [executor.submit(_update_task, shared.spec(),
+                                           first, last, start, stop)
+                           for start, stop in row_blocks(last, size,
+                                                         workers)]
+                for future in futures:
+                    future.result()
+            else:
+                _update_rows(values, size, first, last, last, last, size)
+        return shared.rows(), perm, sign
+    finally:
+        shared.release()
+
+
+def map_batch(function, items, workers, *args):
+    """(callable, list, int, object) -> list
+
+    Returns [function(item, *args) for item in items], computed by the given
+    number of worker processes. The items and arguments are pickled to the
+    workers in chunks.
+    """
+    chunk_size = max(1, len(items) // (4 * workers))
+    arg_lists = [repeat(arg) for arg in args]
+    return list(_POOL.executor(workers).map(
+        function, items, *arg_lists, chunksize=chunk_size))
+
+
+def _rows_task(function, specs, chunk, args):
+    attached = {dtype: _attach(spec) for dtype, spec in specs.items()}
+    try:
+        results = list()
+        for dtype, rows, key in chunk:
+            if dtype in attached:
+                offset, num_rows, num_cols = rows
+                values = attached[dtype][1]
+                rows = [values[offset+i*num_cols:offset+(i+1)*num_cols]
+                        .tolist() for i in range(num_rows)]
+            results.append(function(rows, key, *args))
+        return results
+    finally:
+        for memory, values in attached.values():
+            _detach(memory, values)
+
+
+def map_rows(function, batch, workers, *args):
+    """(callable, list of (list of list of Number, str, object), int, object)
+        -> list
+
+    Returns [function(rows, key, *args) for rows, dtype, key in batch],
+    computed by the given number of worker processes, each on a contiguous
+    chunk of the batch. The rows of dtype "int" or "float" are copied once
+    into one block of shared memory per dtype, so a task is only sent where
+    its matrices are; rows of any other dtype are pickled with the task.
+
+    REQ: the rows of each matrix all have the same length
+    """
+    shared = dict()
+    chunk = list()
+    try:
+        for dtype in TYPECODES:
+            values = list()
+            for rows, row_dtype, key in batch:
+                if row_dtype == dtype:
+                    values.extend(value for row in rows for value in row)
+            if values:
+                shared[dtype] = SharedRows([values], dtype)
+        offsets = dict.fromkeys(shared, 0)
+        for rows, dtype, key in batch:
+            if dtype in shared:
+                num_cols = len(rows[0])
+                chunk.append((dtype, (offsets[dtype], len(rows), num_cols),
+                              key))
+                offsets[dtype] += len(rows) * num_cols
+            else:
+                chunk.append((dtype, rows, key))
+        specs = {dtype: rows.spec() for dtype, rows in shared.items()}
+        executor = _POOL.executor(workers)
+        futures = [executor.submit(_rows_task, function, specs,
+                                   chunk[start:stop], args)
+                   for start, stop in row_blocks(0, len(chunk),
+                                                 4 * workers)]
+        results = list()
+        for future in futures:
+            results.extend(future.result())
+        return results
+    finally:
+        for rows in shared.values():
+            rows.release()
@@ -0,0 +1,244 @@
+"""This module contains a flat, strided buffer implementation of the storage
+behind a matrix.
+
+Int and float matrices are kept in a single array.array (or a memoryview of
+a memory-mapped file), any other values (Fraction, Complex, ...) in a single
+list. Rows, columns and transposes are
+views over the same buffer that differ only in their offset and strides.
+"""
+
+from array import array
+
+TYPECODES = {"int": "q", "float": "d"}
+INT64_MIN = -2**63
+INT64_MAX = 2**63 - 1
+
+
+class StridedSequence(object):
+    """A read-only view of every step-th value of a buffer."""
+
+    def __init__(self, buffer, start, length, step):
+        """(StridedSequence, array or list, int, int, int) -> NoneType
+
+        Creates a view of length values of the buffer, starting at index start
+        and moving step values at a time. No values are copied.
+        """
+        self._buffer = buffer
+        self._start = start
+        self._len = length
+        self._step = step
+
+    def _window(self):
+        stop = self._start + self._len * self._step
+        if isinstance(self._buffer, array):
+            return memoryview(self._buffer)[self._start:stop:self._step]
+        return self._buffer[self._start:stop:self._step]
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.copy()[index]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("view index out of range")
+        return self._buffer[self._start + index * self._step]
+
+    def __iter__(self):
+        return iter(self._window())
+
+    def __repr__(self):
+        return repr(self.copy())
+
+    def copy(self):
+        """(StridedSequence) -> list
+
+        Returns the values of this view as a new list.
+        """
+        return list(self._window())
+
+
+class FlatStorage(object):
+    """A two dimensional, row-major view of a flat buffer."""
+
+    @staticmethod
+    def infer_dtype(values):
+        """(iterable of Number) -> str
+
+        Returns the narrowest dtype that can hold all of the given values:
+        "int" for 64-bit integers, "float" for floats (and integers) and
+        "object" for anything else.
+        """
+        dtype = "int"
+        for value in values:
+            if isinstance(value, int):
+                if not INT64_MIN <= value <= INT64_MAX:
+                    return "object"
+            elif isinstance(value, float):
+                dtype = "float"
+            else:
+                return "object"
+        return dtype
+
+    @staticmethod
+    def from_rows(rows, dtype=None):
+        """(sequence of iterable of Number[, str]) -> FlatStorage
+
+        Returns a storage holding a copy of the given rows. If no dtype is
+        given, the narrowest one for the values is used.
+
+        REQ: all rows have the same length
+        """
+        values = list()
+        num_cols = None
+        for row in rows:
+            row = list(row)
+            if num_cols is None:
+                num_cols = len(row)
+            elif len(row) != num_cols:
+                raise ValueError("rows must all have the same length")
+            values.extend(row)
+        if dtype is None:
+            dtype = FlatStorage.infer_dtype(values)
+        return FlatStorage(FlatStorage.make_buffer(values, dtype),
+                           len(rows), num_cols or 0, dtype=dtype)
+
+    @staticmethod
+    def make_buffer(values, dtype):
+        """(iterable of Number, str) -> array or list
+
+        Returns a flat buffer of the given dtype holding the values.
+        """
+        if dtype == "object":
+            return list(values)
+        if dtype not in TYPECODES:
+            raise ValueError("unknown dtype: {}".format(dtype))
+        return array(TYPECODES[dtype], values)
+
+    def __init__(self, buffer, rows, columns, offset=0, strides=None,
+                 dtype="object"):
+        """(FlatStorage, array or memoryview or list, int, int[, int,
+            (int, int), str]) -> NoneType
+
+        Creates a rows x columns view of the buffer. The entry at (i, j) is
+        buffer[offset + i*strides[0] + j*strides[1]], and the strides default
+        to a contiguous row-major layout.
+        """
+        self._buffer = buffer
+        self._shape = (rows, columns)
+        self._offset = offset
+        self._strides = strides if strides else (columns, 1)
+        self._dtype = dtype
+
+    def __getstate__(self):
+        # a memory-mapped buffer is sent to other processes as a copy
+        state = self.__dict__.copy()
+        if isinstance(self._buffer, memoryview):
+            state["_buffer"] = array(self._buffer.format,
+                                     self._buffer.tobytes())
+        return state
+
+    def __len__(self):
+        return self._shape[0]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._shape[0]
+        if not 0 <= index < self._shape[0]:
+            raise IndexError("storage row index out of range")
+        return self.row(index)
+
+    def __iter__(self):
+        for index in range(self._shape[0]):
+            yield self.row(index)
+
+    def __repr__(self):
+        return repr(self.copy())
+
+    def buffer(self):
+        """(FlatStorage) -> array or memoryview or list
+
+        Returns the flat buffer shared by this storage and all of its views.
+        """
+        return self._buffer
+
+    def shape(self):
+        """(FlatStorage) -> (int, int)
+
+        Returns the number of rows and columns of this storage.
+        """
+        return self._shape
+
+    def strides(self):
+        """(FlatStorage) -> (int, int)
+
+        Returns the buffer distance between adjacent rows and columns.
+        """
+        return self._strides
+
+    def offset(self):
+        """(FlatStorage) -> int
+
+        Returns the buffer index of the first entry.
+        """
+        return self._offset
+
+    def dtype(self):
+        """(FlatStorage) -> str
+
+        Returns the dtype of the buffer, "int", "float" or "object".
+        """
+        return self._dtype
+
+    def is_contiguous(self):
+        """(FlatStorage) -> bool
+
+        Returns True iff the entries are laid out row-major without gaps.
+        """
+        return self._strides == (self._shape[1], 1)
+
+    def get(self, row_index, col_index):
+        """(FlatStorage, int, int) -> Number
+
+        Returns the entry at the given row and column indices.
+        """
+        row_stride, col_stride = self._strides
+        return self._buffer[
+            self._offset + row_index * row_stride + col_index * col_stride]
+
+    def row(self, index):
+        """(FlatStorage, int) -> StridedSequence
+
+        Returns a view of the row at the given index.
+        """
+        row_stride, col_stride = self._strides
+        return StridedSequence(self._buffer, self._offset + index * row_stride,
+                               self._shape[1], col_stride)
+
+    def column(self, index):
+        """(FlatStorage, int) -> StridedSequence
+
+        Returns a view of the column at the given index.
+        """
+        row_stride, col_stride = self._strides
+        return StridedSequence(self._buffer, self._offset + index * col_stride,
+                               self._shape[0], row_stride)
+
+    def transpose(self):
+        """(FlatStorage) -> FlatStorage
+
+        Returns a view of the transpose of this storage.
+        """
+        rows, columns = self._shape
+        row_stride, col_stride = self._strides
+        return FlatStorage(self._buffer, columns, rows, self._offset,
+                           (col_stride, row_stride), self._dtype)
+
+    def copy(self):
+        """(FlatStorage) -> list of list
+
+        Returns the rows of this storage as new lists.
+        """
+        return [row.copy() for row in self]
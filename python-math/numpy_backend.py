@@ -0,0 +1,198 @@
+"""This module contains the optional NumPy backend of the matrix kernels.
+
+NumPy is not required: if it is not installed, available() is False and
+matrices use their pure Python kernels. Only int and float data is handed to
+NumPy; the kernels take the storage of a matrix (nested lists or a
+FlatStorage) and return plain Python lists, ints and floats, so results look
+the same whichever backend computed them.
+"""
+
+from matrix_storage import FlatStorage
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+NUMPY_DTYPES = {"int": "int64", "float": "float64"}
+
+
+def available():
+    """() -> bool
+
+    Returns True iff NumPy is installed.
+    """
+    return numpy is not None
+
+
+def to_array(mtx, dtype="float"):
+    """(list of list or FlatStorage[, str]) -> numpy.ndarray
+
+    Returns the given matrix storage as a two dimensional array of the given
+    dtype, "int" or "float". A FlatStorage buffer of the same dtype is viewed
+    in place, with its offset and strides, instead of being copied.
+    """
+    if isinstance(mtx, FlatStorage) and mtx.dtype() == dtype:
+        buffer = numpy.frombuffer(mtx.buffer(), NUMPY_DTYPES[dtype])
+        itemsize = buffer.itemsize
+        row_stride, col_stride = mtx.strides()
+        return numpy.lib.stride_tricks.as_strided(
+            buffer[mtx.offset():], mtx.shape(),
+            (row_stride * itemsize, col_stride * itemsize), writeable=False)
+    return numpy.array([list(row) for row in mtx], NUMPY_DTYPES[dtype])
+
+
+def multiply(mtx_a, mtx_b):
+    """(list of list or FlatStorage, list of list or FlatStorage)
+        -> list of list of float
+
+    Returns the rows of the float product of the two matrices.
+    """
+    return (to_array(mtx_a) @ to_array(mtx_b)).tolist()
+
+
+def multiply_vector(mtx, values):
+    """(list of list or FlatStorage, list of Number) -> list of float
+
+    Returns the float product of the matrix with the vector of values.
+    """
+    return (to_array(mtx) @ numpy.array(values, "float64")).tolist()
+
+
+def transpose(mtx, dtype):
+    """(list of list or FlatStorage, str) -> list of list of Number
+
+    Returns the rows of the transpose of the matrix of the given dtype.
+    """
+    return to_array(mtx, dtype).T.tolist()
+
+
+def rank(mtx, tolerance):
+    """(list of list or FlatStorage, float) -> int
+
+    Returns the number of singular values of the matrix greater than the
+    tolerance.
+    """
+    singular_values = numpy.linalg.svd(to_array(mtx), compute_uv=False)
+    return int((singular_values > tolerance).sum())
+
+
+def determinant(mtx):
+    """(list of list or FlatStorage) -> float
+
+    Returns the determinant of the square matrix, by LU elimination with
+    partial pivoting.
+    """
+    return float(numpy.linalg.det(to_array(mtx)))
+
+
+def inverse(mtx):
+    """(list of list or FlatStorage) -> list of list of float
+
+    Returns the rows of the inverse of the square, non-singular matrix.
+    """
+    return numpy.linalg.inv(to_array(mtx)).tolist()
+
+
+def solve(mtx, values):
+    """(list of list or FlatStorage, list of Number) -> list of float
+
+    Returns the solution x of Ax = b for the square, non-singular matrix A
+    and the entries of b.
+    """
+    return numpy.linalg.solve(
+        to_array(mtx), numpy.array(values, "float64")).tolist()
+
+
+def qr(mtx, economy):
+    """(list of list or FlatStorage, bool) -> list of list of float,
+        list of list of float
+
+    Returns the rows of the factors Q and R of the QR factorization of the
+    matrix, the economy-size factors if economy is set.
+    """
+    q, r = numpy.linalg.qr(to_array(mtx), "reduced" if economy else "complete")
+    return q.tolist(), r.tolist()
+
+
+def least_squares(mtx, values, tolerance):
+    """(list of list or FlatStorage, list of Number, float)
+        -> list of float or NoneType
+
+    Returns the x that minimizes |Ax - b| for the matrix A with at least as
+    many rows as columns and the entries of b, from the QR factorization of
+    A, or None if a diagonal entry of R is at most the tolerance in
+    magnitude.
+    """
+    q, r = numpy.linalg.qr(to_array(mtx), "reduced")
+    if (abs(r.diagonal()) <= tolerance).any():
+        return None
+    return numpy.linalg.solve(
+        r, q.T @ numpy.array(values, "float64")).tolist()
+
+
+def eigen(mtx, hermitian, want_vectors):
+    """(list of list or FlatStorage, bool, bool)
+        -> list of Number, list of list of Number or NoneType
+
+    Returns the eigenvalues of the square matrix and, if want_vectors is set,
+    the matching eigenvectors as lists of entries (otherwise None). A
+    symmetric matrix must be marked hermitian, so that its real eigenvalues
+    are computed by the symmetric routine.
+    """
+    array = to_array(mtx)
+    if hermitian:
+        if not want_vectors:
+            return numpy.linalg.eigvalsh(array).tolist(), None
+        values, vectors = numpy.linalg.eigh(array)
+    else:
+        if not want_vectors:
+            return numpy.linalg.eigvals(array).tolist(), None
+        values, vectors = numpy.linalg.eig(array)
+    return values.tolist(), vectors.T.tolist()
+
+
+def reduce_mod(rows, prime):
+    """(list of list of int, int) -> list of (int, int), int
+
+    Returns the pivots and the determinant residue of the integer matrix
+    with the given rows modulo the given prime, as
+    matrix_modular.reduce_mod() does. The prime must be below 2^31, so that
+    the products of residues fit in 64 bits.
+    """
+    work = numpy.array([[value % prime for value in row] for row in rows],
+                       "int64")
+    num_rows, num_cols = work.shape
+    order = list(range(num_rows))
+    pivots = list()
+    det = 1
+    r = 0
+    for col in range(num_cols):
+        if r == num_rows:
+            break
+        nonzero = numpy.flatnonzero(work[r:, col])
+        if not nonzero.size:
+            continue
+        pos = r + int(nonzero[0])
+        if pos != r:
+            work[[r, pos]] = work[[pos, r]]
+            order[r], order[pos] = order[pos], order[r]
+            det = -det
+        pivot = int(work[r, col])
+        det = det * pivot % prime
+        factors = work[r+1:, col] * pow(pivot, -1, prime) % prime
+        # |entry - factor * pivot entry| < 2^62, so one reduction suffices
+        work[r+1:, col:] = (work[r+1:, col:] -
+                            numpy.outer(factors, work[r, col:])) % prime
+        pivots.append((order[r], col))
+        r += 1
+    return pivots, det % prime
+
+
+def kron(mtx_a, mtx_b):
+    """(list of list or FlatStorage, list of list or FlatStorage)
+        -> list of list of float
+
+    Returns the rows of the float Kronecker product of the two matrices.
+    """
+    return numpy.kron(to_array(mtx_a), to_array(mtx_b)).tolist()
@@ -0,0 +1,489 @@
+"""This module contains a compressed sparse row (CSR) implementation of a
+matrix, for matrices that are mostly zeros.
+
+Only the non-zero entries are stored and every operation skips the
+structural zeros. Results are exact for int and Fraction entries and equal
+to the results of the same operations on a Matrix.
+"""
+
+from fraction import Fraction
+from matrix import Matrix, MatrixDimensionError
+from vector import Vector
+
+
+class SparseMatrix(object):
+    """A class to represent a sparse matrix in compressed sparse row form."""
+
+    @staticmethod
+    def from_coo(rows, columns, entries):
+        """(int, int, iterable of (int, int, Number)) -> SparseMatrix
+
+        Returns a sparse matrix with the given dimensions from coordinate
+        (COO) entries (row_pos, col_pos, value). Entries at the same position
+        are summed and zero values are dropped.
+
+        REQ: 1 <= row_pos <= rows
+        REQ: 1 <= col_pos <= columns
+        """
+        row_entries = [dict() for i in range(rows)]
+        for row_pos, col_pos, value in entries:
+            if not (1 <= row_pos <= rows and 1 <= col_pos <= columns):
+                raise MatrixDimensionError("entry position out of range")
+            row = row_entries[row_pos-1]
+            row[col_pos-1] = row.get(col_pos-1, 0) + value
+        return SparseMatrix._from_row_dicts(row_entries, columns)
+
+    @staticmethod
+    def from_matrix(matrix):
+        """(Matrix) -> SparseMatrix
+
+        Returns the sparse matrix with the same entries as the given matrix.
+        """
+        row_ptr = [0]
+        col_indices = list()
+        values = list()
+        for row in matrix:
+            for j, value in enumerate(row):
+                if value != 0:
+                    col_indices.append(j)
+                    values.append(value)
+            row_ptr.append(len(values))
+        return SparseMatrix(matrix.rows(), matrix.columns(), row_ptr,
+                            col_indices, values)
+
+    @staticmethod
+    def zero(rows, columns=None):
+        """(int[, int]) -> SparseMatrix
+
+        Returns a zero matrix with the given dimensions.
+        """
+        if not columns:
+            columns = rows
+        return SparseMatrix(rows, columns, [0] * (rows+1), list(), list())
+
+    @staticmethod
+    def identity(rows):
+        """(int) -> SparseMatrix
+
+        Returns an identity matrix with the given dimensions.
+        """
+        return SparseMatrix(rows, rows, list(range(rows+1)),
+                            list(range(rows)), [1] * rows)
+
+    @staticmethod
+    def _from_row_dicts(row_entries, columns):
+        """(list of dict of {int: Number}, int) -> SparseMatrix
+
+        Returns the sparse matrix whose i-th row has the entries of the i-th
+        dictionary, keyed by column index. Zero values are dropped.
+        """
+        row_ptr = [0]
+        col_indices = list()
+        values = list()
+        for row in row_entries:
+            for j in sorted(row):
+                if row[j] != 0:
+                    col_indices.append(j)
+                    values.append(row[j])
+            row_ptr.append(len(values))
+        return SparseMatrix(len(row_entries), columns, row_ptr, col_indices,
+                            values)
+
+    def __init__(self, rows, columns, row_ptr, col_indices, values):
+        """(SparseMatrix, int, int, list of int, list of int, list of Number)
+            -> NoneType
+
+        Creates a sparse matrix from its CSR arrays: the non-zero values of
+        row i are values[row_ptr[i]:row_ptr[i+1]], in the columns at the same
+        positions of col_indices (in increasing order, 0-indexed).
+
+        REQ: len(row_ptr) == rows + 1
+        """
+        if len(row_ptr) != rows + 1:
+            raise MatrixDimensionError("row pointers do not match the rows")
+        self._rows = rows
+        self._cols = columns
+        self._row_ptr = row_ptr
+        self._col_indices = col_indices
+        self._values = values
+
+    def _row_items(self, index):
+        start, stop = self._row_ptr[index], self._row_ptr[index+1]
+        return zip(self._col_indices[start:stop], self._values[start:stop])
+
+    def _row_dicts(self):
+        return [dict(self._row_items(i)) for i in range(self._rows)]
+
+    def __repr__(self):
+        return "S({}, {}, {})".format(self._rows, self._cols, self.to_coo())
+
+    def __str__(self):
+        return str(self.to_matrix())
+
+    def __eq__(self, other):
+        if isinstance(other, Matrix):
+            other = SparseMatrix.from_matrix(other)
+        if isinstance(other, SparseMatrix):
+            return (self.dimensions() == other.dimensions() and
+                    self._row_ptr == other._row_ptr and
+                    self._col_indices == other._col_indices and
+                    self._values == other._values)
+        return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __neg__(self):
+        return self.__mul__(-1)
+
+    def __add__(self, other):
+        """(SparseMatrix, SparseMatrix or Matrix) -> SparseMatrix or Matrix
+
+        Returns the sum of the two matrices. The sum with a Matrix is a
+        Matrix.
+
+        REQ: self.dimensions == other.dimensions
+        """
+        if not isinstance(other, (SparseMatrix, Matrix)):
+            return NotImplemented
+        if self.dimensions() != other.dimensions():
+            err_msg = "matrices must have the same dimensions"
+            raise MatrixDimensionError(err_msg)
+        if isinstance(other, Matrix):
+            sum_m = [list(row) for row in other._raw_rows()]
+            for i in range(self._rows):
+                row = sum_m[i]
+                for j, value in self._row_items(i):
+                    row[j] = row[j] + value
+            return other._new(sum_m)
+        row_ptr = [0]
+        col_indices = list()
+        values = list()
+        for i in range(self._rows):
+            row = dict(self._row_items(i))
+            for j, value in other._row_items(i):
+                row[j] = row.get(j, 0) + value
+            for j in sorted(row):
+                if row[j] != 0:
+                    col_indices.append(j)
+                    values.append(row[j])
+            row_ptr.append(len(values))
+        return SparseMatrix(self._rows, self._cols, row_ptr, col_indices,
+                            values)
+
+    def __radd__(self, other):
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        """(SparseMatrix, SparseMatrix or Matrix) -> SparseMatrix or Matrix
+
+        Returns the difference of the two matrices.
+
+        REQ: self.dimensions == other.dimensions
+        """
+        if not isinstance(other, (SparseMatrix, Matrix)):
+            return NotImplemented
+        if isinstance(other, Matrix):
+            # the eager product, as other * -1 is lazy if Matrix.LAZY is set
+            return self.__add__(other._multiply(-1))
+        return self.__add__(other * -1)
+
+    def __rsub__(self, other):
+        return self.__neg__().__add__(other)
+
+    def __mul__(self, other):
+        """(SparseMatrix, SparseMatrix or Matrix or Vector or Scalar)
+            -> SparseMatrix or Matrix or Vector
+
+        Returns a product of this matrix with another value.
+        If other is a...
+          SparseMatrix: returns sparse matrix, result of matrix multiplication.
+          Matrix: returns matrix, result of matrix multiplication.
+          Vector: returns vector, result of matrix-vector multiplication.
+          Scalar: returns sparse matrix, result of scalar multiplication.
+
+        REQ: if other is a matrix, self.columns == other.rows
+        REQ: if other is vector, self.columns == other.dimension
+        """
+        if isinstance(other, (SparseMatrix, Matrix)):
+            if self._cols != other.rows():
+                err_msg = "matrix columns must match the other matrix's rows"
+                raise MatrixDimensionError(err_msg)
+        if isinstance(other, SparseMatrix):
+            # Gustavson's algorithm: row i of the product is the sum of the
+            # rows k of other scaled by the non-zero entries (i, k)
+            prod_rows = list()
+            for i in range(self._rows):
+                prod_row = dict()
+                for k, value in self._row_items(i):
+                    for j, other_value in other._row_items(k):
+                        prod_row[j] = prod_row.get(j, 0) + value * other_value
+                prod_rows.append(prod_row)
+            return SparseMatrix._from_row_dicts(prod_rows, other.columns())
+        elif isinstance(other, Matrix):
+            other_rows = other._raw_rows()
+            prod_m = list()
+            for i in range(self._rows):
+                prod_row = [0] * other.columns()
+                for k, value in self._row_items(i):
+                    prod_row = [prod + value * other_value
+                                for prod, other_value
+                                in zip(prod_row, other_rows[k])]
+                prod_m.append(prod_row)
+            return other._new(prod_m)
+        elif isinstance(other, Vector):
+            if self._cols != other.dimension():
+                err_msg = "vector must have same dimensions as matrix columns"
+                raise MatrixDimensionError(err_msg)
+            values = list(other)
+            prod_v = list()
+            for i in range(self._rows):
+                total = 0
+                for j, value in self._row_items(i):
+                    total = total + value * values[j]
+                prod_v.append(total)
+            return Vector(*prod_v)
+        elif hasattr(other, "dimensions"):
+            return NotImplemented
+        values = [value * other for value in self._values]
+        row_ptr = [0]
+        col_indices = list()
+        kept_values = list()
+        for i in range(self._rows):
+            for pos in range(self._row_ptr[i], self._row_ptr[i+1]):
+                if values[pos] != 0:
+                    col_indices.append(self._col_indices[pos])
+                    kept_values.append(values[pos])
+            row_ptr.append(len(kept_values))
+        return SparseMatrix(self._rows, self._cols, row_ptr, col_indices,
+                            kept_values)
+
+    def __rmul__(self, other):
+        """(SparseMatrix, Matrix or Scalar) -> Matrix or SparseMatrix
+
+        Returns the product of another value with this matrix.
+
+        REQ: if other is a matrix, other.columns == self.rows
+        """
+        if not isinstance(other, Matrix):
+            return self.__mul__(other)
+        if other.columns() != self._rows:
+            err_msg = "matrix columns must match the other matrix's rows"
+            raise MatrixDimensionError(err_msg)
+        own_rows = [list(self._row_items(k)) for k in range(self._rows)]
+        prod_m = list()
+        for row in other._raw_rows():
+            prod_row = [0] * self._cols
+            for k, value in enumerate(row):
+                if value != 0:
+                    for j, own_value in own_rows[k]:
+                        prod_row[j] = prod_row[j] + value * own_value
+            prod_m.append(prod_row)
+        return other._new(prod_m)
+
+    # <!-- basic operations -->
+
+    def rows(self):
+        """(SparseMatrix) -> int
+
+        Returns the number of rows in this matrix.
+        """
+        return self._rows
+
+    def columns(self):
+        """(SparseMatrix) -> int
+
+        Returns the number of columns in this matrix.
+        """
+        return self._cols
+
+    def dimensions(self):
+        """(SparseMatrix) -> int, int
+
+        Returns the dimensions of this matrix.
+        """
+        return self._rows, self._cols
+
+    def nonzeros(self):
+        """(SparseMatrix) -> int
+
+        Returns the number of stored (non-zero) entries in this matrix.
+        """
+        return len(self._values)
+
+    def get(self, row_pos, col_pos, by_index=False):
+        """(SparseMatrix, int, int[, bool]) -> Number
+
+        Returns the number at the given row and column position in this matrix.
+
+        REQ: 1 <= row_pos <= self.rows()
+        REQ: 1 <= col_pos <= self.columns()
+        """
+        if not by_index:
+            row_pos, col_pos = row_pos - 1, col_pos - 1
+        for j, value in self._row_items(row_pos):
+            if j == col_pos:
+                return value
+        return 0
+
+    def row_vector(self, position):
+        """(SparseMatrix, int) -> Vector
+
+        Returns the row vector at the given row position.
+
+        REQ: 1 <= position <= self.rows()
+        """
+        values = [0] * self._cols
+        for j, value in self._row_items(position-1):
+            values[j] = value
+        return Vector(*values)
+
+    def column_vector(self, position):
+        """(SparseMatrix, int) -> Vector
+
+        Returns the column vector at the given column position.
+
+        REQ: 1 <= position <= self.columns()
+        """
+        return Vector(*[self.get(i, position-1, by_index=True)
+                        for i in range(self._rows)])
+
+    def transpose(self):
+        """(SparseMatrix) -> SparseMatrix
+
+        Returns the transpose of this matrix.
+        """
+        counts = [0] * (self._cols + 1)
+        for j in self._col_indices:
+            counts[j+1] += 1
+        for j in range(self._cols):
+            counts[j+1] += counts[j]
+        row_ptr = list(counts)
+        col_indices = [0] * len(self._values)
+        values = [0] * len(self._values)
+        for i in range(self._rows):
+            for j, value in self._row_items(i):
+                pos = counts[j]
+                col_indices[pos] = i
+                values[pos] = value
+                counts[j] += 1
+        return SparseMatrix(self._cols, self._rows, row_ptr, col_indices,
+                            values)
+
+    def to_coo(self):
+        """(SparseMatrix) -> list of (int, int, Number)
+
+        Returns the non-zero entries of this matrix as coordinate (COO)
+        entries (row_pos, col_pos, value), in row-major order.
+        """
+        return [(i+1, j+1, value) for i in range(self._rows)
+                for j, value in self._row_items(i)]
+
+    def to_matrix(self, storage="list"):
+        """(SparseMatrix[, str]) -> Matrix
+
+        Returns the dense matrix with the same entries as this matrix.
+        See Matrix.__init__() for the storage options.
+        """
+        dense_m = [[0] * self._cols for i in range(self._rows)]
+        for i in range(self._rows):
+            row = dense_m[i]
+            for j, value in self._row_items(i):
+                row[j] = value
+        return Matrix(*dense_m, storage=storage)
+
+    # <!-- complex operations -->
+
+    def solve_for_x(self, vector_b):
+        """(SparseMatrix, Vector) -> Vector
+
+        Returns the vector x given the vector b, such that the following
+        equation is satisfied:
+            Ax = b
+        Square non-singular systems are solved by sparse Gaussian
+        elimination, picking the pivot row with the fewest entries in each
+        column to limit fill-in. Any other system is solved as a Matrix.
+
+        REQ: len(vector_b) == self.rows()
+        """
+        if self._rows != vector_b.dimension():
+            err_msg = "vector must have same dimensions as this matrix's rows"
+            raise MatrixDimensionError(err_msg)
+        if self._rows != self._cols:
+            return self.to_matrix().solve_for_x(vector_b)
+        rows = self._row_dicts()
+        rhs = list(vector_b)
+        # rows (not yet used as pivots) with an entry in each column
+        col_rows = [set() for j in range(self._cols)]
+        for i, row in enumerate(rows):
+            for j in row:
+                col_rows[j].add(i)
+        pivots = list()
+        for k in range(self._cols):
+            if not col_rows[k]:
+                return self.to_matrix().solve_for_x(vector_b)
+            pivot = min(col_rows[k], key=lambda i: (len(rows[i]), i))
+            pivot_row = rows[pivot]
+            for j in pivot_row:
+                col_rows[j].discard(pivot)
+            for i in list(col_rows[k]):
+                row = rows[i]
+                factor = Fraction.divide(row[k], pivot_row[k])
+                for j, value in pivot_row.items():
+                    new_value = row.get(j, 0) - factor * value
+                    if new_value != 0 and j != k:
+                        if j not in row:
+                            col_rows[j].add(i)
+                        row[j] = new_value
+                    elif j in row:
+                        del row[j]
+                        col_rows[j].discard(i)
+                rhs[i] = rhs[i] - factor * rhs[pivot]
+            pivots.append((k, pivot))
+        solution = [0] * self._cols
+        for k, pivot in reversed(pivots):
+            pivot_row = rows[pivot]
+            total = rhs[pivot]
+            for j, value in pivot_row.items():
+                if j != k:
+                    total = total - value * solution[j]
+            solution[k] = Fraction.divide(total, pivot_row[k])
+        return Vector(*solution)
+
+
+def examples():
+    """() -> NoneType
+
+    Displays examples of sparse matrix operations.
+    """
+    mtx_a = SparseMatrix.from_coo(
+        4, 4, [(1, 1, 4), (1, 2, -1), (2, 2, 4), (2, 3, -1),
+               (3, 3, 4), (3, 4, -1), (4, 1, -1), (4, 4, 4)])
+    vtr_b = Vector(3, 3, 3, 3)
+
+    print("\nSparse matrix A:")
+    print(mtx_a)
+    print("\nNon-zero entries:")
+    print(mtx_a.to_coo())
+
+    print("\n> Sparse matrix operations")
+    print("-" * 40)
+    print("\nMatrix transpose A^T:")
+    print(mtx_a.transpose())
+    print("\nMatrix product A*A:")
+    print(mtx_a * mtx_a)
+
+    print("\n> Ax = b, solving for x")
+    print("-" * 40)
+    print("\nVector b:")
+    print(vtr_b)
+    print("\nResult vector x:")
+    print(mtx_a.solve_for_x(vtr_b))
+
+    print(
+        # end of examples
+    )
+
+
+if __name__ == "__main__":
+    examples()
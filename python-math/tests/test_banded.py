@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from banded_matrix import BandedMatrix
+from fraction import Fraction
+from matrix import Matrix, MatrixDimensionError, SingularMatrixError
+from vector import Vector
+
+
+def _random_banded(size, lower, upper, seed):
+    rng = random.Random(seed)
+    bands = [[rng.randint(-5, 5) for k in range(size - abs(offset))]
+             for offset in range(-lower, upper + 1)]
+    # a dominant diagonal keeps the matrix non-singular
+    bands[lower] = [20 + rng.randint(0, 5) for k in range(size)]
+    return BandedMatrix(size, lower, upper, bands)
+
+
+@pytest.mark.parametrize("bandwidth", [(1, 1), (2, 1), (0, 3), (3, 3)])
+def test_solve_and_determinant_match_dense(bandwidth):
+    banded = _random_banded(8, bandwidth[0], bandwidth[1], sum(bandwidth))
+    dense = banded.to_matrix()
+    vector = Vector(*range(-4, 4))
+    solution = banded.solve_for_x(vector)
+    assert solution == dense.solve_for_x(vector)
+    assert banded * solution == vector
+    assert banded.determinant() == dense.determinant()
+
+
+def test_float_solve():
+    banded = BandedMatrix.tridiagonal([1.0, 1.0, 1.0], [4.0, 4.0, 4.0, 4.0],
+                                      [1.0, 1.0, 1.0])
+    solution = banded.solve_for_x(Vector(1, 2, 3, 4))
+    assert all(isinstance(value, float) for value in solution)
+    assert list(banded * solution) == pytest.approx([1, 2, 3, 4])
+    exact = BandedMatrix.tridiagonal([1, 1, 1], [4, 4, 4, 4], [1, 1, 1])
+    assert list(exact.solve_for_x(Vector(1, 2, 3, 4), "float")) == \
+        pytest.approx(list(solution))
+
+
+def test_zero_pivot_falls_back_to_pivoting():
+    banded = BandedMatrix.tridiagonal([1, 1], [0, 0, 1], [1, 2])
+    dense = banded.to_matrix()
+    vector = Vector(1, 2, 3)
+    assert banded.solve_for_x(vector) == dense.solve_for_x(vector)
+    assert banded.determinant() == dense.determinant()
+
+
+def test_singular_banded_matrix():
+    banded = BandedMatrix.tridiagonal([1, 1], [1, 1, 1], [1, 0])
+    with pytest.raises(SingularMatrixError):
+        banded.solve_for_x(Vector(1, 2, 3))
+    assert banded.determinant() == 0
+
+
+def test_products_match_dense():
+    banded = _random_banded(6, 2, 1, 1)
+    dense = banded.to_matrix()
+    other = Matrix(*[[i - j for j in range(3)] for i in range(6)])
+    vector = Vector(*range(6))
+    assert banded * vector == dense * vector
+    assert banded * other == dense * other
+    assert other.transpose() * banded == other.transpose() * dense
+    assert banded * Fraction(1, 2) == dense * Fraction(1, 2)
+    assert 3 * banded == dense * 3
+    assert -banded == dense * -1
+
+
+def test_conversions_and_accessors():
+    dense = Matrix([2, 1, 0, 0], [3, 2, 1, 0], [4, 3, 2, 1], [0, 4, 3, 2])
+    banded = BandedMatrix.from_matrix(dense)
+    assert banded.bandwidth() == (2, 1)
+    assert banded.to_matrix() == dense
+    assert banded == dense and banded != dense * 2
+    assert banded.transpose().to_matrix() == dense.transpose()
+    assert banded.get(3, 1) == 4 and banded.get(1, 4) == 0
+    assert banded.diagonal(-2) == Vector(4, 4)
+    assert banded.diagonal(2) == Vector(0, 0)
+    wider = BandedMatrix.from_matrix(dense, 3, 2)
+    assert wider.bandwidth() == (3, 2) and wider == banded
+    assert banded.to_matrix("flat").storage() == "flat"
+
+
+def test_banded_errors():
+    with pytest.raises(ValueError):
+        BandedMatrix.from_matrix(Matrix([1, 0, 1], [0, 1, 0], [0, 0, 1]), 0, 1)
+    with pytest.raises(MatrixDimensionError):
+        BandedMatrix.from_matrix(Matrix([1, 2, 3]))
+    with pytest.raises(MatrixDimensionError):
+        BandedMatrix(3, 1, 1, [[1, 1], [1, 1, 1]])
+    with pytest.raises(MatrixDimensionError):
+        BandedMatrix(3, 1, 1, [[1, 1], [1, 1], [1, 1]])
+    with pytest.raises(MatrixDimensionError):
+        _random_banded(3, 1, 1, 0).solve_for_x(Vector(1, 2))
+    with pytest.raises(ValueError):
+        _random_banded(3, 1, 1, 0).solve_for_x(Vector(1, 2, 3), "fast")
@@ -0,0 +1,111 @@
+import random
+
+import pytest
+
+from block_matrix import BlockMatrix
+from fraction import Fraction
+from matrix import Matrix, MatrixDimensionError
+from vector import Vector
+
+A = Matrix([1, 2], [3, 4])
+B = Matrix([0, 1, 2], [1, 0, 3], [4, -3, 8])
+C = Matrix([2, 1], [1, 1])
+D = Matrix([1, 0, 1], [2, 1, 0], [0, 1, 1])
+
+
+def _naive_kron(left, right):
+    left_rows, right_rows = left._raw_rows(), right._raw_rows()
+    return Matrix(*[[a * b for a in left_row for b in right_row]
+                    for left_row in left_rows for right_row in right_rows])
+
+
+def _random_matrix(num_rows, num_cols, seed):
+    rng = random.Random(seed)
+    return Matrix(*[[rng.randint(-4, 4) for j in range(num_cols)]
+                    for i in range(num_rows)])
+
+
+def test_kron_matches_definition():
+    assert A.kron(B) == _naive_kron(A, B)
+    assert B.kron(A) == _naive_kron(B, A)
+    tall = Matrix([1], [2])
+    assert tall.kron(A) == Matrix([1, 2], [3, 4], [2, 4], [6, 8])
+    floats = Matrix([0.5, 1.0])
+    assert floats.kron(A) == _naive_kron(floats, A)
+    with pytest.raises(TypeError):
+        A.kron(2)
+
+
+def test_block_assembly():
+    matrix = Matrix.block([[A, None], [Matrix([5, 6]), Matrix([7])]])
+    assert matrix == Matrix([1, 2, 0], [3, 4, 0], [5, 6, 7])
+    flat = Matrix.block([[A.as_storage("flat"), A]])
+    assert flat.storage() == "flat"
+    assert flat == Matrix([1, 2, 1, 2], [3, 4, 3, 4])
+    with pytest.raises(MatrixDimensionError):
+        Matrix.block([[A, B]])
+
+
+def test_structured_kron_without_forming_it():
+    kron = BlockMatrix.kron(A, B)
+    dense = A.kron(B)
+    vector = Vector(*range(6))
+    assert kron.dimensions() == (6, 6)
+    assert kron.to_matrix() == dense
+    assert kron * vector == dense * vector
+    assert kron.get(4, 2) == dense._raw_rows()[3][1]
+    assert kron.determinant() == dense.determinant()
+    assert kron.solve_for_x(vector) == dense.solve_for_x(vector)
+    assert kron.transpose().to_matrix() == dense.transpose()
+    triple = BlockMatrix.kron(A, C, Matrix([2]))
+    assert triple.to_matrix() == A.kron(C).kron(Matrix([2]))
+
+
+def test_mixed_product_property():
+    product = BlockMatrix.kron(A, B) * BlockMatrix.kron(C, D)
+    assert isinstance(product, BlockMatrix)
+    assert product.to_matrix() == (A * C).kron(B * D)
+    other = _random_matrix(6, 2, 1)
+    assert BlockMatrix.kron(A, B) * other == A.kron(B) * other
+    assert other.transpose() * BlockMatrix.kron(A, B) == \
+        other.transpose() * A.kron(B)
+    assert (BlockMatrix.kron(A, B) * Fraction(1, 2)).to_matrix() == \
+        A.kron(B) * Fraction(1, 2)
+
+
+def test_block_triangular_solve_and_determinant():
+    blocks = BlockMatrix([[A, None], [_random_matrix(3, 2, 2), B]])
+    dense = blocks.to_matrix()
+    vector = Vector(1, -2, 3, 0, 5)
+    assert blocks.determinant() == dense.determinant()
+    assert blocks.solve_for_x(vector) == dense.solve_for_x(vector)
+    upper = BlockMatrix([[A, _random_matrix(2, 3, 3)], [None, B]])
+    assert upper.solve_for_x(vector) == upper.to_matrix().solve_for_x(vector)
+    diagonal = BlockMatrix.diagonal(A, B, C)
+    assert diagonal.determinant() == \
+        A.determinant() * B.determinant() * C.determinant()
+
+
+def test_block_products_skip_zero_blocks():
+    left = BlockMatrix([[A, None], [None, B]])
+    right = BlockMatrix([[C, _random_matrix(2, 3, 4)], [None, D]])
+    product = left * right
+    assert product.to_matrix() == left.to_matrix() * right.to_matrix()
+    vector = Vector(*range(5))
+    assert left * vector == left.to_matrix() * vector
+    general = BlockMatrix([[A, _random_matrix(2, 3, 5)],
+                           [_random_matrix(3, 2, 6), B]])
+    assert general.solve_for_x(vector) == \
+        general.to_matrix().solve_for_x(vector)
+
+
+def test_block_errors():
+    kron = BlockMatrix.kron(A, B)
+    with pytest.raises(MatrixDimensionError):
+        kron * Vector(1, 2)
+    with pytest.raises(MatrixDimensionError):
+        kron * _random_matrix(2, 2, 7)
+    with pytest.raises(MatrixDimensionError):
+        BlockMatrix.kron(A, Matrix([1, 2, 3])).determinant()
+    with pytest.raises(ValueError):
+        BlockMatrix.kron(A)
@@ -0,0 +1,88 @@
+import pytest
+
+from fraction import Fraction
+from matrix import Matrix, MatrixDimensionError
+from vector import Vector
+
+SPD = [
+    [[4, 2], [2, 3]],
+    [[4, 12, -16], [12, 37, -43], [-16, -43, 98]],
+    [[2, -1, 0, 0], [-1, 2, -1, 0], [0, -1, 2, -1], [0, 0, -1, 2]],
+    [[Fraction(1, 2), Fraction(1, 3)], [Fraction(1, 3), 1]],
+]
+
+
+def _close(matrix_a, matrix_b):
+    for row_a, row_b in zip(matrix_a._raw_rows(), matrix_b._raw_rows()):
+        assert list(row_a) == pytest.approx([float(v) for v in row_b])
+
+
+@pytest.mark.parametrize("rows", SPD)
+def test_exact_ldl_rebuilds_the_matrix(rows):
+    matrix = Matrix(*rows)
+    lower, diagonal = matrix.ldl()
+    assert lower * diagonal * lower.transpose() == matrix
+    assert all(lower._raw_rows()[i][i] == 1 for i in range(len(rows)))
+    assert all(lower._raw_rows()[i][j] == 0
+               for i in range(len(rows)) for j in range(i + 1, len(rows)))
+
+
+def test_ldl_of_indefinite_matrix():
+    matrix = Matrix([1, 2], [2, 1])
+    lower, diagonal = matrix.ldl()
+    assert lower * diagonal * lower.transpose() == matrix
+    assert diagonal == Matrix([1, 0], [0, -3])
+    with pytest.raises(ValueError):
+        matrix.cholesky()
+
+
+@pytest.mark.parametrize("rows", SPD)
+def test_cholesky_rebuilds_the_matrix(rows):
+    matrix = Matrix(*rows)
+    lower = matrix.cholesky()
+    _close(lower * lower.transpose(), matrix)
+    lower_rows = lower._raw_rows()
+    assert all(lower_rows[i][i] > 0 for i in range(len(rows)))
+    assert all(lower_rows[i][j] == 0
+               for i in range(len(rows)) for j in range(i + 1, len(rows)))
+
+
+def test_known_cholesky_factor():
+    lower = Matrix(*SPD[1]).cholesky()
+    _close(lower, Matrix([2, 0, 0], [6, 1, 0], [-8, 5, 3]))
+
+
+@pytest.mark.parametrize("rows", SPD)
+def test_spd_fast_path_agrees_with_lu(rows, monkeypatch):
+    matrix = Matrix(*rows)
+    vector = Vector(*range(1, len(rows) + 1))
+    expected_x = matrix.solve_for_x(vector, spd=False)
+    expected_det = matrix.determinant()
+    calls = list()
+    ldl_decompose = Matrix._ldl_decompose
+
+    def recording(rows, tolerance=None):
+        calls.append(tolerance)
+        return ldl_decompose(rows, tolerance)
+    monkeypatch.setattr(Matrix, "_ldl_decompose", staticmethod(recording))
+    Matrix.clear_shared_cache()
+    fresh = Matrix(*rows)
+    assert fresh.solve_for_x(vector, spd=True) == expected_x
+    assert fresh.determinant(spd=True) == expected_det
+    assert calls
+    floats = Matrix(*[[float(v) for v in row] for row in rows])
+    assert list(floats.solve_for_x(vector)) == pytest.approx(
+        [float(v) for v in expected_x])
+
+
+def test_spd_errors():
+    with pytest.raises(ValueError):
+        Matrix([1, 2], [3, 4]).cholesky()
+    with pytest.raises(ValueError):
+        Matrix([1, 2], [3, 4]).ldl()
+    with pytest.raises(ValueError):
+        Matrix([0, 1], [1, 0]).ldl()
+    with pytest.raises(ValueError):
+        Matrix([1, 2], [2, 1]).solve_for_x(Vector(1, 1), spd=True)
+    with pytest.raises(MatrixDimensionError):
+        Matrix([1, 2, 3]).cholesky()
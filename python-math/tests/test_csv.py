@@ -0,0 +1,44 @@
+import io
+
+import pytest
+
+import matrix_io
+from fraction import Fraction
+from matrix import Matrix
+from matrix_storage import FlatStorage
+
+TEXTS = [
+    "1,2\n3,4\n",
+    "1,2\n1.5,2.5\n",
+    "1,2\n1.5,2.5\n1/2,3\n",
+    "1.5,2\n1/2,3\n",
+    "1/2,3\n1.5,2\n",
+    "1.5,7\n3,4\n99999999999999999999,1\n",
+]
+
+
+def _expected(text):
+    values = [matrix_io._parse_number(token) for line in text.split()
+              for token in line.split(",")]
+    dtype = FlatStorage.infer_dtype(values)
+    return dtype, list(FlatStorage.make_buffer(values, dtype))
+
+
+@pytest.mark.parametrize("text", TEXTS)
+@pytest.mark.parametrize("chunk_rows", [1, 2, 1024])
+def test_read_csv_does_not_depend_on_chunk_rows(text, chunk_rows):
+    storage = matrix_io.read_csv(io.StringIO(text), chunk_rows=chunk_rows)
+    dtype, values = _expected(text)
+    assert storage.dtype() == dtype
+    buffer = list(storage.buffer())
+    assert buffer == values
+    assert [type(value) for value in buffer] == [type(value)
+                                                 for value in values]
+
+
+def test_from_csv_keeps_ints_exact():
+    text = "1,2\n1.5,2.5\n1/2,3\n"
+    for chunk_rows in (1, 1024):
+        matrix = Matrix.from_csv(io.StringIO(text), chunk_rows=chunk_rows)
+        assert matrix == Matrix([1, 2], [1.5, 2.5], [Fraction(1, 2), 3])
+        assert isinstance(matrix.get(1, 1), int)
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from fraction import Fraction
+from matrix import Matrix, MatrixDimensionError
+
+MATRICES = [
+    [[7]],
+    [[1, 2], [3, 4]],
+    [[0, 1, 2], [1, 0, 3], [4, -3, 8]],
+    [[0, 0, 1], [0, 1, 0], [1, 0, 0]],
+    [[1, 2, 3], [4, 5, 6], [7, 8, 9]],
+    [[0, 0], [0, 0]],
+    [[Fraction(1, 2), 1, 0], [2, Fraction(3, 4), 1], [1, 1, Fraction(-2, 3)]],
+]
+
+
+def _random_rows(size, seed):
+    rng = random.Random(seed)
+    return [[rng.randint(-20, 20) for j in range(size)] for i in range(size)]
+
+
+@pytest.mark.parametrize("rows", MATRICES + [_random_rows(n, n)
+                                             for n in range(2, 7)])
+def test_bareiss_matches_cofactor_expansion(rows):
+    matrix = Matrix(*rows)
+    expected = matrix.determinant("cofactor")
+    det = Matrix(*rows).determinant()
+    assert det == expected
+    assert type(det) is not float
+
+
+def test_bareiss_keeps_int_determinants_exact():
+    rows = [[10**12 + i * j for j in range(5)] for i in range(5)]
+    rows[0][0] += 1
+    matrix = Matrix(*rows)
+    assert matrix.determinant() == Matrix(*rows).determinant("cofactor")
+    assert isinstance(matrix.determinant(), int)
+
+
+def test_bareiss_does_not_modify_matrix():
+    rows = [[0, 1, 2], [1, 0, 3], [4, -3, 8]]
+    matrix = Matrix(*rows)
+    matrix.determinant()
+    assert matrix == Matrix(*rows)
+
+
+def test_minor_and_cofactor_methods_agree():
+    matrix = Matrix(*_random_rows(5, 1))
+    for i in range(1, 6):
+        for j in range(1, 6):
+            assert matrix.cofactor(i, j) == matrix.cofactor(i, j, "cofactor")
+
+
+def test_determinant_errors():
+    with pytest.raises(MatrixDimensionError):
+        Matrix([1, 2, 3], [4, 5, 6]).determinant()
+    with pytest.raises(ValueError):
+        Matrix([1, 2], [3, 4]).determinant("laplace")
@@ -0,0 +1,28 @@
+from complex_number import Complex
+from matrix import Matrix
+
+
+def setup_function():
+    Matrix.clear_shared_cache()
+
+
+def _close(values, expected):
+    values = sorted(values, key=lambda z: (z.real, z.imag))
+    return all(abs(value - expected_value) < 1e-9
+               for value, expected_value in zip(values, expected))
+
+
+def test_symmetric_matrix_of_complex_entries_is_not_hermitian():
+    rows = [[Complex(1, 1), 2], [2, Complex(0, 1)]]
+    assert _close(Matrix(*rows).eigenvalues(),
+                  [-1.5615528128088303 + 1j, 2.561552812808831 + 1j])
+
+
+def test_symmetric_matrix_of_builtin_complex_entries():
+    rows = [[1 + 1j, 2], [2, 1j]]
+    assert _close(Matrix(*rows).eigenvalues(),
+                  [-1.5615528128088303 + 1j, 2.561552812808831 + 1j])
+
+
+def test_real_symmetric_matrix():
+    assert _close(Matrix([2, 1], [1, 2]).eigenvalues(), [1.0, 3.0])
@@ -0,0 +1,39 @@
+from fraction import Fraction
+from matrix import Matrix
+
+
+def _equal_after_hashing(mtx_a, mtx_b):
+    before = mtx_a == mtx_b
+    hash(mtx_a)
+    hash(mtx_b)
+    return before, mtx_a == mtx_b
+
+
+def test_equal_fractions_in_different_terms():
+    assert _equal_after_hashing(Matrix([Fraction(1, 2), 1]),
+                                Matrix([Fraction(2, 4), 1])) == (True, True)
+
+
+def test_whole_fraction_equals_int():
+    assert _equal_after_hashing(Matrix([Fraction(4, 2), 1]),
+                                Matrix([2, 1])) == (True, True)
+
+
+def test_negative_fractions():
+    assert _equal_after_hashing(Matrix([Fraction(-2, 6)], [Fraction(3, -9)]),
+                                Matrix([Fraction(1, -3)], [Fraction(-1, 3)])
+                                ) == (True, True)
+
+
+def test_different_matrices_stay_different():
+    assert _equal_after_hashing(Matrix([Fraction(1, 2), 1]),
+                                Matrix([Fraction(1, 3), 1])) == (False, False)
+
+
+def test_added_row_keeps_hash_consistent():
+    mtx_a = Matrix([1, 2])
+    hash(mtx_a)
+    mtx_a = mtx_a.add_row([Fraction(6, 2), Fraction(2, 4)])
+    mtx_b = Matrix([1, 2], [3, Fraction(1, 2)])
+    assert hash(mtx_a) == hash(mtx_b)
+    assert mtx_a == mtx_b
@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from fraction import Fraction
+from matrix import Matrix, MatrixDimensionError, SingularMatrixError
+from vector import Vector
+
+MATRICES = [
+    [[1, 1, 1], [0, 2, 5], [2, 5, -1]],
+    [[0, 1, 2], [1, 0, 3], [4, -3, 8]],
+    [[Fraction(1, 2), 1], [2, Fraction(3, 4)]],
+]
+
+
+def _random_vectors(size, count, seed):
+    rng = random.Random(seed)
+    return [Vector(*[rng.randint(-9, 9) for i in range(size)])
+            for k in range(count)]
+
+
+@pytest.mark.parametrize("rows", MATRICES)
+def test_factors_multiply_back(rows):
+    matrix = Matrix(*rows)
+    factorization = matrix.factorize()
+    assert factorization.size() == len(rows)
+    assert factorization.permutation() * matrix == \
+        factorization.lower() * factorization.upper()
+    assert factorization.determinant() == matrix.determinant()
+
+
+@pytest.mark.parametrize("rows", MATRICES)
+def test_solve_many_matches_solve_for_x(rows):
+    matrix = Matrix(*rows)
+    factorization = matrix.factorize()
+    vectors = _random_vectors(len(rows), 5, len(rows))
+    solutions = factorization.solve_many(vectors)
+    assert solutions == [matrix.solve_for_x(vector) for vector in vectors]
+    assert solutions == [factorization.solve(vector) for vector in vectors]
+    for solution, vector in zip(solutions, vectors):
+        assert matrix * solution == vector
+    assert factorization.solve_many([]) == []
+
+
+def test_float_factorization_solves_floats():
+    matrix = Matrix([4.0, 1.0, 2.0], [1.0, 3.0, 0.5], [2.0, 0.5, 5.0])
+    factorization = matrix.factorize()
+    vectors = [Vector(1.0, 2.0, 3.0), Vector(-1, 0, 2)]
+    for solution, vector in zip(factorization.solve_many(vectors), vectors):
+        residual = matrix * solution
+        assert list(residual) == pytest.approx(list(vector))
+
+
+def test_factorization_is_cached():
+    matrix = Matrix(*MATRICES[0])
+    assert matrix.factorize() is matrix.factorize()
+    assert matrix.factorize("float") is not matrix.factorize()
+
+
+def test_factorize_errors():
+    with pytest.raises(MatrixDimensionError):
+        Matrix([1, 2, 3], [4, 5, 6]).factorize()
+    with pytest.raises(SingularMatrixError):
+        Matrix([1, 2], [2, 4]).factorize()
+    factorization = Matrix([1, 2], [3, 4]).factorize()
+    with pytest.raises(MatrixDimensionError):
+        factorization.solve(Vector(1, 2, 3))
+    with pytest.raises(MatrixDimensionError):
+        factorization.solve_many([Vector(1, 2), Vector(1, 2, 3)])
@@ -0,0 +1,40 @@
+from fraction import Fraction
+from matrix import Matrix
+
+
+def _whole_fractions():
+    # whole entries written as unreduced Fractions
+    return Matrix([Fraction(3, 3), 2], [3, Fraction(4, 2)])
+
+
+def test_float_of_whole_fraction():
+    assert float(Fraction(3, 3)) == 1.0
+    assert float(Fraction(-8, 2)) == -4.0
+    assert float(Fraction(1, 4)) == 0.25
+
+
+def test_float_rank_and_rref():
+    matrix = _whole_fractions()
+    assert matrix.rank("float") == 2
+    assert matrix.reduced_row_echelon_form("float") == Matrix([1, 0], [0, 1])
+
+
+def test_float_determinant_and_solve():
+    matrix = _whole_fractions()
+    assert abs(matrix.determinant(arithmetic="float") + 4.0) < 1e-12
+    x = matrix.solve_for_x(matrix * Matrix([1], [1]).column_vector(1),
+                           "float")
+    assert all(abs(value - 1.0) < 1e-12 for value in x)
+
+
+def test_qr_and_eigenvalues():
+    matrix = _whole_fractions()
+    q, r = matrix.qr()
+    product = q * r
+    for i in range(2):
+        for j in range(2):
+            assert abs(product.get(i, j, True) -
+                       float(matrix.get(i, j, True))) < 1e-12
+    values = sorted(Matrix([Fraction(4, 2), Fraction(2, 2)],
+                           [Fraction(1, 1), Fraction(6, 3)]).eigenvalues())
+    assert abs(values[0] - 1.0) < 1e-9 and abs(values[1] - 3.0) < 1e-9
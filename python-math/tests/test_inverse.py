@@ -0,0 +1,72 @@
+import pytest
+
+from fraction import Fraction
+from matrix import Matrix, SingularMatrixError
+
+MATRICES = [
+    [[1, 2], [3, 4]],
+    [[2, 1, 0], [1, 2, 1], [0, 1, 2]],
+    [[0, 1, 2], [1, 0, 3], [4, -3, 8]],
+    [[Fraction(1, 2), 1], [2, Fraction(3, 4)]],
+]
+SINGULAR = [
+    [[1, 2], [2, 4]],
+    [[1, 2, 3], [4, 5, 6], [7, 8, 9]],
+    [[1, 1, 1], [1, 1, 1], [1, 1, 1]],
+    [[0, 1, 0], [0, 0, 1], [0, 0, 0]],
+    [[0, 0], [0, 0]],
+]
+
+
+def _cofactor_adjugate(matrix):
+    size = matrix.rows()
+    return Matrix(*[[matrix.cofactor(i+1, j+1) for j in range(size)]
+                    for i in range(size)]).transpose()
+
+
+@pytest.mark.parametrize("rows", MATRICES)
+def test_inverse_times_matrix_is_identity(rows):
+    matrix = Matrix(*rows)
+    identity = Matrix.identity(len(rows))
+    assert matrix * matrix.inverse() == identity
+    assert matrix.inverse() * matrix == identity
+
+
+def test_float_inverse():
+    matrix = Matrix([4.0, 7.0], [2.0, 6.0])
+    product = matrix * matrix.inverse()
+    for i in range(2):
+        for j in range(2):
+            assert abs(product.get(i, j, True) - (i == j)) < 1e-12
+
+
+@pytest.mark.parametrize("rows", SINGULAR)
+def test_singular_inverse_raises(rows):
+    with pytest.raises(SingularMatrixError):
+        Matrix(*rows).inverse()
+
+
+@pytest.mark.parametrize("rows", MATRICES + SINGULAR)
+def test_adjugate_matches_cofactors(rows):
+    matrix = Matrix(*rows)
+    assert matrix.adjugate() == _cofactor_adjugate(matrix)
+
+
+@pytest.mark.parametrize("rows", MATRICES + SINGULAR)
+def test_float_adjugate_matches_cofactors(rows):
+    adjugate = Matrix(*rows).adjugate("float")
+    expected = _cofactor_adjugate(Matrix(*rows))
+    for row, expected_row in zip(adjugate, expected):
+        for value, expected_value in zip(row, expected_row):
+            assert abs(value - float(expected_value)) < 1e-9
+
+
+def test_adjugate_keeps_storage():
+    flat = Matrix([1.0, 2.0], [3.0, 4.0], storage="flat")
+    assert flat.adjugate().storage() == "flat"
+    assert flat.adjugate().dtype() == "float"
+    assert Matrix([5], storage="flat").adjugate().storage() == "flat"
+    assert Matrix([1, 2], [2, 4], storage="flat").adjugate().storage() == (
+        "flat")
+    assert Matrix([0, 0], [0, 0], storage="flat").adjugate().storage() == (
+        "flat")
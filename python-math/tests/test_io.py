@@ -0,0 +1,94 @@
+import pytest
+
+import numpy_backend
+from complex_number import Complex
+from fraction import Fraction
+from matrix import Matrix
+
+MATRICES = [
+    [[1, -2, 3], [4, 5, -6]],
+    [[1.5, -2.25], [1e300, -0.0], [3.0, 4.0]],
+    [[Fraction(1, 3), 2], [-5, Fraction(-7, 4)]],
+    [[2**62, -2**62]],
+]
+
+needs_numpy = pytest.mark.skipif(not numpy_backend.available(),
+                                 reason="NumPy is not installed")
+
+
+@pytest.mark.parametrize("rows", MATRICES)
+@pytest.mark.parametrize("storage", ["list", "flat"])
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_load_round_trip(tmp_path, rows, storage, mmap):
+    path = str(tmp_path / "matrix.npy")
+    matrix = Matrix(*rows, storage=storage)
+    matrix.save(path)
+    loaded = Matrix.load(path, mmap)
+    assert loaded == matrix
+    assert loaded.storage() == "flat"
+    assert loaded.dtype() == matrix.dtype()
+    assert loaded.transpose() == matrix.transpose()
+    assert loaded * 2 == matrix * 2
+
+
+def test_save_strided_view(tmp_path):
+    path = str(tmp_path / "transpose.npy")
+    matrix = Matrix([1, 2, 3], [4, 5, 6], storage="flat")
+    matrix.transpose().save(path)
+    assert Matrix.load(path) == Matrix([1, 4], [2, 5], [3, 6])
+
+
+def test_header_is_aligned(tmp_path):
+    path = tmp_path / "matrix.npy"
+    Matrix([1.0, 2.0]).save(str(path))
+    data = path.read_bytes()
+    header_length = int.from_bytes(data[8:10], "little")
+    assert data[:6] == b"\x93NUMPY"
+    assert (10 + header_length) % 64 == 0
+    assert len(data) == 10 + header_length + 16
+
+
+@needs_numpy
+def test_numpy_reads_saved_matrices(tmp_path):
+    import numpy
+    path = str(tmp_path / "matrix.npy")
+    Matrix(*MATRICES[1]).save(path)
+    assert numpy.load(path).tolist() == MATRICES[1]
+    Matrix(*MATRICES[2]).save(path)
+    pairs = numpy.load(path)
+    assert pairs["numerator"].tolist() == [[1, 2], [-5, -7]]
+    assert pairs["denominator"].tolist() == [[3, 1], [1, 4]]
+
+
+@needs_numpy
+@pytest.mark.parametrize("order", ["C", "F"])
+def test_load_numpy_files(tmp_path, order):
+    import numpy
+    path = str(tmp_path / "array.npy")
+    array = numpy.array([[1, 2, 3], [4, 5, 6]], dtype="<i8", order=order)
+    numpy.save(path, array)
+    assert Matrix.load(path) == Matrix([1, 2, 3], [4, 5, 6])
+
+
+@needs_numpy
+def test_load_rejects_other_arrays(tmp_path):
+    import numpy
+    path = str(tmp_path / "array.npy")
+    numpy.save(path, numpy.zeros((2, 2, 2)))
+    with pytest.raises(ValueError):
+        Matrix.load(path)
+    numpy.save(path, numpy.zeros((2, 2), dtype="<i4"))
+    with pytest.raises(ValueError):
+        Matrix.load(path)
+
+
+def test_save_and_load_errors(tmp_path):
+    path = str(tmp_path / "matrix.npy")
+    with pytest.raises(ValueError):
+        Matrix([Complex(1, 2), 1]).save(path)
+    with pytest.raises(ValueError):
+        Matrix([Fraction(2**70, 3), 1]).save(path)
+    with open(path, "wb") as file:
+        file.write(b"not a matrix")
+    with pytest.raises(ValueError):
+        Matrix.load(path)
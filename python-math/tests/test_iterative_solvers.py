@@ -0,0 +1,59 @@
+import pytest
+
+from iterative_solvers import conjugate_gradient, gauss_seidel, jacobi
+from matrix import ConvergenceError, Matrix
+from sparse_matrix import SparseMatrix
+from vector import Vector
+
+MATRIX = Matrix([4, -1, 0], [-1, 4, -1], [0, -1, 4])
+VECTOR_B = Vector(2, 4, 10)
+EXPECTED = [1.0, 2.0, 3.0]
+
+
+class Tridiagonal(object):
+    """An operator that only knows its product with a vector."""
+
+    def __mul__(self, vector):
+        x = list(vector)
+        return Vector(4 * x[0] - x[1], -x[0] + 4 * x[1] - x[2],
+                      -x[1] + 4 * x[2])
+
+
+def _close(vector, expected=EXPECTED, tolerance=1e-8):
+    return all(abs(value - expected_value) < tolerance
+               for value, expected_value in zip(vector, expected))
+
+
+@pytest.mark.parametrize("solver", [conjugate_gradient, jacobi,
+                                    gauss_seidel])
+@pytest.mark.parametrize("matrix", [MATRIX, SparseMatrix.from_matrix(MATRIX)])
+def test_solvers_on_matrices(solver, matrix):
+    assert _close(solver(matrix, VECTOR_B))
+
+
+def test_conjugate_gradient_on_operator():
+    assert _close(conjugate_gradient(Tridiagonal(), VECTOR_B))
+
+
+def test_jacobi_on_operator_with_diagonal():
+    iterations = list()
+    x = jacobi(Tridiagonal(), VECTOR_B, diagonal=[4, 4, 4],
+               callback=lambda k, x, norm: iterations.append(norm))
+    assert _close(x)
+    assert _close(x, jacobi(MATRIX, VECTOR_B))
+    assert iterations == sorted(iterations, reverse=True)
+
+
+def test_operator_without_diagonal_is_rejected():
+    with pytest.raises(TypeError):
+        jacobi(Tridiagonal(), VECTOR_B)
+    with pytest.raises(TypeError):
+        gauss_seidel(Tridiagonal(), VECTOR_B)
+
+
+def test_no_convergence_raises():
+    diverging = Matrix([1, 3], [3, 1])
+    with pytest.raises(ConvergenceError):
+        jacobi(diverging, Vector(1, 1), max_iterations=20)
+    with pytest.raises(ConvergenceError):
+        jacobi(diverging, Vector(1, 1), max_iterations=20, diagonal=[1, 1])
@@ -0,0 +1,89 @@
+import pytest
+
+from matrix import Matrix
+
+
+@pytest.fixture
+def lazy():
+    Matrix.LAZY = True
+    yield
+    Matrix.LAZY = False
+
+
+@pytest.fixture
+def products(monkeypatch):
+    counter = [0]
+    multiply = Matrix._multiply
+
+    def counting(self, other):
+        if isinstance(other, Matrix):
+            counter[0] += 1
+        return multiply(self, other)
+    monkeypatch.setattr(Matrix, "_multiply", counting)
+    return counter
+
+
+def test_power_takes_log_products_when_lazy(lazy, products):
+    mtx_a = Matrix([1, 1], [1, 0])
+    result = mtx_a.power(64, cache=False)
+    assert products[0] == 6
+    assert result.get(1, 2) == 10610209857723
+
+
+def test_power_matches_eager_when_lazy(lazy):
+    mtx_a = Matrix([2, 1], [1, 3])
+    lazy_result = mtx_a.power(13, cache=False)
+    Matrix.LAZY = False
+    assert lazy_result == mtx_a.power(13, cache=False)
+
+
+def test_shared_product_is_computed_once(lazy, products):
+    mtx_a = Matrix([1, 2], [3, 4])
+    square = mtx_a * mtx_a
+    fourth = square * square
+    eighth = fourth * fourth
+    assert products[0] == 0
+    expected = [[1, 2], [3, 4]]
+    for i in range(3):
+        expected = [[sum(a * b for a, b in zip(row, col))
+                     for col in zip(*expected)] for row in expected]
+    assert eighth.evaluate() == Matrix(*expected)
+    assert products[0] == 3
+
+
+def test_shared_product_in_a_sum(lazy, products):
+    mtx_a = Matrix([1, 2], [3, 4])
+    square = mtx_a * mtx_a
+    total = square + square.transpose() + 2 * square
+    assert total.evaluate() == Matrix([28, 45], [55, 88])
+    assert products[0] == 1
+
+
+def test_library_methods_return_matrices_when_lazy(lazy):
+    from banded_matrix import BandedMatrix
+    from block_matrix import BlockMatrix
+    from complex_matrix import ComplexMatrix
+    from sparse_matrix import SparseMatrix
+
+    unitary = ComplexMatrix([1j, 0], [0, 1])
+    assert unitary.is_unitary()
+    assert unitary.is_normal()
+    assert not ComplexMatrix([1, 1], [0, 1]).is_normal()
+
+    mtx_a = Matrix([2, 1, 0], [1, 2, 1], [0, 1, 2])
+    banded = BandedMatrix.from_matrix(mtx_a)
+    assert isinstance(banded * mtx_a, Matrix)
+    assert isinstance(mtx_a * banded, Matrix)
+
+    sparse = SparseMatrix.from_matrix(mtx_a)
+    assert isinstance(sparse - mtx_a, Matrix)
+
+    block = BlockMatrix.kron(Matrix([1, 2], [3, 4]), Matrix([0, 1], [1, 0]))
+    assert isinstance(block * Matrix.identity(4), Matrix)
+    assert isinstance(Matrix.identity(4) * block, Matrix)
+
+    Matrix.LAZY = False
+    assert banded * mtx_a == mtx_a * mtx_a
+    assert mtx_a * banded == mtx_a * mtx_a
+    assert sparse - mtx_a == Matrix.zero(3)
+    assert block * Matrix.identity(4) == block.to_matrix()
@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+import matrix_modular
+import numpy_backend
+from matrix import Matrix
+
+
+def _random_rows(num_rows, num_cols, bits, seed):
+    rng = random.Random(seed)
+    bound = 1 << bits
+    return [[rng.randint(-bound, bound) for j in range(num_cols)]
+            for i in range(num_rows)]
+
+
+def _deficient_rows(size, deficiency, bits, seed):
+    rows = _random_rows(size - deficiency, size, bits, seed)
+    return rows + [[sum(row[j] for row in rows[k:k+2]) for j in range(size)]
+                   for k in range(deficiency)]
+
+
+@pytest.fixture
+def small_threshold(monkeypatch):
+    monkeypatch.setattr(Matrix, "MODULAR_THRESHOLD", 4)
+    Matrix.clear_shared_cache()
+    yield
+    Matrix.clear_shared_cache()
+
+
+@pytest.mark.parametrize("bits", [4, 70])
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_modular_determinant_matches_bareiss(bits, use_numpy):
+    if use_numpy and not numpy_backend.available():
+        pytest.skip("NumPy is not installed")
+    rows = _random_rows(12, 12, bits, bits)
+    expected = Matrix._bareiss_determinant([list(row) for row in rows])
+    assert matrix_modular.determinant(rows, 0, use_numpy) == expected
+
+
+def test_modular_determinant_of_singular_matrix_is_zero():
+    rows = _deficient_rows(10, 1, 70, 3)
+    assert matrix_modular.determinant(rows, 0, False) == 0
+
+
+@pytest.mark.parametrize("deficiency", [0, 1, 3])
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_modular_rank_matches_bareiss(deficiency, use_numpy):
+    if use_numpy and not numpy_backend.available():
+        pytest.skip("NumPy is not installed")
+    rows = _deficient_rows(10, deficiency, 70, deficiency)
+    rank = matrix_modular.rank(rows, use_numpy)
+    assert rank in (None, 10 - deficiency)
+    assert Matrix._bareiss_rank([list(row) for row in rows]) == \
+        10 - deficiency
+
+
+@pytest.mark.parametrize("shape", [(6, 9), (9, 6), (7, 7)])
+def test_bareiss_rank_matches_rref(shape):
+    rows = _random_rows(shape[0], shape[1], 3, sum(shape))
+    rows[-1] = [a - 2 * b for a, b in zip(rows[0], rows[1])]
+    matrix = Matrix(*rows)
+    assert Matrix._bareiss_rank([list(row) for row in rows]) == \
+        len(matrix._pivot_columns(None, None))
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_rank_and_determinant_share_the_backend_gating(
+        small_threshold, monkeypatch, use_numpy):
+    if use_numpy and not numpy_backend.available():
+        pytest.skip("NumPy is not installed")
+    monkeypatch.setattr(Matrix, "USE_NUMPY", use_numpy)
+    calls = []
+    for name in ("rank", "determinant"):
+        original = getattr(matrix_modular, name)
+        monkeypatch.setattr(matrix_modular, name,
+                            lambda *args, _f=original, _n=name:
+                            calls.append(_n) or _f(*args))
+    rows = _random_rows(6, 6, 70, 6)
+    matrix = Matrix(*rows)
+    expected = Matrix._bareiss_determinant([list(row) for row in rows])
+    assert matrix.determinant() == expected
+    assert matrix.rank() == 6
+    assert sorted(calls) == (["determinant", "rank"] if use_numpy else [])
+
+
+def test_rank_of_large_int_matrix(small_threshold):
+    rows = _deficient_rows(8, 2, 70, 8)
+    matrix = Matrix(*rows)
+    assert matrix.rank() == 6
+    assert matrix.determinant() == 0
@@ -0,0 +1,95 @@
+import random
+
+import pytest
+
+from fraction import Fraction
+from matrix import Matrix, MatrixDimensionError
+from vector import Vector
+
+
+def _random_rows(num_rows, num_cols, seed):
+    rng = random.Random(seed)
+    return [[rng.randint(-9, 9) for j in range(num_cols)]
+            for i in range(num_rows)]
+
+
+def _naive_product(rows_a, rows_b):
+    return [[sum(rows_a[i][k] * rows_b[k][j] for k in range(len(rows_b)))
+             for j in range(len(rows_b[0]))] for i in range(len(rows_a))]
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 64])
+@pytest.mark.parametrize("shape", [(1, 1, 1), (5, 3, 7), (7, 7, 7),
+                                   (4, 9, 2)])
+def test_tiled_product_matches_naive_product(block_size, shape):
+    rows_a = _random_rows(shape[0], shape[1], 1)
+    rows_b = _random_rows(shape[1], shape[2], 2)
+    assert Matrix._multiply_rows(rows_a, rows_b, block_size) == \
+        _naive_product(rows_a, rows_b)
+
+
+def test_product_with_small_tiles(monkeypatch):
+    monkeypatch.setattr(Matrix, "BLOCK_SIZE", 2)
+    rows_a = _random_rows(5, 4, 3)
+    rows_b = _random_rows(4, 3, 4)
+    product = Matrix(*rows_a) * Matrix(*rows_b)
+    assert product == Matrix(*_naive_product(rows_a, rows_b))
+
+
+def test_product_of_mixed_entries():
+    matrix_a = Matrix([Fraction(1, 2), 2], [0.5, 1])
+    matrix_b = Matrix([2, 0], [1, Fraction(1, 3)])
+    assert matrix_a * matrix_b == Matrix([3, Fraction(2, 3)],
+                                         [2, Fraction(1, 3)])
+
+
+def test_matrix_vector_and_scalar_products():
+    matrix = Matrix([1, 2, 3], [4, 5, 6])
+    assert matrix * Vector(1, 0, -1) == Vector(-2, -2)
+    assert matrix * 2 == Matrix([2, 4, 6], [8, 10, 12])
+
+
+def test_product_dimension_errors():
+    with pytest.raises(MatrixDimensionError):
+        Matrix([1, 2], [3, 4]) * Matrix([1, 2, 3])
+    with pytest.raises(MatrixDimensionError):
+        Matrix([1, 2], [3, 4]) * Vector(1, 2, 3)
+
+
+@pytest.mark.parametrize("threshold", [1, 2, 3])
+@pytest.mark.parametrize("shape", [(4, 4, 4), (5, 7, 3), (8, 8, 8),
+                                   (9, 6, 11)])
+def test_strassen_matches_naive_product(threshold, shape):
+    rows_a = _random_rows(shape[0], shape[1], 5)
+    rows_b = _random_rows(shape[1], shape[2], 6)
+    assert Matrix._strassen_rows(rows_a, rows_b, threshold) == \
+        _naive_product(rows_a, rows_b)
+
+
+def test_strassen_with_fractions():
+    rows_a = [[Fraction(i + 1, j + 2) for j in range(5)] for i in range(5)]
+    rows_b = [[Fraction(j - i, 3) for j in range(5)] for i in range(5)]
+    assert Matrix._strassen_rows(rows_a, rows_b, 2) == \
+        _naive_product(rows_a, rows_b)
+
+
+def test_product_switches_to_strassen(monkeypatch):
+    calls = list()
+    strassen = Matrix._strassen_rows
+
+    def recording(rows_a, rows_b, threshold):
+        calls.append((len(rows_a), len(rows_b), len(rows_b[0])))
+        return strassen(rows_a, rows_b, threshold)
+    monkeypatch.setattr(Matrix, "_strassen_rows", staticmethod(recording))
+    monkeypatch.setattr(Matrix, "STRASSEN_THRESHOLD", 4)
+    rows_a = _random_rows(6, 5, 7)
+    rows_b = _random_rows(5, 4, 8)
+    assert Matrix(*rows_a) * Matrix(*rows_b) == \
+        Matrix(*_naive_product(rows_a, rows_b))
+    assert calls and calls[0] == (6, 5, 4)
+    calls.clear()
+    Matrix(*_random_rows(3, 5, 9)) * Matrix(*rows_b)
+    assert not calls
+    monkeypatch.setattr(Matrix, "STRASSEN_THRESHOLD", None)
+    Matrix(*rows_a) * Matrix(*rows_b)
+    assert not calls
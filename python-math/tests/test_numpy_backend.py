@@ -0,0 +1,81 @@
+import random
+
+import pytest
+
+import numpy_backend
+from matrix import Matrix
+from vector import Vector
+
+pytestmark = pytest.mark.skipif(not numpy_backend.available(),
+                                reason="NumPy is not installed")
+
+
+def _random_rows(num_rows, num_cols, seed):
+    rng = random.Random(seed)
+    return [[rng.uniform(-2, 2) for j in range(num_cols)]
+            for i in range(num_rows)]
+
+
+def _both_backends(monkeypatch, compute):
+    results = list()
+    for use_numpy in (False, True):
+        monkeypatch.setattr(Matrix, "USE_NUMPY", use_numpy)
+        Matrix.clear_shared_cache()
+        results.append(compute())
+    Matrix.clear_shared_cache()
+    return results
+
+
+def _plain(value):
+    if isinstance(value, Matrix):
+        return [_plain(v) for row in value._raw_rows() for v in row]
+    if isinstance(value, Vector):
+        return [_plain(v) for v in value]
+    return value
+
+
+def _assert_plain_close(value, expected):
+    plain = _plain(value)
+    assert plain == pytest.approx(_plain(expected))
+    for entry in plain if isinstance(plain, list) else [plain]:
+        assert type(entry) in (int, float)
+
+
+@pytest.mark.parametrize("storage", ["list", "flat"])
+def test_float_kernels_match_pure_python(monkeypatch, storage):
+    rows = _random_rows(6, 6, 1)
+    vector = Vector(*[1.5, -2.0, 0.25, 3.0, 1.0, -1.0])
+    operations = [
+        lambda m: m * m,
+        lambda m: m * vector,
+        lambda m: m.transpose(),
+        lambda m: m.rank(),
+        lambda m: m.determinant(),
+        lambda m: m.inverse(),
+        lambda m: m.solve_for_x(vector),
+    ]
+    for operation in operations:
+        python, numpy = _both_backends(
+            monkeypatch,
+            lambda: operation(Matrix(*rows, storage=storage)))
+        _assert_plain_close(numpy, python)
+
+
+def test_int_float_product_and_singular_matrix(monkeypatch):
+    ints = Matrix([1, 2, 3], [4, 5, 6], [7, 8, 9])
+    floats = Matrix(*_random_rows(3, 2, 2))
+    python, numpy = _both_backends(monkeypatch, lambda: ints * floats)
+    _assert_plain_close(numpy, python)
+    singular = Matrix([1.0, 2.0], [2.0, 4.0])
+    python, numpy = _both_backends(
+        monkeypatch, lambda: (singular.rank(), singular.determinant()))
+    assert numpy == python == (1, 0.0)
+
+
+def test_flat_storage_is_viewed_in_place():
+    matrix = Matrix(*_random_rows(4, 3, 3), storage="flat")
+    array = numpy_backend.to_array(matrix._mtx)
+    transposed = numpy_backend.to_array(matrix.transpose()._mtx)
+    assert array.tolist() == matrix._raw_rows()
+    assert transposed.tolist() == matrix.transpose()._raw_rows()
+    assert not array.flags.owndata
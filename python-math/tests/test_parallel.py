@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+import matrix_parallel
+from fraction import Fraction
+from matrix import Matrix, SingularMatrixError
+
+
+@pytest.fixture
+def workers(monkeypatch):
+    monkeypatch.setattr(Matrix, "PARALLEL_WORKERS", 2)
+    monkeypatch.setattr(Matrix, "PARALLEL_THRESHOLD", 4)
+    monkeypatch.setattr(matrix_parallel, "PANEL_COLUMNS", 3)
+    Matrix.clear_shared_cache()
+    yield
+    Matrix.shutdown_workers()
+    Matrix.clear_shared_cache()
+
+
+def _random_rows(size, seed):
+    rng = random.Random(seed)
+    return [[rng.uniform(-1, 1) for j in range(size)] for i in range(size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 12])
+def test_blocked_lu_matches_serial_lu(size, monkeypatch):
+    rows = _random_rows(size, size)
+    lu, perm, sign = Matrix._lu_decompose([list(row) for row in rows], 1e-12)
+    for panel in (1, 3, 5, 32):
+        monkeypatch.setattr(matrix_parallel, "PANEL_COLUMNS", panel)
+        par_lu, par_perm, par_sign = matrix_parallel.lu_decompose(
+            [list(row) for row in rows], 1e-12, 2, 2)
+        assert (par_perm, par_sign) == (perm, sign)
+        for row, par_row in zip(lu, par_lu):
+            assert par_row == pytest.approx(row)
+    matrix_parallel.shutdown()
+
+
+def test_blocked_lu_of_singular_matrix_is_none():
+    rows = _random_rows(8, 1)
+    rows[5] = [2 * value for value in rows[2]]
+    assert matrix_parallel.lu_decompose(rows, 1e-9, 2, 2) is None
+    matrix_parallel.shutdown()
+
+
+def test_parallel_float_determinant_and_inverse(workers):
+    rows = _random_rows(9, 2)
+    matrix = Matrix(*rows)
+    expected = Matrix(*rows)
+    Matrix.PARALLEL_WORKERS = 0
+    det = expected.determinant()
+    inverse = expected.inverse()
+    Matrix.PARALLEL_WORKERS = 2
+    assert matrix.determinant() == pytest.approx(det)
+    for row, expected_row in zip(matrix.inverse()._raw_rows(),
+                                 inverse._raw_rows()):
+        assert row == pytest.approx(expected_row)
+    singular = Matrix(*[[1.0] * 9 for i in range(9)])
+    with pytest.raises(SingularMatrixError):
+        singular.inverse()
+
+
+def test_parallel_product_matches_serial(workers):
+    rng = random.Random(3)
+    rows_a = [[rng.randint(-9, 9) for j in range(6)] for i in range(5)]
+    rows_b = [[rng.randint(-9, 9) for j in range(7)] for i in range(6)]
+    expected = [[sum(a * b for a, b in zip(row, col))
+                 for col in zip(*rows_b)] for row in rows_a]
+    assert (Matrix(*rows_a) * Matrix(*rows_b))._raw_rows() == expected
+
+
+def test_batches_match_serial_results(workers):
+    matrices = [
+        Matrix([1, 2], [3, 4]),
+        Matrix([2.5, 1.0, 0.0], [1.0, 2.0, 1.0], [0.0, 1.0, 2.0]),
+        Matrix([Fraction(1, 2), 1], [2, Fraction(3, 4)]),
+        Matrix([4, 1, 0], [1, 3, 1], [0, 1, 2], storage="flat"),
+        Matrix([2.0, 1.0], [1.0, 3.0], storage="flat"),
+        Matrix([3, 1], [1, 2], arithmetic="float"),
+    ]
+    determinants = Matrix.determinants(matrices)
+    inverses = Matrix.inverses(matrices)
+    Matrix.PARALLEL_WORKERS = 0
+    assert determinants == [matrix.determinant() for matrix in matrices]
+    for inverse, matrix in zip(inverses, matrices):
+        assert inverse == matrix.inverse()
+        assert inverse.storage() == matrix.storage()
+        assert inverse.dtype() == matrix.inverse().dtype()
+
+
+def test_batches_are_shared_not_pickled(workers, monkeypatch):
+    sent = list()
+    submit = matrix_parallel._WorkerPool.executor
+
+    def executor(pool, count):
+        real = submit(pool, count)
+
+        class Recorder(object):
+            def submit(self, function, *args):
+                sent.append(args)
+                return real.submit(function, *args)
+        return Recorder()
+    monkeypatch.setattr(matrix_parallel._WorkerPool, "executor", executor)
+    matrices = [Matrix(*_random_rows(5, seed)) for seed in range(4)]
+    determinants = Matrix.determinants(matrices)
+    Matrix.PARALLEL_WORKERS = 0
+    assert determinants == pytest.approx(
+        [matrix.determinant() for matrix in matrices])
+    assert sent
+    for function, specs, chunk, args in sent:
+        assert list(specs) == ["float"]
+        for dtype, position, options in chunk:
+            assert dtype == "float"
+            assert isinstance(position, tuple) and len(position) == 3
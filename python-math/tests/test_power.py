@@ -0,0 +1,59 @@
+import pytest
+
+from fraction import Fraction
+from matrix import Matrix, MatrixDimensionError, SingularMatrixError
+
+FIBONACCI = Matrix([1, 1], [1, 0])
+
+
+def _repeated_product(matrix, exponent):
+    result = Matrix.identity(matrix.rows())
+    for i in range(exponent):
+        result = result * matrix
+    return result
+
+
+@pytest.mark.parametrize("exponent", [0, 1, 2, 3, 7, 8, 13])
+def test_power_matches_repeated_products(exponent):
+    matrix = Matrix([1, 2, 0], [0, 1, 3], [2, 0, 1])
+    assert matrix ** exponent == _repeated_product(matrix, exponent)
+    assert matrix.power(exponent, cache=False) == \
+        _repeated_product(matrix, exponent)
+
+
+def test_large_power_stays_exact():
+    fib = [0, 1]
+    while len(fib) < 302:
+        fib.append(fib[-1] + fib[-2])
+    assert FIBONACCI ** 300 == Matrix([fib[301], fib[300]],
+                                      [fib[300], fib[299]])
+
+
+def test_negative_power_raises_the_inverse():
+    matrix = Matrix([2, 1], [1, 1])
+    assert matrix ** -3 == (matrix ** 3).inverse()
+    assert matrix ** -1 * matrix == Matrix.identity(2)
+    half = Matrix([2, 0], [0, 2]) ** -2
+    assert half == Matrix([Fraction(1, 4), 0], [0, Fraction(1, 4)])
+
+
+def test_squarings_are_cached_and_reused():
+    matrix = Matrix([1, 1], [0, 1])
+    matrix.power(8)
+    squarings = list(matrix._squarings)
+    assert len(squarings) == 4
+    assert matrix.power(5) == Matrix([1, 5], [0, 1])
+    assert matrix._squarings[:4] == squarings
+    assert all(a is b for a, b in zip(matrix._squarings, squarings))
+    other = Matrix([1, 1], [0, 1])
+    other.power(8, cache=False)
+    assert other._squarings is None
+
+
+def test_power_errors():
+    with pytest.raises(MatrixDimensionError):
+        Matrix([1, 2, 3]) ** 2
+    with pytest.raises(TypeError):
+        Matrix([1, 2], [3, 4]) ** 0.5
+    with pytest.raises(SingularMatrixError):
+        Matrix([1, 2], [2, 4]) ** -1
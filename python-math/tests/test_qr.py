@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+import numpy_backend
+from fraction import Fraction
+from matrix import Matrix, MatrixDimensionError, SingularMatrixError
+from vector import Vector
+
+BACKENDS = [False, pytest.param(True, marks=pytest.mark.skipif(
+    not numpy_backend.available(), reason="NumPy is not installed"))]
+
+
+@pytest.fixture(params=BACKENDS)
+def use_numpy(request, monkeypatch):
+    monkeypatch.setattr(Matrix, "USE_NUMPY", request.param)
+    Matrix.clear_shared_cache()
+    yield request.param
+    Matrix.clear_shared_cache()
+
+
+def _random_rows(num_rows, num_cols, seed):
+    rng = random.Random(seed)
+    return [[rng.uniform(-3, 3) for j in range(num_cols)]
+            for i in range(num_rows)]
+
+
+def _close(matrix_a, matrix_b):
+    rows_a, rows_b = matrix_a._raw_rows(), matrix_b._raw_rows()
+    assert len(rows_a) == len(rows_b)
+    for row_a, row_b in zip(rows_a, rows_b):
+        assert list(row_a) == pytest.approx(list(row_b), abs=1e-9)
+
+
+@pytest.mark.parametrize("shape", [(4, 4), (6, 3), (3, 5)])
+@pytest.mark.parametrize("economy", [False, True])
+def test_qr_factors(use_numpy, shape, economy):
+    num_rows, num_cols = shape
+    matrix = Matrix(*_random_rows(num_rows, num_cols, sum(shape)))
+    q, r = matrix.qr(economy)
+    size = min(shape) if economy else num_rows
+    assert (q.rows(), q.columns()) == (num_rows, size)
+    assert (r.rows(), r.columns()) == (size, num_cols)
+    _close(q.transpose() * q, Matrix.identity(size))
+    _close(q * r, matrix)
+    for i, row in enumerate(r._raw_rows()):
+        assert all(value == 0 for value in list(row)[:i])
+
+
+def test_qr_of_exact_matrix_is_float():
+    q, r = Matrix([Fraction(1, 2), 1], [1, 0], [0, 2]).qr(True)
+    _close(q * r, Matrix([0.5, 1.0], [1.0, 0.0], [0.0, 2.0]))
+    assert all(isinstance(value, float)
+               for row in q._raw_rows() for value in row)
+
+
+def test_least_squares_matches_normal_equations(use_numpy):
+    rows = _random_rows(8, 3, 1)
+    matrix = Matrix(*rows)
+    vector = Vector(*[float(i) for i in range(8)])
+    solution = matrix.least_squares(vector)
+    transpose = matrix.transpose()
+    expected = (transpose * matrix).solve_for_x(transpose * vector)
+    assert list(solution) == pytest.approx(list(expected))
+
+
+def test_least_squares_solves_consistent_systems(use_numpy):
+    matrix = Matrix([1, 0], [0, 1], [1, 1])
+    solution = matrix.least_squares(Vector(2, 3, 5))
+    assert list(solution) == pytest.approx([2.0, 3.0])
+
+
+def test_least_squares_errors(use_numpy):
+    with pytest.raises(SingularMatrixError):
+        Matrix([1, 2], [2, 4], [3, 6]).least_squares(Vector(1, 2, 3))
+    with pytest.raises(SingularMatrixError):
+        Matrix([1, 2, 3], [4, 5, 6]).least_squares(Vector(1, 2))
+    with pytest.raises(MatrixDimensionError):
+        Matrix([1, 0], [0, 1], [1, 1]).least_squares(Vector(1, 2))
@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+from fraction import Fraction
+from matrix import Matrix
+from vector import Vector
+
+KNOWN = [
+    ([[1, 2, 3], [4, 5, 6], [7, 8, 9]],
+     [[1, 0, -1], [0, 1, 2], [0, 0, 0]]),
+    ([[0, 2, 4], [1, 1, 1]],
+     [[1, 0, -1], [0, 1, 2]]),
+    ([[1, 2], [2, 4], [3, 7]],
+     [[1, 0], [0, 1], [0, 0]]),
+    ([[0, 0], [0, 0]],
+     [[0, 0], [0, 0]]),
+    ([[2, 1, 1, 3]],
+     [[1, Fraction(1, 2), Fraction(1, 2), Fraction(3, 2)]]),
+]
+
+
+def _random_rows(num_rows, num_cols, seed):
+    rng = random.Random(seed)
+    rows = [[rng.randint(-5, 5) for j in range(num_cols)]
+            for i in range(num_rows)]
+    rows[-1] = [a + b for a, b in zip(rows[0], rows[1])]
+    return rows
+
+
+def _is_rref(rows):
+    last_pivot = -1
+    seen_zero_row = False
+    for i, row in enumerate(rows):
+        nonzero = [j for j, value in enumerate(row) if value != 0]
+        if not nonzero:
+            seen_zero_row = True
+            continue
+        pivot = nonzero[0]
+        if seen_zero_row or pivot <= last_pivot or row[pivot] != 1:
+            return False
+        if any(other[pivot] != 0 for k, other in enumerate(rows) if k != i):
+            return False
+        last_pivot = pivot
+    return True
+
+
+@pytest.mark.parametrize("rows, expected", KNOWN)
+def test_known_reduced_row_echelon_forms(rows, expected):
+    matrix = Matrix(*rows)
+    assert matrix.reduced_row_echelon_form() == Matrix(*expected)
+    assert matrix == Matrix(*rows)
+
+
+@pytest.mark.parametrize("shape", [(3, 5), (5, 3), (4, 4), (6, 6)])
+def test_random_rref_is_reduced_and_row_equivalent(shape):
+    rows = _random_rows(shape[0], shape[1], sum(shape))
+    matrix = Matrix(*rows)
+    rref = matrix.reduced_row_echelon_form()
+    assert _is_rref(rref._raw_rows())
+    stacked = Matrix(*(rows + [list(row) for row in rref._raw_rows()]))
+    assert stacked.rank() == matrix.rank()
+
+
+@pytest.mark.parametrize("shape", [(3, 5), (5, 3)])
+def test_rank_and_nullity_of_non_square_matrices(shape):
+    rows = _random_rows(shape[0], shape[1], 1)
+    matrix = Matrix(*rows)
+    assert matrix.rank() == min(shape) - (1 if shape[0] <= shape[1] else 0)
+    assert matrix.nullity() == shape[1] - matrix.rank()
+
+
+def test_row_and_column_space_bases():
+    matrix = Matrix([1, 2, 3], [2, 4, 6], [1, 0, 1])
+    assert matrix.row_space() == {Vector(1, 0, 1), Vector(0, 1, 1)}
+    assert matrix.column_space() == {Vector(1, 2, 1), Vector(2, 4, 0)}
+
+
+def test_last_rref_step_is_the_rref():
+    matrix = Matrix(*_random_rows(4, 5, 2))
+    steps = matrix.rref_all_steps()
+    assert steps[0] == matrix
+    assert steps[-1] == matrix.reduced_row_echelon_form()
+
+
+def test_solve_for_x():
+    matrix = Matrix([1, 1, 1], [0, 2, 5], [2, 5, -1])
+    assert matrix.solve_for_x(Vector(6, -4, 27)) == Vector(5, 3, -2)
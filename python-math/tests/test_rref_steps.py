@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from matrix import Matrix
+
+MATRICES = [
+    [[1, 2, 3], [4, 5, 6], [7, 8, 9]],
+    [[0, 2, 4], [1, 1, 1]],
+    [[2, 1], [4, 3], [6, 5]],
+    [[1, 0], [0, 1]],
+]
+
+
+def _replay(matrix, operations):
+    steps = [matrix]
+    for operation in operations:
+        name, args = operation[0], operation[1:]
+        if name == "column_clear":
+            col_pos, row_pos = args
+            rows = [list(row) for row in steps[-1]._raw_rows()]
+            for row in rows[row_pos-1:]:
+                row[col_pos-1] = 0.0
+            steps.append(Matrix(*rows))
+        else:
+            steps.append(getattr(steps[-1], name)(*args))
+    return steps
+
+
+@pytest.mark.parametrize("rows", MATRICES)
+def test_operations_replay_to_the_rref(rows):
+    matrix = Matrix(*rows)
+    operations = matrix.rref_operations()
+    for operation in operations:
+        assert operation[0] in ("row_interchange", "row_multiply",
+                                "row_add_multiple")
+    steps = _replay(matrix, operations)
+    assert steps == matrix.rref_all_steps()
+    assert steps[-1] == matrix.reduced_row_echelon_form()
+
+
+@pytest.mark.parametrize("rows", MATRICES)
+def test_every_step_changes_the_matrix(rows):
+    steps = Matrix(*rows).rref_all_steps()
+    assert all(step != previous for previous, step in zip(steps, steps[1:]))
+
+
+def test_iterator_yields_the_same_steps_lazily():
+    rng = random.Random(1)
+    matrix = Matrix(*[[rng.randint(-5, 5) for j in range(5)]
+                      for i in range(4)])
+    steps = matrix.iter_rref_steps()
+    assert next(steps) is matrix
+    assert [matrix] + list(steps) == matrix.rref_all_steps()
+
+
+def test_float_log_replays_cleared_columns():
+    rows = [[1.0, 1.0, 1.0], [1.0, 1.0 + 1e-15, 2.0], [2.0, 2.0, 3.0]]
+    matrix = Matrix(*rows)
+    operations = matrix.rref_operations()
+    assert ("column_clear", 2, 2) in operations
+    steps = _replay(matrix, operations)
+    rref = matrix.reduced_row_echelon_form()
+    assert steps[-1] == rref
+    assert matrix.rref_all_steps()[-1] == rref
+    assert rref == Matrix([1.0, 1.0, 0.0], [0.0, 0.0, 1.0],
+                          [0.0, 0.0, 0.0])
+
+
+def test_operations_are_cached_per_arithmetic():
+    matrix = Matrix(*MATRICES[0])
+    assert matrix._rref_log() is matrix._rref_log()
+    assert matrix._rref_log("float") is not matrix._rref_log()
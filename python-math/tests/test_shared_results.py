@@ -0,0 +1,63 @@
+from complex_matrix import ComplexMatrix
+from complex_number import Complex
+from matrix import Matrix
+
+
+class TaggedMatrix(Matrix):
+    pass
+
+
+def setup_function():
+    Matrix.clear_shared_cache()
+
+
+def test_equal_matrices_share_results():
+    Matrix([1, 2], [3, 4])._cached("probe", lambda: "first")
+    assert Matrix([1, 2], [3, 4])._cached("probe", lambda: "second") == "first"
+
+
+def test_subclass_does_not_share_results():
+    Matrix([1, 2], [3, 4])._cached("probe", lambda: "matrix")
+    tagged = TaggedMatrix([1, 2], [3, 4])
+    assert tagged._cached("probe", lambda: "tagged") == "tagged"
+    assert Matrix([1, 2], [3, 4])._cached("probe", lambda: "other") == "matrix"
+
+
+def test_complex_matrix_eigenvalues_after_matrix():
+    rows = [[Complex(1, 1), 2], [2, Complex(0, 1)]]
+    Matrix(*rows).eigenvalues()
+    values = sorted(ComplexMatrix(*rows).eigenvalues(), key=lambda z: z.real)
+    expected = [-1.5615528128088303 + 1j, 2.561552812808831 + 1j]
+    for value, expected_value in zip(values, expected):
+        assert abs(value - expected_value) < 1e-9
+
+
+def test_cache_is_bounded_by_total_entries(monkeypatch):
+    from matrix import _SHARED_RESULTS
+    monkeypatch.setattr(Matrix, "SHARED_CACHE_ENTRIES", 20)
+    for k in range(5):
+        Matrix([k, 1], [2, 3]).determinant()
+    assert _SHARED_RESULTS.weight() == 20
+    Matrix([9, 1, 1], [2, 3, 1], [1, 1, 1]).determinant()
+    assert _SHARED_RESULTS.weight() <= 20
+    first = Matrix([0, 1], [2, 3])
+    first._cached("probe", lambda: "fresh")
+    assert first._cached("probe", lambda: "other") == "fresh"
+
+
+def test_matrix_larger_than_the_bound_is_not_shared(monkeypatch):
+    from matrix import _SHARED_RESULTS
+    monkeypatch.setattr(Matrix, "SHARED_CACHE_ENTRIES", 3)
+    Matrix([1, 2], [3, 4])._cached("probe", lambda: "first")
+    assert _SHARED_RESULTS.weight() == 0
+    assert Matrix([1, 2], [3, 4])._cached("probe", lambda: "second") == (
+        "second")
+
+
+def test_sharing_can_be_disabled(monkeypatch):
+    from matrix import _SHARED_RESULTS
+    monkeypatch.setattr(Matrix, "SHARED_CACHE_SIZE", 0)
+    Matrix([1, 2], [3, 4])._cached("probe", lambda: "first")
+    assert _SHARED_RESULTS.weight() == 0
+    assert Matrix([1, 2], [3, 4])._cached("probe", lambda: "second") == (
+        "second")
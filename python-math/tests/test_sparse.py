@@ -0,0 +1,74 @@
+import pytest
+
+from matrix import Matrix
+from sparse_matrix import SparseMatrix
+from vector import Vector
+
+DENSE = Matrix([4, 0, 1, 0], [0, 3, 0, 0], [1, 0, 2, 5], [0, 0, 5, 7])
+
+
+@pytest.fixture
+def lazy():
+    Matrix.LAZY = True
+    yield
+    Matrix.LAZY = False
+
+
+def test_from_coo_sums_duplicates_and_drops_zeros():
+    sparse = SparseMatrix.from_coo(2, 3, [(1, 1, 2), (1, 1, 3), (2, 3, 0),
+                                          (2, 2, -1)])
+    assert sparse.nonzeros() == 2
+    assert sparse.to_matrix() == Matrix([5, 0, 0], [0, -1, 0])
+
+
+def test_round_trip_through_matrix():
+    sparse = SparseMatrix.from_matrix(DENSE)
+    assert sparse.nonzeros() == 8
+    assert sparse.to_matrix() == DENSE
+    assert sparse.transpose().to_matrix() == DENSE.transpose()
+    assert sparse.get(3, 4) == 5 and sparse.get(2, 1) == 0
+
+
+def test_products_match_dense():
+    sparse = SparseMatrix.from_matrix(DENSE)
+    other = Matrix([1, 2], [0, 1], [3, 0], [1, 1])
+    vector = Vector(1, 2, 3, 4)
+    assert sparse * other == DENSE * other
+    assert other.transpose() * sparse == other.transpose() * DENSE
+    assert sparse * vector == DENSE * vector
+    assert (sparse * sparse).to_matrix() == DENSE * DENSE
+    assert (sparse * 3).to_matrix() == DENSE * 3
+
+
+def test_sums_match_dense():
+    sparse = SparseMatrix.from_matrix(DENSE)
+    identity = Matrix.identity(4)
+    assert sparse + identity == DENSE + identity
+    assert identity + sparse == identity + DENSE
+    assert sparse - identity == DENSE - identity
+    assert identity - sparse == identity - DENSE
+    assert (sparse - sparse).nonzeros() == 0
+
+
+def test_solve_matches_dense():
+    sparse = SparseMatrix.from_matrix(DENSE)
+    vector = Vector(1, 2, 3, 4)
+    assert sparse.solve_for_x(vector) == DENSE.solve_for_x(vector)
+
+
+def test_equality_is_symmetric():
+    sparse = SparseMatrix.from_matrix(DENSE)
+    assert DENSE == sparse and sparse == DENSE
+    assert not DENSE != sparse and not sparse != DENSE
+    other = Matrix.identity(4)
+    assert DENSE != other and other != sparse and sparse != other
+    assert DENSE != 5
+
+
+def test_difference_with_matrix_when_lazy(lazy):
+    sparse = SparseMatrix.from_matrix(DENSE)
+    identity = Matrix.identity(4)
+    difference = sparse - identity
+    assert isinstance(difference, Matrix)
+    Matrix.LAZY = False
+    assert difference == DENSE - identity
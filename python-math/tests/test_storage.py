@@ -0,0 +1,37 @@
+from fraction import Fraction
+from matrix import Matrix
+
+
+def test_flat_float_keeps_dtype_through_sums():
+    matrix = Matrix([1.0, 2.0], [3.0, 4.0], storage="flat")
+    assert matrix.dtype() == "float"
+    assert (matrix + matrix).dtype() == "float"
+    assert (matrix - matrix).dtype() == "float"
+    assert (matrix * matrix).dtype() == "float"
+    assert (matrix * 2).dtype() == "float"
+    assert (matrix - matrix).arithmetic() == matrix.arithmetic()
+
+
+def test_flat_storage_matches_list_storage():
+    rows = [[1, 2, 3], [4, 5, 6]]
+    flat = Matrix(*rows, storage="flat")
+    nested = Matrix(*rows)
+    assert flat.storage() == "flat" and nested.storage() == "list"
+    assert flat == nested
+    assert flat.transpose() == nested.transpose()
+    assert flat * flat.transpose() == nested * nested.transpose()
+    assert flat + flat == nested + nested
+    assert flat.dtype() == "int"
+
+
+def test_flat_transpose_is_a_view():
+    flat = Matrix([1, 2, 3], [4, 5, 6], storage="flat")
+    transpose = flat.transpose()
+    assert transpose.dimensions() == (3, 2)
+    assert transpose.get(3, 2) == 6
+
+
+def test_object_dtype_for_fractions():
+    flat = Matrix([Fraction(1, 2), 1], [2, 3], storage="flat")
+    assert flat.dtype() == "object"
+    assert (flat + flat).get(1, 1) == 1
@@ -17,6 +17,18 @@ class VectorDimensionError(Exception):
 class Vector(object):
     """A class to represent a vector in Euclidean n-space."""
 
+    @staticmethod
+    def _demote_floats(values):
+        """(list of Number) -> list of Number
+
+        Returns the given values with every integral float replaced by the
+        equal int. The values are returned as is when none are floats.
+        """
+        if not any(isinstance(value, float) for value in values):
+            return values
+        return [int(value) if isinstance(value, float) and value.is_integer()
+                else value for value in values]
+
     @staticmethod
     def zero(dimension):
         """(int) -> Vector
@@ -26,6 +38,18 @@ class Vector(object):
         values = [0] * dimension
         return Vector(*values)
 
+    @staticmethod
+    def _view(values):
+        """(sequence of Number) -> Vector
+
+        Returns a vector backed by the given sequence without copying it.
+        The sequence must not be modified while the vector is in use.
+        """
+        vector = Vector.__new__(Vector)
+        vector._v = values
+        vector._n = len(values)
+        return vector
+
     def __init__(self, *values):
         """(Vector, tuple of Number) -> NoneType
 
@@ -67,13 +91,9 @@ class Vector(object):
         if self._n != other.dimension():
             err_msg = "both vectors must have the same dimension for addition"
             raise VectorDimensionError(err_msg)
-        values = list()
-        for i in range(self._n):
-            add = self._v[i] + other.get(i+1)
-            if isinstance(add, float) and add.is_integer():
-                add = int(add)
-            values.append(add)
-        return Vector(*values)
+        values = [value + other_value
+                  for value, other_value in zip(self._v, other)]
+        return Vector(*Vector._demote_floats(values))
 
     def __mul__(self, other):
         """(Vector, Vector or Scalar) -> Vector or Number
@@ -88,13 +108,8 @@ class Vector(object):
         if isinstance(other, Vector):
             return self.dot_product(other)
         else:
-            values = list()
-            for i in range(self._n):
-                prod = self._v[i] * other
-                if isinstance(prod, float) and prod.is_integer():
-                    prod = int(prod)
-                values.append(prod)
-            return Vector(*values)
+            values = [value * other for value in self._v]
+            return Vector(*Vector._demote_floats(values))
 
     def __rmul__(self, other):
         """(Vector, Vector or Scalar) -> Vector or Number